@@ -0,0 +1,210 @@
+"""
+Bulk resume screening.
+
+Extracts text from every PDF in a directory using a process pool, runs the
+resume extraction prompt with bounded concurrency and rate limiting, and
+upserts the results into MongoDB in batches. Completed files are recorded in
+a checkpoint so an interrupted run resumes where it stopped.
+
+    python batch_screen.py resumes/ --concurrency 4 --rpm 60
+    python batch_screen.py resumes/ --fake-llm --in-memory-db   # offline
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+import argparse
+import hashlib
+import json
+import threading
+import time
+
+import config
+import database
+import dedup
+from crew_agent import TalentScoutCrew, get_llm, get_resume_extraction_prompt
+from llm_client import LLMClient
+from pdf_extract import extract_text
+from resume_fields import parse_resume_fields
+
+
+def load_checkpoint(path: Path) -> set:
+    """Return the resume hashes already screened in earlier runs."""
+    if not path.exists():
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {json.loads(line)["resume_sha256"] for line in f if line.strip()}
+
+
+def record_checkpoint(path: Path, documents: list) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        for document in documents:
+            f.write(json.dumps({"file": document["source_file"], "resume_sha256": document["resume_sha256"]}) + "\n")
+
+
+def extract_resume(path: str) -> tuple:
+    """Process-pool worker: (path, sha256, text, error)."""
+    try:
+        data = Path(path).read_bytes()
+        return path, hashlib.sha256(data).hexdigest(), extract_text(data), None
+    except Exception as e:
+        return path, None, "", str(e)
+
+
+def fake_extraction_response(prompt: str) -> str:
+    """Deterministic stand-in for the LLM's resume extraction response."""
+    resume = prompt.split("RESUME CONTENT:", 1)[-1]
+    first_line = next((line.strip() for line in resume.splitlines() if line.strip()), None)
+    return json.dumps({
+        "full_name": first_line[:60] if first_line else None,
+        "years_of_experience": None,
+        "desired_position": None,
+        "location": None,
+        "tech_stack": [],
+        "summary": "Synthetic summary for offline runs.",
+        "suggested_questions": [],
+    })
+
+
+class BatchScreener:
+    def __init__(self, llm, concurrency: int = 4, rate_per_minute: float = 60,
+                 batch_size: int = 50, checkpoint: Optional[Path] = None, processes: Optional[int] = None):
+        self.llm = llm
+        self.concurrency = concurrency
+        self.client = LLMClient(
+            runtime_factory=lambda: TalentScoutCrew(llm=llm, max_retry_limit=0, response_cache=False),
+            concurrency=concurrency,
+            rate_per_minute=rate_per_minute,
+            model=getattr(llm, "model", None),
+        )
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.processes = processes
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self.stats = {"screened": 0, "skipped": 0, "failed": 0, "saved": 0, "reused": 0}
+
+    def _prior_analysis(self, text: str) -> Optional[str]:
+        """Analysis of an already screened copy of this resume, if any."""
+        if not config.DEDUP_ENABLED:
+            return None
+        match = dedup.find_duplicate(resume_text=text)
+        if match is None or not match.same_resume:
+            return None
+        analysis = database.load_resume(match.candidate_id).get("resume_analysis")
+        if analysis:
+            with self._pending_lock:
+                self.stats["reused"] += 1
+        return analysis
+
+    def analyze(self, path: str, sha: str, text: str) -> dict:
+        analysis = self._prior_analysis(text)
+        if analysis is None:
+            analysis = self.client.run(get_resume_extraction_prompt(text))
+        return {
+            **parse_resume_fields(analysis, text).to_candidate_data(),
+            "resume_text": text,
+            "resume_analysis": analysis,
+            "resume_sha256": sha,
+            "source_file": Path(path).name,
+            "source": "batch",
+            "technical_questions": [],
+            "qa_responses": [],
+            "conversation_history": [],
+        }
+
+    def _add_result(self, document: dict) -> None:
+        with self._pending_lock:
+            self._pending.append(document)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        database.save_candidates(self._pending, key="resume_sha256")
+        if self.checkpoint:
+            record_checkpoint(self.checkpoint, self._pending)
+        self.stats["saved"] += len(self._pending)
+        self._pending = []
+
+    def flush(self) -> None:
+        with self._pending_lock:
+            self._flush_locked()
+
+    def run(self, directory: Path) -> dict:
+        done = load_checkpoint(self.checkpoint) if self.checkpoint else set()
+        paths = sorted(str(p) for p in directory.glob("*.pdf"))
+        start = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.processes) as extractors, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as analyzers:
+            analyses = []
+            for path, sha, text, error in extractors.map(extract_resume, paths):
+                if error or not text:
+                    print(f"[skip] {Path(path).name}: {error or 'no text'}")
+                    self.stats["failed"] += 1
+                elif sha in done:
+                    self.stats["skipped"] += 1
+                else:
+                    done.add(sha)
+                    analyses.append(analyzers.submit(self.analyze, path, sha, text))
+
+            for future in as_completed(analyses):
+                try:
+                    self._add_result(future.result())
+                    self.stats["screened"] += 1
+                except Exception as e:
+                    print(f"[error] analysis failed: {e}")
+                    self.stats["failed"] += 1
+                if self.stats["screened"] and self.stats["screened"] % 25 == 0:
+                    self._report(start)
+
+        self.flush()
+        return self._report(start)
+
+    def _report(self, start: float) -> dict:
+        elapsed = time.perf_counter() - start
+        per_minute = self.stats["screened"] / elapsed * 60 if elapsed else 0.0
+        print(f"screened={self.stats['screened']} skipped={self.stats['skipped']} "
+              f"failed={self.stats['failed']} saved={self.stats['saved']} reused={self.stats['reused']} "
+              f"elapsed={elapsed:.1f}s throughput={per_minute:.1f} resumes/min")
+        return {**self.stats, "elapsed_seconds": elapsed, "resumes_per_minute": per_minute}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory of PDF resumes in bulk.")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--concurrency", type=int, default=config.BATCH_CONCURRENCY, help="concurrent LLM calls")
+    parser.add_argument("--rpm", type=float, default=config.BATCH_REQUESTS_PER_MINUTE, help="LLM requests per minute")
+    parser.add_argument("--processes", type=int, default=None, help="PDF extraction processes")
+    parser.add_argument("--batch-size", type=int, default=50, help="documents per bulk write")
+    parser.add_argument("--checkpoint", type=Path, default=None,
+                        help="checkpoint file (default: <directory>/.screening_checkpoint.jsonl)")
+    parser.add_argument("--fake-llm", action="store_true", help="use a deterministic offline LLM")
+    parser.add_argument("--in-memory-db", action="store_true", help="use mongomock instead of MONGODB_URI")
+    args = parser.parse_args(argv)
+
+    if args.in_memory_db:
+        import mongomock
+        database.set_client(mongomock.MongoClient())
+
+    if args.fake_llm:
+        from fake_llm import FakeLLM
+        llm = FakeLLM(responder=fake_extraction_response)
+    else:
+        llm = get_llm()
+
+    screener = BatchScreener(
+        llm,
+        concurrency=args.concurrency,
+        rate_per_minute=args.rpm,
+        batch_size=args.batch_size,
+        checkpoint=args.checkpoint or args.directory / ".screening_checkpoint.jsonl",
+        processes=args.processes,
+    )
+    screener.run(args.directory)
+    screener.client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Answer evaluation throughput per batch size, using FakeLLM.
+
+Submits the answers of many ended interviews at once and measures how fast
+the background pool scores them. Batches never mix candidates, so the
+batch size is capped by the answers per interview. FakeLLM's latency is per
+call, and a real provider's cost grows only slowly with the number of
+answers in a prompt, so packing answers into one call is what raises
+throughput.
+
+    python benchmarks/bench_answer_eval.py --candidates 40 --answers 8 --batch-sizes 1 2 4 8
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from crew_agent import TalentScoutCrew  # noqa: E402
+from evaluation import AnswerEvaluator, fake_scores  # noqa: E402
+from fake_llm import FakeLLM  # noqa: E402
+from llm_client import LLMClient  # noqa: E402
+
+# Every batch must reach the LLM.
+config.LLM_CACHE_ENABLED = False
+
+
+class CollectingQueue:
+    """Stand-in for the write-behind queue that keeps the written scores."""
+
+    def __init__(self):
+        self.writes = {}
+
+    def enqueue(self, candidate_id, set_data=None, push_data=None, document=None):
+        self.writes[candidate_id] = set_data
+
+
+def interview_responses(candidate: int, answers: int) -> list:
+    return [{
+        "question_index": i,
+        "question": f"Question {i + 1} of {answers}: how would you scale service {candidate}?",
+        "bank_question": None,
+        "answer": "I would profile first, then shard the hot tables and add a read-through cache. " * (1 + i % 3),
+    } for i in range(answers)]
+
+
+def run(batch_size: int, args) -> tuple:
+    llm = FakeLLM(latency=args.latency, responder=fake_scores)
+    client = LLMClient(runtime_factory=lambda: TalentScoutCrew(llm=llm, verbose=False, response_cache=False),
+                       concurrency=args.workers, rate_per_minute=100_000)
+    writes = CollectingQueue()
+    evaluator = AnswerEvaluator(agent=client, batch_size=batch_size, workers=args.workers, write_queue=writes)
+    start = time.perf_counter()
+    for candidate in range(args.candidates):
+        evaluator.submit(f"candidate-{candidate}", interview_responses(candidate, args.answers))
+    evaluator.flush()
+    elapsed = time.perf_counter() - start
+    evaluator.close()
+    client.close()
+    return elapsed, evaluator.stats, len(writes.writes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=40)
+    parser.add_argument("--answers", type=int, default=8, help="answers per interview")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake LLM latency per call (s)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'batch':>5} {'LLM calls':>9} {'scored':>7} {'written':>8} {'seconds':>8} {'answers/s':>10}")
+    for batch_size in args.batch_sizes:
+        elapsed, stats, written = run(batch_size, args)
+        print(f"{batch_size:>5} {stats['batches']:>9} {stats['scored']:>7} {written:>8} "
+              f"{elapsed:>8.2f} {stats['scored'] / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
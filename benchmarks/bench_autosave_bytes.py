@@ -0,0 +1,67 @@
+"""Bytes written per auto-save over a 50-turn session: full $set vs. delta $push.
+
+Sizes are the BSON-encoded update documents sent to MongoDB.
+
+    python benchmarks/bench_autosave_bytes.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bson  # noqa: E402
+
+from persistence import DirtyDict, build_delta_update, build_full_document  # noqa: E402
+
+TURNS = 50
+
+
+def new_candidate() -> DirtyDict:
+    data = DirtyDict({
+        "full_name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": None,
+        "years_of_experience": "5",
+        "desired_position": None,
+        "location": None,
+        "tech_stack": "Python, Django, PostgreSQL",
+        "resume_text": "Experienced backend engineer. " * 300,
+        "resume_analysis": "**EXTRACTED INFORMATION:** ... " * 40,
+        "technical_questions": [],
+        "qa_responses": [],
+    })
+    data.clear_dirty()
+    return data
+
+
+def main():
+    messages = []
+    full_candidate = new_candidate()
+    delta_candidate = new_candidate()
+    saved = 0
+    full_total = delta_total = 0
+
+    print(f"{'turn':>5} {'full_bytes':>11} {'delta_bytes':>12}")
+    for turn in range(1, TURNS + 1):
+        messages.append({"role": "user", "content": f"My answer to question {turn} is about caching strategies."})
+        messages.append({"role": "assistant", "content": f"Thanks! Question {turn + 1}: how would you scale writes?"})
+        if turn == 3:
+            full_candidate["phone"] = delta_candidate["phone"] = "+1 555 0100"
+
+        full_update = {"$set": build_full_document(full_candidate, messages)}
+        set_data, push_data = build_delta_update(delta_candidate, messages, saved)
+        delta_update = {"$set": set_data, "$push": {"conversation_history": {"$each": push_data["conversation_history"]}}}
+        saved = len(messages)
+
+        full_bytes = len(bson.encode(full_update))
+        delta_bytes = len(bson.encode(delta_update))
+        full_total += full_bytes
+        delta_total += delta_bytes
+        if turn in (1, 5, 10, 25, 50):
+            print(f"{turn:>5} {full_bytes:>11} {delta_bytes:>12}")
+
+    print(f"total over {TURNS} turns: full={full_total} delta={delta_total}")
+
+
+if __name__ == "__main__":
+    main()
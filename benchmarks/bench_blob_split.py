@@ -0,0 +1,69 @@
+"""Candidate document size and read time: embedded vs. split storage layout.
+
+Saves the same long session (resume + N-message transcript) under both
+layouts into an in-memory MongoDB (mongomock) and reports the BSON size of
+the candidate document and the time to read it back.
+
+    python benchmarks/bench_blob_split.py --messages 500
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bson  # noqa: E402
+import mongomock  # noqa: E402
+
+import config  # noqa: E402
+import database  # noqa: E402
+
+RESUME = "Experienced backend engineer with Python, Django and PostgreSQL. " * 120
+
+
+def session_document(messages: int) -> dict:
+    return {
+        "full_name": "Jane Doe",
+        "email": "jane@example.com",
+        "desired_position": "Backend Engineer",
+        "tech_stack": "Python, Django, PostgreSQL",
+        "resume_text": RESUME,
+        "resume_analysis": "**EXTRACTED INFORMATION:** ... " * 40,
+        "conversation_history": [
+            {"role": "user" if i % 2 else "assistant", "content": f"Message {i}: " + "details " * 60}
+            for i in range(messages)
+        ],
+    }
+
+
+def measure(layout: str, messages: int, reads: int = 200) -> dict:
+    config.CANDIDATE_STORAGE_LAYOUT = layout
+    database.set_client(mongomock.MongoClient())
+    db = database.get_database()
+    candidate_id = database.new_candidate_id()
+    database.upsert_candidate(candidate_id, session_document(messages))
+
+    start = time.perf_counter()
+    for _ in range(reads):
+        db[config.CANDIDATES_COLLECTION].find_one({"email_normalized": "jane@example.com"})
+    read_ms = (time.perf_counter() - start) * 1000 / reads
+
+    stored = sum(len(bson.BSON.encode(doc)) for name in db.list_collection_names() for doc in db[name].find())
+    document = db[config.CANDIDATES_COLLECTION].find_one()
+    return {"doc_bytes": len(bson.BSON.encode(document)), "stored_bytes": stored, "read_ms": read_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'layout':<10}{'candidate doc':>16}{'all collections':>18}{'read ms':>10}")
+    for layout in ("embedded", "split"):
+        result = measure(layout, args.messages)
+        print(f"{layout:<10}{result['doc_bytes']:>14} B{result['stored_bytes']:>16} B{result['read_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
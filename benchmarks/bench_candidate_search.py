@@ -0,0 +1,112 @@
+"""Recruiter search benchmark on a synthetic candidate collection.
+
+Loads N synthetic candidates (each with a resume blob and transcript) into a
+scratch database, then times representative searches without and with the
+candidate indexes. Needs a real MongoDB (MONGODB_URI); mongomock has no
+query planner, so --in-memory-db only exercises the code path.
+
+    python benchmarks/bench_candidate_search.py --count 100000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+import database  # noqa: E402
+
+POSITIONS = ["Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer", "Full Stack Developer"]
+STACKS = ["Python, Django, PostgreSQL", "React, TypeScript", "Python, PyTorch", "AWS, Kubernetes, Terraform",
+          "Java, Spring Boot", "Go, gRPC, Redis", "Node.js, Express, MongoDB"]
+BLOB = "Experienced engineer with a track record of shipping reliable systems. " * 80
+
+
+def synthetic_candidates(count: int, start: datetime):
+    rng = random.Random(42)
+    for i in range(count):
+        created = start + timedelta(minutes=i)
+        yield {
+            "full_name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "desired_position": rng.choice(POSITIONS),
+            "tech_stack": rng.choice(STACKS),
+            "resume_text": BLOB,
+            "resume_analysis": BLOB[:800],
+            "conversation_history": [{"role": "user", "content": "answer " * 40}] * 20,
+            "created_at": created,
+            "last_active": created + timedelta(minutes=30),
+        }
+
+
+def load(collection, count: int, start: datetime, batch: int = 2000):
+    buffer = []
+    for candidate in synthetic_candidates(count, start):
+        buffer.append(database.add_search_fields(candidate))
+        if len(buffer) == batch:
+            collection.insert_many(buffer, ordered=False)
+            buffer = []
+    if buffer:
+        collection.insert_many(buffer, ordered=False)
+
+
+def run_queries(count: int, start: datetime, repeat: int = 5) -> dict:
+    queries = {
+        "by_email": lambda: database.search_candidates(email=f"Candidate{count // 2}@example.com"),
+        "by_position": lambda: database.search_candidates(position="backend engineer"),
+        "by_skills": lambda: database.search_candidates(skills=["python", "postgres"]),
+        "by_date_range": lambda: database.search_candidates(
+            created_after=start + timedelta(minutes=count // 3),
+            created_before=start + timedelta(minutes=count // 3 + 500)),
+        "recently_active_page_5": lambda: database.search_candidates(
+            active_since=start + timedelta(minutes=count - 5000), sort_by="last_active", page=5),
+    }
+    results = {}
+    for name, query in queries.items():
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            query()
+            timings.append(time.perf_counter() - t0)
+        results[name] = sorted(timings)[len(timings) // 2] * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recruiter candidate search.")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--in-memory-db", action="store_true")
+    args = parser.parse_args()
+
+    if args.in_memory_db:
+        import mongomock
+        database.set_client(mongomock.MongoClient())
+    config.DATABASE_NAME = "talentscout_bench"
+    client = database.get_client()
+    client.drop_database(config.DATABASE_NAME)
+    collection = client[config.DATABASE_NAME][config.CANDIDATES_COLLECTION]
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    t0 = time.perf_counter()
+    load(collection, args.count, start)
+    print(f"loaded {args.count} candidates in {time.perf_counter() - t0:.1f}s")
+
+    # get_database() would bootstrap indexes; mark them ready to measure the unindexed baseline.
+    database._indexes_ready = True
+    collection.drop_indexes()
+    without = run_queries(args.count, start)
+
+    database.ensure_indexes()
+    with_indexes = run_queries(args.count, start)
+
+    print(f"{'query':>24} {'no_index_ms':>12} {'indexed_ms':>11}")
+    for name in without:
+        print(f"{name:>24} {without[name]:>12.1f} {with_indexes[name]:>11.1f}")
+    client.drop_database(config.DATABASE_NAME)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Prompt size vs. session length: full transcript vs. ConversationContext.
+
+    python benchmarks/bench_context_size.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from conversation_context import ConversationContext, estimate_tokens  # noqa: E402
+
+
+def synthetic_turn(i: int) -> list:
+    return [
+        {"role": "assistant", "content": f"Question {i}: regarding your backend project, how did you handle caching and invalidation for the service layer?"},
+        {"role": "user", "content": f"Answer {i}: we used a read-through Redis cache with short TTLs, versioned keys and explicit invalidation on writes. " * 2},
+    ]
+
+
+def main():
+    messages = []
+    context = ConversationContext()
+    total_full = total_bounded = 0
+    print(f"{'turns':>6} {'full_tokens':>12} {'bounded_tokens':>15}")
+    for turn in range(1, 201):
+        messages.extend(synthetic_turn(turn))
+        full = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        context.sync(messages)
+        bounded = context.render()
+        total_full += estimate_tokens(full)
+        total_bounded += estimate_tokens(bounded)
+        if turn in (1, 10, 25, 50, 100, 200):
+            print(f"{turn:>6} {estimate_tokens(full):>12} {estimate_tokens(bounded):>15}")
+        assert estimate_tokens(bounded) <= context.token_budget + 64
+    print(f"session total tokens: full={total_full} bounded={total_bounded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Micro-benchmark: per-turn Agent/Task/Crew construction vs. a reused runtime.
+
+Only object construction is timed; ``kickoff`` is not called, so no API key or
+network access is needed.
+
+    python benchmarks/bench_crew_runtime.py [turns]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crewai import Agent, Task, Crew  # noqa: E402
+
+import config  # noqa: E402
+from crew_agent import SYSTEM_INSTRUCTIONS, TASK_DESCRIPTION, TalentScoutCrew, get_llm  # noqa: E402
+
+# Repeated prompts must reach the LLM; the response cache is measured in bench_llm_cache.py.
+config.LLM_CACHE_ENABLED = False
+
+
+def build_per_turn(llm, verbose: bool):
+    """What TalentScoutCrew.run used to do on every turn."""
+    agent = Agent(
+        role="TalentScout Hiring Assistant",
+        goal="Screen candidates, extract resume info, and conduct a preliminary technical interview.",
+        backstory=SYSTEM_INSTRUCTIONS,
+        llm=llm,
+        verbose=verbose,
+        allow_delegation=False
+    )
+    task = Task(
+        description=TASK_DESCRIPTION,
+        expected_output="A text response to the candidate.",
+        agent=agent
+    )
+    return Crew(agents=[agent], tasks=[task], verbose=verbose)
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    llm = get_llm()
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        build_per_turn(llm, verbose=True)
+    before = (time.perf_counter() - start) / turns
+
+    runtime = TalentScoutCrew(llm=llm, verbose=False)
+    start = time.perf_counter()
+    for _ in range(turns):
+        runtime.get_crew()
+    after = (time.perf_counter() - start) / turns
+
+    print(f"turns={turns}")
+    print(f"per-turn construction (before): {before * 1000:.3f} ms")
+    print(f"per-turn construction (reused): {after * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
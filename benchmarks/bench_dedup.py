@@ -0,0 +1,73 @@
+"""Re-application lookup cost: signature time and find_duplicate latency.
+
+Loads N synthetic candidates with resume fingerprints, then times lookups for
+an exact re-upload, a lightly edited resume, an email-only match and a new
+candidate. Uses MONGODB_URI, or mongomock with --in-memory-db (no indexes
+there, so latencies grow with N).
+
+    python benchmarks/bench_dedup.py --count 5000 --in-memory-db
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+import database  # noqa: E402
+import dedup  # noqa: E402
+
+
+def resume(i: int) -> str:
+    lines = [f"Candidate {i}, candidate{i}@example.com."]
+    lines += [f"Project {i}-{j}: built a {['billing', 'search', 'analytics', 'auth'][j % 4]} service "
+              f"handling {i * j % 997} requests per second using Python and PostgreSQL." for j in range(40)]
+    return " ".join(lines)
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--in-memory-db", action="store_true")
+    args = parser.parse_args()
+
+    if args.in_memory_db:
+        import mongomock
+        database.set_client(mongomock.MongoClient())
+    collection = database.get_database()[config.CANDIDATES_COLLECTION]
+
+    start = time.perf_counter()
+    documents = [database.add_search_fields({"email": f"candidate{i}@example.com", "resume_text": resume(i)})
+                 for i in range(args.count)]
+    print(f"signatures: {(time.perf_counter() - start) * 1000 / args.count:.2f} ms/resume")
+    for document in documents:
+        document.pop("resume_text")
+    collection.insert_many(documents, ordered=False)
+
+    target = args.count // 2
+    cases = {
+        "exact re-upload": lambda: dedup.find_duplicate(resume_text=resume(target)),
+        "edited resume": lambda: dedup.find_duplicate(resume_text=resume(target) + " Also mentors juniors."),
+        "email only": lambda: dedup.find_duplicate(email=f"Candidate{target}@example.com"),
+        "new candidate": lambda: dedup.find_duplicate(email="new@example.com", resume_text=resume(args.count + 1)),
+    }
+    for name, lookup in cases.items():
+        match = lookup()
+        found = f"{match.reason} ({match.similarity:.2f})" if match else "none"
+        print(f"{name:<16} {timed(lookup, args.repeat):8.2f} ms  match={found}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""LLM response cache on a screening workload, using FakeLLM and mongomock.
+
+Runs resume-analysis prompts where a share of the resumes repeat (some with
+only whitespace changes), first with the cache off, then with a cold cache,
+then as a "restarted process" with an empty memory tier over the same
+MongoDB collection. Reports hit rate and LLM latency saved.
+
+    python benchmarks/bench_llm_cache.py --prompts 200 --repeat 0.4 --latency 0.05
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mongomock  # noqa: E402
+
+import config  # noqa: E402
+import llm_cache  # noqa: E402
+from crew_agent import TalentScoutCrew, get_resume_extraction_prompt  # noqa: E402
+from fake_llm import FakeLLM  # noqa: E402
+from llm_cache import LLMResponseCache  # noqa: E402
+
+
+def make_prompts(count: int, repeat: float) -> list:
+    rng = random.Random(7)
+    resumes = []
+    for i in range(count):
+        if resumes and rng.random() < repeat:
+            text = rng.choice(resumes)
+            if rng.random() < 0.5:
+                text = text.replace(" ", "  ").replace("\n", "\n\n")  # re-exported PDF
+        else:
+            text = f"Candidate {i}\nPython developer, {i % 12} years.\nSkills: Django, SQL, AWS {i}\n" * 20
+        resumes.append(text)
+    return [get_resume_extraction_prompt(text) for text in resumes]
+
+
+def run(prompts: list, latency: float, cache) -> float:
+    llm_cache._llm_cache = cache
+    config.LLM_CACHE_ENABLED = cache is not None
+    runtime = TalentScoutCrew(llm=FakeLLM(latency=latency), verbose=False)
+    start = time.perf_counter()
+    for prompt in prompts:
+        runtime.run(prompt)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=200)
+    parser.add_argument("--repeat", type=float, default=0.4, help="share of prompts repeating an earlier resume")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated LLM latency per call (s)")
+    args = parser.parse_args()
+
+    prompts = make_prompts(args.prompts, args.repeat)
+    collection = mongomock.MongoClient().db[config.LLM_CACHE_COLLECTION]
+
+    print(f"{'run':<18} {'wall s':>7} {'hit rate':>9} {'mem hits':>9} {'db hits':>8} {'saved s':>8}")
+    print(f"{'no cache':<18} {run(prompts, args.latency, None):>7.2f}")
+    for name in ("cold cache", "restarted process"):
+        cache = LLMResponseCache(collection=collection)
+        wall = run(prompts, args.latency, cache)
+        m = cache.metrics()
+        print(f"{name:<18} {wall:>7.2f} {m['hit_rate']:>9.1%} {m['memory_hits']:>9} "
+              f"{m['store_hits']:>8} {m['latency_saved_seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
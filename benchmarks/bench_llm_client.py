@@ -0,0 +1,106 @@
+"""LLMClient against a local fake OpenAI-compatible server.
+
+Covers the real HTTP path end to end, offline:
+  - throughput of blocking TalentScoutCrew.run calls vs. the client
+  - coalescing of identical concurrent prompts
+  - recovery from provider HTTP 429s (retries with jitter)
+  - per-call timeouts
+
+    python benchmarks/bench_llm_client.py --requests 24 --latency 0.2
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from crew_agent import TalentScoutCrew  # noqa: E402
+from fake_llm import FakeLLMServer  # noqa: E402
+from llm_client import LLMClient  # noqa: E402
+
+# Repeated prompts must reach the LLM; the response cache is measured in bench_llm_cache.py.
+config.LLM_CACHE_ENABLED = False
+
+
+def client_for(server: FakeLLMServer, **kwargs) -> LLMClient:
+    llm = server.llm()
+    return LLMClient(runtime_factory=lambda: TalentScoutCrew(llm=llm, verbose=False, max_retry_limit=0), **kwargs)
+
+
+def throughput(requests: int, latency: float, concurrency: int) -> None:
+    server = FakeLLMServer(latency=latency).start()
+    runtime = TalentScoutCrew(llm=server.llm(), verbose=False)
+    start = time.perf_counter()
+    for i in range(requests):
+        runtime.run(f"candidate {i}: hello")
+    blocking = time.perf_counter() - start
+
+    client = client_for(server, concurrency=concurrency, rate_per_minute=6000)
+    start = time.perf_counter()
+    futures = [client.submit(f"candidate {i}: hello") for i in range(requests)]
+    for future in futures:
+        future.result()
+    pooled = time.perf_counter() - start
+    print(f"throughput  blocking={requests / blocking:.1f} req/s  "
+          f"client(concurrency={concurrency})={requests / pooled:.1f} req/s")
+    client.close()
+    server.stop()
+
+
+def coalescing(callers: int, latency: float) -> None:
+    server = FakeLLMServer(latency=latency).start()
+    client = client_for(server, concurrency=4, rate_per_minute=6000)
+    prompt = "Analyze this resume: Jane Doe, Python, Django, PostgreSQL"
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        replies = list(pool.map(lambda _: client.run(prompt), range(callers)))
+    assert len(set(replies)) == 1
+    print(f"coalescing  callers={callers} server requests={server.requests} coalesced={client.stats['coalesced']}")
+    client.close()
+    server.stop()
+
+
+def rate_limits(requests: int, latency: float, server_limit: int, concurrency: int) -> None:
+    # The provider accepts `server_limit` concurrent requests; the client sends more.
+    server = FakeLLMServer(latency=latency, max_concurrent=server_limit).start()
+    client = client_for(server, concurrency=concurrency, rate_per_minute=6000, backoff_seconds=0.1, max_retries=6)
+    futures = [client.submit(f"candidate {i}: hello") for i in range(requests)]
+    ok = sum(1 for future in futures if future.result())
+    print(f"429 retries succeeded={ok}/{requests} server requests={server.requests} rejected={server.rejected} "
+          f"client retries={client.stats['retries']} rate_limited={client.stats['rate_limited']}")
+    client.close()
+    server.stop()
+
+
+def timeouts(latency: float) -> None:
+    server = FakeLLMServer(latency=latency).start()
+    client = client_for(server, concurrency=2, timeout=latency / 4, max_retries=1, backoff_seconds=0.01)
+    start = time.perf_counter()
+    try:
+        client.run("slow request")
+        outcome = "completed"
+    except TimeoutError:
+        outcome = "TimeoutError"
+    print(f"timeout     server latency={latency}s timeout={latency / 4}s -> {outcome} after "
+          f"{time.perf_counter() - start:.2f}s, timeouts={client.stats['timeouts']}")
+    client.close()
+    server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    throughput(args.requests, args.latency, args.concurrency)
+    coalescing(8, args.latency)
+    rate_limits(args.requests, args.latency, server_limit=2, concurrency=args.concurrency * 2)
+    timeouts(max(args.latency, 0.4))
+
+
+if __name__ == "__main__":
+    main()
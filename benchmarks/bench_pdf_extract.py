@@ -0,0 +1,86 @@
+"""PDF extraction benchmark over a synthetic multi-page corpus.
+
+Compares the original concatenating extractor with pdf_extract.extract_text,
+sequential and with worker processes.
+
+    python benchmarks/bench_pdf_extract.py
+"""
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyPDF2 import PdfReader  # noqa: E402
+
+from pdf_extract import extract_text  # noqa: E402
+
+PAGE_COUNTS = (1, 10, 100, 400)
+LINES_PER_PAGE = 45
+
+
+def make_pdf(pages: int, lines=None) -> bytes:
+    """Build a minimal valid PDF with `pages` pages of Helvetica text.
+
+    `lines` optionally gives the text lines of every page (PDF string escaping
+    is the caller's job); by default each page gets synthetic resume lines.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        page_lines = lines or [f"Page {page + 1} line {i}: Python Django PostgreSQL Kubernetes experience"
+                               for i in range(LINES_PER_PAGE)]
+        ops = [f"({line}) Tj T*" for line in page_lines]
+        stream = ("BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(ops) + " ET").encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % pages
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def legacy_extract(data: bytes) -> str:
+    reader = PdfReader(BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() + "\n"
+    return text.strip()
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"{'pages':>6} {'legacy_ms':>10} {'engine_ms':>10} {'parallel_ms':>12} {'chars':>8}")
+    for pages in PAGE_COUNTS:
+        data = make_pdf(pages)
+        legacy, legacy_text = timed(legacy_extract, data)
+        engine, text = timed(extract_text, data, max_pages=pages, max_chars=10 ** 9, workers=1)
+        parallel, parallel_text = timed(extract_text, data, max_pages=pages, max_chars=10 ** 9, workers=4)
+        assert text == legacy_text == parallel_text
+        print(f"{pages:>6} {legacy * 1000:>10.1f} {engine * 1000:>10.1f} {parallel * 1000:>12.1f} {len(text):>8}")
+
+    capped, _ = timed(extract_text, make_pdf(400))
+    print(f"400 pages with default caps: {capped * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
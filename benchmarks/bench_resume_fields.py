@@ -0,0 +1,102 @@
+"""Field hit rates of resume extraction on a fixture set.
+
+Each fixture resume is paired with LLM responses in several formats (strict
+JSON, fenced JSON, the old markdown block, markdown with bold labels). The
+legacy per-field regex is compared with resume_fields.parse_resume_fields.
+
+    python benchmarks/bench_resume_fields.py
+"""
+import json
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_fields import CANDIDATE_FIELDS, parse_resume_fields  # noqa: E402
+
+FIXTURES = [
+    {
+        "resume": "Jane Doe\njane.doe@example.com | +1 (415) 555-0134\nSan Francisco, CA\nSenior Backend Engineer, 2016 - 2024\nPython, Django, PostgreSQL, AWS",
+        "expected": {"full_name": "Jane Doe", "email": "jane.doe@example.com", "phone": "+1 (415) 555-0134",
+                     "years_of_experience": "8 years", "desired_position": "Senior Backend Engineer",
+                     "location": "San Francisco, CA", "tech_stack": "Python, Django, PostgreSQL, AWS"},
+    },
+    {
+        "resume": "Ravi Kumar\nEmail: ravi.k@mail.co.in  Phone: 98450 12345\nBengaluru\nFrontend Developer 2019-2024\nReact, TypeScript, Node.js",
+        "expected": {"full_name": "Ravi Kumar", "email": "ravi.k@mail.co.in", "phone": "98450 12345",
+                     "years_of_experience": "5 years", "desired_position": "Frontend Developer",
+                     "location": "Bengaluru", "tech_stack": "React, TypeScript, Node.js"},
+    },
+    {
+        "resume": "Maria Garcia — ML Engineer\nmaria_garcia@uni.edu\n+34 612 345 678\nMadrid, Spain\nPyTorch, Kubernetes, Go",
+        "expected": {"full_name": "Maria Garcia", "email": "maria_garcia@uni.edu", "phone": "+34 612 345 678",
+                     "years_of_experience": "3 years", "desired_position": "ML Engineer",
+                     "location": "Madrid, Spain", "tech_stack": "PyTorch, Kubernetes, Go"},
+    },
+]
+
+
+def as_json(expected: dict) -> str:
+    data = {k: v for k, v in expected.items() if k not in ("email", "phone")}
+    data["tech_stack"] = expected["tech_stack"].split(", ")
+    return json.dumps(data)
+
+
+def as_fenced_json(expected: dict) -> str:
+    return f"Here is the extraction:\n```json\n{as_json(expected)}\n```"
+
+
+def as_markdown(expected: dict) -> str:
+    return f"""**EXTRACTED INFORMATION:**
+- Full Name: {expected['full_name']}
+- Email: {expected['email']}
+- Phone: {expected['phone']}
+- Years of Experience: {expected['years_of_experience']}
+- Current/Recent Position: {expected['desired_position']}
+- Location: {expected['location']}
+- Tech Stack/Skills: {expected['tech_stack']}"""
+
+
+def as_bold_markdown(expected: dict) -> str:
+    return f"""**EXTRACTED INFORMATION:**
+- **Full Name:** {expected['full_name']}
+- **Years of Experience:** {expected['years_of_experience']}
+- **Current/Recent Position:** {expected['desired_position']}
+- **Location:** {expected['location']}
+- **Tech Stack/Skills:** {expected['tech_stack']}"""
+
+
+FORMATS = {"json": as_json, "fenced_json": as_fenced_json, "markdown": as_markdown, "bold_markdown": as_bold_markdown}
+
+LEGACY_LABELS = {"full_name": "Full Name", "email": "Email", "phone": "Phone",
+                 "years_of_experience": "Years of Experience", "desired_position": "Current/Recent Position",
+                 "location": "Location", "tech_stack": "Tech Stack/Skills"}
+
+
+def legacy_parse(text: str) -> dict:
+    fields = {}
+    for name, label in LEGACY_LABELS.items():
+        match = re.search(rf"{label}:\s*(.+?)(?:\n|$)", text, re.IGNORECASE)
+        value = match.group(1).strip() if match else None
+        fields[name] = value if value and value.lower() not in ["not found", "n/a", "", "-"] else None
+    return fields
+
+
+def main():
+    print(f"{'format':>14} {'legacy_hit_rate':>16} {'structured_hit_rate':>20}")
+    for name, render in FORMATS.items():
+        legacy_hits = structured_hits = total = 0
+        for fixture in FIXTURES:
+            response = render(fixture["expected"])
+            legacy = legacy_parse(response)
+            structured = parse_resume_fields(response, fixture["resume"]).to_candidate_data()
+            for field in CANDIDATE_FIELDS:
+                total += 1
+                legacy_hits += legacy[field] == fixture["expected"][field]
+                structured_hits += structured[field] == fixture["expected"][field]
+        print(f"{name:>14} {legacy_hits / total:>16.0%} {structured_hits / total:>20.0%}")
+
+
+if __name__ == "__main__":
+    main()
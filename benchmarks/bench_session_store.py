@@ -0,0 +1,85 @@
+"""Session store cost: snapshot size and save/load latency per backend.
+
+"save" writes the whole snapshot; "turn save" is SessionManager.save after
+one new message, which writes the state and appends only that message.
+Uses in-process stand-ins for the external backends (mongomock, fakeredis),
+so the numbers cover serialization and client overhead, not network time.
+
+    python benchmarks/bench_session_store.py --messages 10 100 500
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fakeredis  # noqa: E402
+import mongomock  # noqa: E402
+
+import database  # noqa: E402
+from interview import InterviewSession  # noqa: E402
+from session_store import (  # noqa: E402
+    MemorySessionStore, MongoSessionStore, RedisSessionStore, SessionManager, encode_snapshot,
+)
+from transcript import Transcript  # noqa: E402
+
+
+def make_session(messages: int) -> InterviewSession:
+    session = InterviewSession(agent=None, find_duplicate=lambda **_: None)
+    session.session_id = database.new_candidate_id()
+    session.candidate_data.update(full_name="Jane Doe", tech_stack="Python, Django",
+                                  resume_analysis="**EXTRACTED INFORMATION:** ... " * 40)
+    session.candidate_data.clear_dirty()
+    session.messages = Transcript(
+        {"role": "user" if i % 2 else "assistant", "content": f"Message {i}: " + "details " * 40}
+        for i in range(messages)
+    )
+    return session
+
+
+def median_ms(fn, repeat: int = 50) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+
+    stores = {
+        "memory": MemorySessionStore(),
+        "mongo": MongoSessionStore(collection=mongomock.MongoClient().db.sessions),
+        "redis": RedisSessionStore(client=fakeredis.FakeRedis()),
+    }
+    print(f"{'messages':>8} {'snapshot':>10} {'backend':>8} {'save ms':>8} {'turn save ms':>13} {'load ms':>8}")
+    for count in args.messages:
+        session = make_session(count)
+        size = len(encode_snapshot(session.snapshot()))
+        for name, store in stores.items():
+            session.store_version = store.version(session.session_key)
+
+            def save():
+                session.store_version = store.save(session.session_key, session.snapshot(), session.store_version)
+            save_ms = median_ms(save)
+            load_ms = median_ms(lambda: store.load(session.session_key))
+
+            manager = SessionManager(store, agent_factory=lambda: None)
+            turn_session = make_session(count)
+            manager.save(turn_session)
+
+            def turn_save():
+                turn_session.messages.add("user", "One more answer: " + "details " * 40)
+                manager.save(turn_session)
+            turn_ms = median_ms(turn_save)
+            print(f"{count:>8} {size:>8} B {name:>8} {save_ms:>8.2f} {turn_ms:>13.2f} {load_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
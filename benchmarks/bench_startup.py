@@ -0,0 +1,56 @@
+"""Cold-start cost of the app: import time and first paint.
+
+Each measurement runs in a fresh interpreter. Import time comes from
+``python -X importtime``; first paint is a headless Streamlit run of app.py
+(AppTest), followed by a rerun in the same process.
+
+    python benchmarks/bench_startup.py
+"""
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PAINT = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+print(f"{first * 1000:.0f} {(time.perf_counter() - start) * 1000:.0f}")
+"""
+
+
+def import_profile(statement: str, top: int = 5):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if match and len(match.group(3)) == 1:  # top-level imports only
+            rows.append((int(match.group(2)), match.group(4)))
+    rows.sort(reverse=True)
+    return sum(us for us, _ in rows) / 1000, rows[:top]
+
+
+def main():
+    cases = {
+        "app modules": "import interview, llm_client, pdf_extract, tracing",
+        "+ crewai (first LLM call)": "import interview, llm_client, crewai",
+    }
+    for name, statement in cases.items():
+        total_ms, top = import_profile(statement)
+        print(f"{name:<28} {total_ms:8.0f} ms   " + ", ".join(f"{mod}={us / 1000:.0f}ms" for us, mod in top))
+
+    result = subprocess.run([sys.executable, "-c", PAINT], cwd=ROOT, capture_output=True, text=True, check=True)
+    first, rerun = result.stdout.split()[-2:]
+    print(f"{'first paint (headless)':<28} {first:>8} ms   rerun {rerun} ms")
+
+
+if __name__ == "__main__":
+    main()
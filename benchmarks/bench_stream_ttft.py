@@ -0,0 +1,44 @@
+"""Time-to-first-chunk of TalentScoutCrew.stream vs. a blocking run, using FakeLLM.
+
+    python benchmarks/bench_stream_ttft.py [latency_s] [chunk_delay_s]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from crew_agent import TalentScoutCrew  # noqa: E402
+from fake_llm import FakeLLM  # noqa: E402
+
+# Repeated prompts must reach the LLM; the response cache is measured in bench_llm_cache.py.
+config.LLM_CACHE_ENABLED = False
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    chunk_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+
+    blocking = TalentScoutCrew(llm=FakeLLM(latency=latency, chunk_delay=chunk_delay))
+    start = time.perf_counter()
+    blocking.run("Hello")
+    full = time.perf_counter() - start
+
+    streaming = TalentScoutCrew(llm=FakeLLM(latency=latency, chunk_delay=chunk_delay))
+    start = time.perf_counter()
+    first = None
+    chunks = []
+    for chunk in streaming.stream("Hello"):
+        if first is None:
+            first = time.perf_counter() - start
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+
+    assert "".join(chunks) == streaming.last_response
+    print(f"blocking run, first visible text: {full * 1000:.1f} ms")
+    print(f"stream, time to first chunk:      {first * 1000:.1f} ms (complete after {total * 1000:.1f} ms, {len(chunks)} chunks)")
+
+
+if __name__ == "__main__":
+    main()
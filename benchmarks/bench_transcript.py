@@ -0,0 +1,105 @@
+"""Rerun time and memory per session for long interviews.
+
+For each transcript length:
+  - memory of the restored transcript as dicts (previous layout) and as
+    compact Message records, measured with tracemalloc after decoding a
+    session snapshot, as the session store does
+  - memory of a whole restored session with its resume text held, and
+    released after saving
+  - median headless rerun of app.py (AppTest) drawing every message, and
+    drawing only the latest TRANSCRIPT_PAGE_SIZE messages
+
+    python benchmarks/bench_transcript.py --messages 10 100 500
+"""
+import argparse
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import config  # noqa: E402
+import database  # noqa: E402
+from interview import InterviewSession  # noqa: E402
+from session_store import decode_snapshot, encode_snapshot, get_session_manager  # noqa: E402
+from transcript import Transcript  # noqa: E402
+
+RESUME_TEXT = "Senior engineer. Built payment systems in Python and Go; led a team of six. " * 200
+
+
+def make_session(messages: int) -> InterviewSession:
+    session = InterviewSession(agent=None, find_duplicate=lambda **_: None)
+    session.resume_uploaded = True
+    session.candidate_data.update(full_name="Jane Doe", tech_stack="Python, Go", resume_text=RESUME_TEXT,
+                                  resume_analysis="**EXTRACTED INFORMATION:** ... " * 40)
+    for i in range(messages):
+        role = "user" if i % 2 else "assistant"
+        session.messages.add(role, f"Message {i}: " + "I would profile the service, then add caching. " * 6)
+    return session
+
+
+def retained_kib(build, copies: int = 10) -> float:
+    """Memory still held by each object ``build`` returns (after a warm-up call)."""
+    build()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = [build() for _ in range(copies)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return size / copies / 1024
+
+
+def median_rerun_ms(at: AppTest, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+    page_size = config.TRANSCRIPT_PAGE_SIZE
+
+    print(f"{'messages':>8} {'dicts KiB':>10} {'records KiB':>12} {'session KiB':>12} {'released KiB':>13} "
+          f"{'full ms':>8} {'window ms':>10}")
+    for count in args.messages:
+        session = make_session(count)
+        session.candidate_data.clear_dirty()
+        data = encode_snapshot(session.snapshot())
+        dicts = retained_kib(lambda: decode_snapshot(data)["messages"])
+        records = retained_kib(lambda: Transcript(decode_snapshot(data)["messages"]))
+        held = retained_kib(lambda: InterviewSession.from_snapshot(decode_snapshot(data), None))
+
+        session.session_id = database.new_candidate_id()
+        session.release_resume_text()
+        released_data = encode_snapshot(session.snapshot())
+        released = retained_kib(lambda: InterviewSession.from_snapshot(decode_snapshot(released_data), None))
+
+        get_session_manager()._remember(session)
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+        at.query_params["session"] = session.session_key
+        at.run()
+        config.TRANSCRIPT_PAGE_SIZE = 10 ** 9
+        full_ms = median_rerun_ms(at)
+        config.TRANSCRIPT_PAGE_SIZE = page_size
+        window_ms = median_rerun_ms(at)
+
+        print(f"{count:>8} {dicts:>10.1f} {records:>12.1f} {held:>12.1f} {released:>13.1f} "
+              f"{full_ms:>8.1f} {window_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Offline load test: concurrent simulated interviews with a fake LLM and mongomock.
+
+Each synthetic candidate uploads a resume, answers the data-collection and
+technical questions, and says goodbye, driven through InterviewSession (the
+same code path as the Streamlit app). Reports turn latency percentiles,
+prompt tokens per LLM call, bytes written to MongoDB and memory per session.
+
+    python benchmarks/load_test.py --candidates 20 --turns 8 --latency 0.05
+"""
+import argparse
+import json
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bson  # noqa: E402
+import mongomock  # noqa: E402
+
+import database  # noqa: E402
+from bench_pdf_extract import make_pdf  # noqa: E402
+from conversation_context import estimate_tokens  # noqa: E402
+from crew_agent import ANSWERS_MARKER, TalentScoutCrew  # noqa: E402
+from evaluation import AnswerEvaluator, fake_scores  # noqa: E402
+from fake_llm import FakeLLM  # noqa: E402
+from interview import InterviewSession  # noqa: E402
+from persistence import WriteBehindQueue, write_to_mongo  # noqa: E402
+from question_bank import QuestionBank  # noqa: E402
+from resume_cache import ResumeAnalysisCache  # noqa: E402
+
+STACKS = ["Python, Django, PostgreSQL", "React, Node.js, MongoDB", "Java, Spring Boot, MySQL", "Go, Kubernetes, AWS"]
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.turn_latencies = []
+        self.prompt_tokens = []
+        self.bytes_written = 0
+        self.writes = 0
+
+    def add(self, name, value):
+        with self.lock:
+            getattr(self, name).append(value)
+
+
+def make_responder(metrics: Metrics):
+    def respond(prompt: str) -> str:
+        metrics.add("prompt_tokens", estimate_tokens(prompt))
+        if "Respond with ONLY a JSON object" in prompt:
+            resume = prompt.split("RESUME CONTENT:", 1)[-1]
+            name = re.search(r"Name: (.+)", resume)
+            stack = re.search(r"Skills: (.+)", resume)
+            return json.dumps({
+                "full_name": name.group(1).strip() if name else None,
+                "years_of_experience": "4 years",
+                "desired_position": "Software Engineer",
+                "location": "Remote",
+                "tech_stack": stack.group(1).strip().split(", ") if stack else [],
+                "summary": "Synthetic candidate.",
+                "suggested_questions": [],
+            })
+        if ANSWERS_MARKER in prompt:
+            return fake_scores(prompt)
+        if "Generate 3-5 technical interview questions" in prompt:
+            return "\n".join(f"{i}. Describe how you would handle scenario {i} in production." for i in range(1, 6))
+        return "Thanks! Next question: how would you design a rate limiter for a public API?"
+    return respond
+
+
+def resume_pdf(index: int) -> bytes:
+    lines = [
+        f"Name: Candidate {index:04d}",
+        f"Email: candidate{index}@example.com",
+        f"Phone: +1 415 555 {index % 10000:04d}",
+        f"Skills: {STACKS[index % len(STACKS)]}",
+    ] + [f"Project {i}: built and operated services at scale" for i in range(30)]
+    return make_pdf(1, lines)
+
+
+def run_candidate(index: int, args, metrics: Metrics, shared: dict) -> InterviewSession:
+    agent = TalentScoutCrew(llm=FakeLLM(latency=args.latency, responder=make_responder(metrics)))
+    session = InterviewSession(agent, write_queue=shared["queue"], resume_cache=shared["resume_cache"],
+                               question_bank=shared["question_bank"], evaluator=shared["evaluator"])
+
+    start = time.perf_counter()
+    session.ingest_resume(resume_pdf(index))
+    metrics.add("turn_latencies", time.perf_counter() - start)
+
+    answers = ["Senior Backend Engineer"] + [
+        f"For question {i} I would start by measuring, then add caching and back-pressure." for i in range(args.turns)
+    ] + ["Thanks, bye!"]
+    for answer in answers:
+        start = time.perf_counter()
+        session.handle_turn(answer)
+        metrics.add("turn_latencies", time.perf_counter() - start)
+    return session
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=8, help="technical answers per candidate")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake LLM latency in seconds")
+    args = parser.parse_args()
+
+    client = mongomock.MongoClient()
+    database.set_client(client)
+    metrics = Metrics()
+
+    def measuring_writer(candidate_id, document, set_data, push_data):
+        payload = document if document is not None else {"$set": set_data, "$push": push_data}
+        with metrics.lock:
+            metrics.bytes_written += len(bson.encode(payload))
+            metrics.writes += 1
+        write_to_mongo(candidate_id, document, set_data, push_data)
+
+    journal = Path(tempfile.mkdtemp()) / "journal.jsonl"
+    shared = {
+        "queue": WriteBehindQueue(writer=measuring_writer, journal_path=str(journal)),
+        "resume_cache": ResumeAnalysisCache(collection=client.bench.resume_cache),
+        "question_bank": QuestionBank(collection=client.bench.question_bank),
+    }
+    evaluator_llm = FakeLLM(latency=args.latency, responder=make_responder(Metrics()))
+    shared["evaluator"] = AnswerEvaluator(agent=TalentScoutCrew(llm=evaluator_llm), write_queue=shared["queue"])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        sessions = list(pool.map(lambda i: run_candidate(i, args, metrics, shared), range(args.candidates)))
+    elapsed = time.perf_counter() - start
+    shared["evaluator"].flush()
+    shared["queue"].close()
+    evaluation = dict(shared["evaluator"].stats)
+
+    # Memory per session, measured in a separate zero-latency pass.
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    quiet = argparse.Namespace(turns=args.turns, latency=0.0)
+    kept = [run_candidate(10_000 + i, quiet, Metrics(), shared) for i in range(10)]
+    shared["evaluator"].close()
+    shared["queue"].close()
+    per_session = (tracemalloc.get_traced_memory()[0] - baseline) / len(kept)
+    tracemalloc.stop()
+
+    latencies_ms = [t * 1000 for t in metrics.turn_latencies]
+    turns = len(latencies_ms)
+    print(f"candidates={args.candidates} concurrency={args.concurrency} turns={turns} elapsed={elapsed:.2f}s")
+    print(f"turn latency ms: p50={percentile(latencies_ms, 50):.1f} p95={percentile(latencies_ms, 95):.1f} "
+          f"p99={percentile(latencies_ms, 99):.1f}")
+    print(f"LLM calls={len(metrics.prompt_tokens)} prompt tokens/call: "
+          f"mean={statistics.mean(metrics.prompt_tokens):.0f} p95={percentile(metrics.prompt_tokens, 95)}")
+    print(f"DB writes={metrics.writes} bytes written={metrics.bytes_written} "
+          f"({metrics.bytes_written / turns:.0f} B/turn)")
+    print(f"memory per session: {per_session / 1024:.1f} KiB")
+    print(f"sessions ended: {sum(s.conversation_ended for s in sessions)}/{len(sessions)}")
+    print(f"answers scored after the interviews: {evaluation['scored']}/{evaluation['answers']} "
+          f"in {evaluation['batches']} LLM calls")
+
+
+if __name__ == "__main__":
+    main()
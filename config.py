@@ -12,3 +12,122 @@ CANDIDATES_COLLECTION = "candidates"
 EXIT_KEYWORDS = ["bye", "exit", "quit", "goodbye", "thank you", "thanks", "end"]
 
 GEMINI_MODEL = "gemini-2.0-flash"
+
+# Agent/crew console logging; keep off in production, set CREW_VERBOSE=1 to debug.
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "0").lower() in ("1", "true", "yes")
+
+# Conversation context sent to the agent on every turn.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+CONTEXT_WINDOW_MESSAGES = int(os.getenv("CONTEXT_WINDOW_MESSAGES", "12"))
+CONTEXT_SUMMARY_LINE_CHARS = 160
+
+# MongoDB connection pool (one client per process).
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "1"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000"))
+MONGODB_WRITE_CONCERN = os.getenv("MONGODB_WRITE_CONCERN", "1")
+
+# Auto-save strategy: "delta" ($push new messages, $set changed fields) or "full".
+AUTO_SAVE_MODE = os.getenv("AUTO_SAVE_MODE", "delta")
+
+# Write-behind queue for session auto-save.
+WRITE_QUEUE_MAX_RETRIES = int(os.getenv("WRITE_QUEUE_MAX_RETRIES", "3"))
+WRITE_QUEUE_BACKOFF_SECONDS = float(os.getenv("WRITE_QUEUE_BACKOFF_SECONDS", "0.2"))
+WRITE_QUEUE_JOURNAL_PATH = os.getenv("WRITE_QUEUE_JOURNAL_PATH", ".talentscout_journal.jsonl")
+WRITE_QUEUE_REPLAY_INTERVAL_SECONDS = float(os.getenv("WRITE_QUEUE_REPLAY_INTERVAL_SECONDS", "30"))
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini/gemini-flash-lite-latest")
+
+# Content-addressed cache of resume extraction + analysis.
+RESUME_CACHE_COLLECTION = "resume_analysis_cache"
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256"))
+RESUME_CACHE_TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+# Resume upload acknowledgement: "template" (from extracted fields) or "llm".
+RESUME_ACK_MODE = os.getenv("RESUME_ACK_MODE", "template")
+
+# PDF text extraction limits (guards against huge or malicious uploads).
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "100000"))
+PDF_MMAP_THRESHOLD_BYTES = 8 * 1024 * 1024
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "1"))
+PDF_PARALLEL_MIN_PAGES = 40
+
+# Bulk screening (batch_screen.py)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_REQUESTS_PER_MINUTE = float(os.getenv("BATCH_REQUESTS_PER_MINUTE", "60"))
+
+# Number of technical questions asked once candidate details are collected.
+TECH_QUESTION_COUNT = int(os.getenv("TECH_QUESTION_COUNT", "5"))
+
+# Technical question bank
+QUESTION_BANK_COLLECTION = "question_bank"
+QUESTION_BANK_CACHE_SIZE = int(os.getenv("QUESTION_BANK_CACHE_SIZE", "512"))
+
+# Tracing: span timings, prompt/completion sizes and cache hits per session.
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0").lower() in ("1", "true", "yes")
+TRACING_JSON_LOG = os.getenv("TRACING_JSON_LOG", "1").lower() in ("1", "true", "yes")
+TRACING_PROM_FILE = os.getenv("TRACING_PROM_FILE", "")
+TRACING_EXPORT_INTERVAL_SECONDS = 10.0
+
+# Candidate storage layout. "split" keeps the candidate document small: resume
+# text/analysis go compressed into RESUME_BLOBS_COLLECTION and the transcript
+# into TRANSCRIPTS_COLLECTION buckets. "embedded" keeps everything in one document.
+CANDIDATE_STORAGE_LAYOUT = os.getenv("CANDIDATE_STORAGE_LAYOUT", "split")
+RESUME_BLOBS_COLLECTION = "candidate_resumes"
+TRANSCRIPTS_COLLECTION = "candidate_transcripts"
+TRANSCRIPT_BUCKET_SIZE = int(os.getenv("TRANSCRIPT_BUCKET_SIZE", "50"))
+BLOB_COMPRESSION = os.getenv("BLOB_COMPRESSION", "zlib")  # "zlib" or "zstd" (needs zstandard)
+
+# Re-application de-duplication: match on normalized email/phone, the resume
+# text hash, or a MinHash signature (LSH bands are indexed for lookup).
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1").lower() in ("1", "true", "yes")
+DEDUP_SHINGLE_SIZE = 5
+DEDUP_MINHASH_PERMUTATIONS = 64
+DEDUP_MINHASH_BANDS = 16
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.9"))
+
+# Shared LLM client: concurrency, provider rate limit, timeouts and retries.
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "1.0"))
+# Timed-out runs that may keep running in the background without holding a
+# concurrency slot; beyond this, a hung run keeps its slot until it returns.
+LLM_MAX_ABANDONED_CALLS = int(os.getenv("LLM_MAX_ABANDONED_CALLS", "2"))
+
+# Session store for in-progress interviews: "memory" (single process),
+# "mongo" or "redis". Each app process keeps at most SESSION_MAX_LIVE
+# sessions loaded and unloads those idle for SESSION_IDLE_SECONDS; stored
+# snapshots expire after SESSION_TTL_SECONDS. With a shared store, a live
+# session is checked against the stored version at most every
+# SESSION_REVALIDATE_SECONDS.
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_COLLECTION = "sessions"
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SESSION_MAX_LIVE = int(os.getenv("SESSION_MAX_LIVE", "200"))
+SESSION_IDLE_SECONDS = int(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+SESSION_REVALIDATE_SECONDS = float(os.getenv("SESSION_REVALIDATE_SECONDS", "5"))
+
+# LLM response cache for repeatable prompts (resume analysis, acknowledgements,
+# question generation). Conversational turns always bypass it.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+LLM_CACHE_PERSISTENT = os.getenv("LLM_CACHE_PERSISTENT", "1").lower() in ("1", "true", "yes")
+LLM_CACHE_COLLECTION = "llm_response_cache"
+
+# Post-interview answer evaluation: a background pool scores technical answers,
+# packing up to EVAL_BATCH_SIZE answers of one candidate into one LLM call.
+EVAL_ENABLED = os.getenv("EVAL_ENABLED", "1").lower() in ("1", "true", "yes")
+EVAL_BATCH_SIZE = int(os.getenv("EVAL_BATCH_SIZE", "8"))
+EVAL_WORKERS = int(os.getenv("EVAL_WORKERS", "2"))
+EVAL_MAX_ANSWER_CHARS = int(os.getenv("EVAL_MAX_ANSWER_CHARS", "2000"))
+
+# Chat rendering: only the latest TRANSCRIPT_PAGE_SIZE messages are drawn on
+# each rerun; earlier ones are collapsed and shown a page at a time on request.
+TRANSCRIPT_PAGE_SIZE = int(os.getenv("TRANSCRIPT_PAGE_SIZE", "20"))
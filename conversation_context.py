@@ -0,0 +1,113 @@
+from collections import deque
+from typing import Iterable, Optional
+import config
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) good enough for budgeting."""
+    return (len(text) + 3) // 4
+
+
+def _format_message(message: dict) -> str:
+    speaker = "User" if message["role"] == "user" else "Assistant"
+    return f"{speaker}: {message['content']}"
+
+
+class ConversationContext:
+    """
+    Token-bounded conversation context for the agent prompt.
+
+    Recent turns are kept verbatim in a rolling window; turns that fall out of
+    the window are condensed into a running summary. Rendered lines are cached
+    so each turn only formats the newly added messages.
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        window_messages: Optional[int] = None,
+        summary_line_chars: Optional[int] = None,
+    ):
+        self.token_budget = token_budget or config.CONTEXT_TOKEN_BUDGET
+        self.window_messages = window_messages or config.CONTEXT_WINDOW_MESSAGES
+        self.summary_line_chars = summary_line_chars or config.CONTEXT_SUMMARY_LINE_CHARS
+        self.summary_budget = self.token_budget // 4
+
+        self._window = deque()  # (rendered line, tokens)
+        self._window_tokens = 0
+        self._summary = deque()  # (condensed line, tokens)
+        self._summary_tokens = 0
+        self._dropped = 0
+        self._consumed = 0
+        self._rendered: Optional[str] = None
+
+    def sync(self, messages: list) -> None:
+        """Consume any messages not yet seen (messages are append-only)."""
+        if len(messages) < self._consumed:
+            self.reset()
+        for message in messages[self._consumed:]:
+            self.add(message)
+
+    def extend(self, messages: Iterable[dict]) -> None:
+        for message in messages:
+            self.add(message)
+
+    def add(self, message: dict) -> None:
+        line = _format_message(message)
+        tokens = estimate_tokens(line)
+        self._window.append((line, tokens))
+        self._window_tokens += tokens
+        self._consumed += 1
+
+        evicted = False
+        window_budget = self.token_budget - self.summary_budget
+        while len(self._window) > 1 and (
+            len(self._window) > self.window_messages or self._window_tokens > window_budget
+        ):
+            old_line, old_tokens = self._window.popleft()
+            self._window_tokens -= old_tokens
+            self._summarize(old_line)
+            evicted = True
+
+        if evicted or self._rendered is None:
+            self._rendered = None
+        else:
+            self._rendered = f"{self._rendered}\n{line}" if self._rendered else line
+
+    def _summarize(self, line: str) -> None:
+        condensed = " ".join(line.split())
+        if len(condensed) > self.summary_line_chars:
+            condensed = condensed[: self.summary_line_chars].rstrip() + "..."
+        tokens = estimate_tokens(condensed)
+        self._summary.append((condensed, tokens))
+        self._summary_tokens += tokens
+        while self._summary and self._summary_tokens > self.summary_budget:
+            _, dropped_tokens = self._summary.popleft()
+            self._summary_tokens -= dropped_tokens
+            self._dropped += 1
+
+    def render(self) -> str:
+        """Return the context block: summary of older turns plus recent turns."""
+        if self._rendered is None:
+            self._rendered = "\n".join(line for line, _ in self._window)
+        if not self._summary:
+            return self._rendered
+
+        header = "Summary of earlier conversation"
+        if self._dropped:
+            header += f" ({self._dropped} older turns omitted)"
+        summary = "\n".join(f"- {line}" for line, _ in self._summary)
+        return f"{header}:\n{summary}\n\nRecent conversation:\n{self._rendered}"
+
+    @property
+    def tokens(self) -> int:
+        return self._summary_tokens + self._window_tokens
+
+    def reset(self) -> None:
+        self._window.clear()
+        self._window_tokens = 0
+        self._summary.clear()
+        self._summary_tokens = 0
+        self._dropped = 0
+        self._consumed = 0
+        self._rendered = None
@@ -0,0 +1,216 @@
+from typing import Callable, Dict, Optional
+import re
+import config
+from resume_fields import find_email, find_phone
+
+# Information-gathering order; the position is always asked explicitly.
+FIELD_ORDER = ("desired_position", "full_name", "email", "phone", "years_of_experience", "location", "tech_stack")
+
+FIELD_PROMPTS = {
+    "full_name": "Could you please tell me your full name?",
+    "email": "What's the best email address to reach you?",
+    "phone": "What's your phone number?",
+    "years_of_experience": "How many years of professional experience do you have?",
+    "desired_position": "Which position are you applying for?",
+    "location": "Where are you currently located?",
+    "tech_stack": "Which technologies do you work with? Please list your main languages, frameworks, databases and tools.",
+}
+
+_NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+}
+
+
+_AMOUNT = r"\d+(?:\.\d+)?|" + "|".join(_NUMBER_WORDS)
+
+# Replies that are not an answer to the field we asked for.
+_NON_ANSWERS = {
+    "ok", "okay", "k", "yes", "yeah", "yep", "sure", "fine", "cool", "great", "thanks", "thank you",
+    "hi", "hello", "hey", "hmm", "um", "uh", "maybe", "idk", "dunno", "skip", "pass", "later",
+    "whatever", "anything", "n/a", "na", "none", "nothing", "no idea", "not sure", "same",
+}
+_NEGATION_RE = re.compile(
+    r"^(?:no|nope|not|never|none|don'?t|do not|i don'?t|i do not|i'?m not|i am not|can'?t|cannot|"
+    r"won'?t|rather not|prefer not)\b"
+)
+_QUESTION_RE = re.compile(r"\?|^(?:what|why|how|which|who|where|when|can|could|would|should|do|does|is|are)\b")
+# Words that make a reply a sentence about the candidate rather than a value ("I mostly use Python").
+_SENTENCE_WORDS = {
+    "i", "i'm", "im", "i've", "me", "my", "we", "our", "you", "am", "is", "are", "was", "be", "been",
+    "use", "used", "using", "work", "worked", "working", "know", "like", "prefer", "mostly", "mainly", "usually",
+}
+# Names never contain these ("a software engineer", "looking for a job").
+_NOT_NAME_WORDS = _SENTENCE_WORDS | {
+    "a", "an", "the", "to", "for", "from", "with", "at", "in", "on", "as", "not", "here", "looking",
+    "applying", "interested", "engineer", "developer", "programmer", "student",
+}
+
+
+def _is_non_answer(text: str) -> bool:
+    """Filler words, negations and questions ("ok", "no idea", "why do you ask?")."""
+    lowered = " ".join(text.lower().split()).rstrip(" .!")
+    return (not lowered or lowered in _NON_ANSWERS
+            or bool(_NEGATION_RE.match(lowered)) or bool(_QUESTION_RE.search(lowered)))
+
+
+def _has_word(text: str, words: set) -> bool:
+    return any(word in words for word in re.findall(r"[\w']+", text.lower()))
+
+
+def _strip_prefix(text: str, prefixes: str) -> str:
+    text = re.sub(rf"^\s*(?:{prefixes})\s+", "", text.strip(), flags=re.IGNORECASE)
+    return text.strip(" .!")
+
+
+def parse_name(text: str) -> Optional[str]:
+    if _is_non_answer(text):
+        return None
+    name = _strip_prefix(text, r"my name is|my full name is|i am|i'm|this is|it's|name:")
+    words = name.split()
+    if _has_word(name, _NOT_NAME_WORDS):
+        return None
+    if 1 <= len(words) <= 5 and all(re.fullmatch(r"[^\W\d_][^\W\d_'.-]*", w) for w in words):
+        return name.title() if name.islower() else name
+    return None
+
+
+def parse_years(text: str) -> Optional[str]:
+    lowered = text.lower()
+    if re.search(r"\b(no|zero)\b.*\bexperience\b|\b(?:don'?t|do not) have any experience\b|"
+                 r"\bfresher\b|\bfresh graduate\b", lowered):
+        return "0 years"
+    if _is_non_answer(text):
+        return None
+    amounts = re.findall(rf"\b({_AMOUNT})\s*\+?\s*(years?|yrs?|months?|mos?)?\b", lowered)
+    if not amounts:
+        return None
+
+    def number(amount: str) -> float:
+        return float(_NUMBER_WORDS.get(amount, amount))
+
+    if any(unit for _, unit in amounts):
+        # "2 years and 6 months", "18 months": unitless numbers are ignored.
+        value = sum(number(a) / 12 if unit.startswith("mo") else number(a) for a, unit in amounts if unit)
+    else:
+        value = number(amounts[0][0])
+    if value > 60:
+        return None
+    value = round(value, 2)
+    return "1 year" if value == 1 else f"{value:g} years"
+
+
+def _short_answer(text: str, max_words: int) -> Optional[str]:
+    if _is_non_answer(text) or len(text) > 80 or len(text.split()) > max_words:
+        return None
+    return text
+
+
+def parse_position(text: str) -> Optional[str]:
+    position = _strip_prefix(text, r"i'm applying for|i am applying for|applying for|i want to apply for|for|the")
+    position = _strip_prefix(position, r"the|a|an")
+    position = re.sub(r"\s+(?:position|role)$", "", position, flags=re.IGNORECASE)
+    if _has_word(position, _SENTENCE_WORDS):
+        return None
+    return _short_answer(position, 10)
+
+
+def parse_location(text: str) -> Optional[str]:
+    location = _strip_prefix(text, r"i'm in|i am in|i live in|i'm based in|i am based in|based in|located in|in")
+    return _short_answer(location, 6)
+
+
+def parse_tech_stack(text: str) -> Optional[str]:
+    if _is_non_answer(text):
+        return None
+    items = [item.strip().rstrip(" .") for item in re.split(r",|;|/|\band\b|\n", text) if item.strip().rstrip(" .")]
+    if not items or any(len(item.split()) > 4 or _has_word(item, _SENTENCE_WORDS) for item in items):
+        return None
+    return ", ".join(items)
+
+
+FIELD_PARSERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "full_name": parse_name,
+    "email": find_email,
+    "phone": find_phone,
+    "years_of_experience": parse_years,
+    "desired_position": parse_position,
+    "location": parse_location,
+    "tech_stack": parse_tech_stack,
+}
+
+
+class ConversationFlow:
+    """
+    Stage engine for the interview.
+
+    The information-gathering stage is served locally: the engine asks for
+    each missing candidate field from a template and parses simple answers
+    itself. Turns it cannot handle (unparseable answers, the technical
+    phase) return None and go to the LLM.
+    """
+
+    def __init__(self, total_questions: Optional[int] = None):
+        self.stage = "greeting"
+        self.pending_field: Optional[str] = None
+        self.position_confirmed = False
+        self.question_index = 0
+        self.total_questions = total_questions or config.TECH_QUESTION_COUNT
+        self.stats = {"local": 0, "llm": 0}
+
+    def missing_fields(self, candidate_data: dict) -> list:
+        missing = [name for name in FIELD_ORDER if not candidate_data.get(name)]
+        if not self.position_confirmed and "desired_position" not in missing:
+            missing.insert(0, "desired_position")
+        return missing
+
+    def next_question(self, candidate_data: dict) -> Optional[str]:
+        """Move to the next missing field and return its prompt (None when all collected)."""
+        missing = self.missing_fields(candidate_data)
+        if not missing:
+            self.stage = "technical"
+            self.pending_field = None
+            return None
+        self.stage = "collecting"
+        self.pending_field = missing[0]
+        return FIELD_PROMPTS[self.pending_field]
+
+    def respond(self, user_message: str, candidate_data: dict) -> Optional[str]:
+        """Handle a turn locally if possible; None means the LLM should answer."""
+        if self.stage == "collecting" and self.pending_field:
+            value = FIELD_PARSERS[self.pending_field](user_message)
+            if value is not None:
+                candidate_data[self.pending_field] = value
+                if self.pending_field == "desired_position":
+                    self.position_confirmed = True
+                question = self.next_question(candidate_data)
+                if question is not None:
+                    self.stats["local"] += 1
+                    return f"Got it, thanks! {question}"
+        self.stats["llm"] += 1
+        return None
+
+    def record_llm_reply(self) -> None:
+        if self.stage == "technical":
+            self.question_index += 1
+
+    def stage_hint(self, questions=()) -> str:
+        """Instruction appended to the LLM prompt: the pending field, or the next technical question."""
+        if self.stage == "collecting" and self.pending_field:
+            return (f"The candidate has not answered this question yet: \"{FIELD_PROMPTS[self.pending_field]}\" "
+                    "Reply briefly to their message, then ask that question again.")
+        if self.stage != "technical":
+            return ""
+        if self.question_index >= self.total_questions:
+            return ("All technical questions have been asked. Thank the candidate briefly and "
+                    "let them know they can say 'bye' to finish.")
+        number = f"technical question {self.question_index + 1} of {self.total_questions}"
+        if self.question_index < len(questions):
+            return (f"Ask {number}, based on this question from our question bank (keep it short and "
+                    f"relate it to their projects if relevant): {questions[self.question_index]}")
+        return f"Ask {number}."
+
+    @property
+    def local_fraction(self) -> float:
+        turns = self.stats["local"] + self.stats["llm"]
+        return self.stats["local"] / turns if turns else 0.0
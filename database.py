@@ -1,15 +1,292 @@
-from pymongo import MongoClient
 from datetime import datetime, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+import atexit
+import threading
+import time
+import zlib
 import config
+import tracing
+from dedup import dedup_fields, normalize_phone
+from skills import canonical_skills
+
+# pymongo is imported on first connection, not with this module, so the app
+# can render before the driver has loaded.
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+ASCENDING, DESCENDING = 1, -1  # same values as pymongo.ASCENDING / DESCENDING
+
+
+_client: Optional["MongoClient"] = None
+_client_lock = threading.Lock()
+_indexes_ready = False
+_indexes_retry_at = 0.0
+
+# After an index bootstrap error, wait this long before get_database tries
+# again instead of paying for a failed create_indexes on every call.
+INDEX_RETRY_SECONDS = 60
+
+# Large fields left out of recruiter-side queries unless explicitly requested.
+HEAVY_FIELDS = ("resume_text", "resume_analysis", "conversation_history")
+# De-duplication signatures; only read by dedup.find_duplicate.
+SIGNATURE_FIELDS = ("minhash", "minhash_bands")
+
+# In the split layout, BLOB_FIELDS live compressed in RESUME_BLOBS_COLLECTION
+# (one document per candidate) and the transcript in TRANSCRIPTS_COLLECTION
+# (fixed-size buckets of messages). The candidate document keeps a summary.
+BLOB_FIELDS = ("resume_text", "resume_analysis")
+TRANSCRIPT_FIELD = "conversation_history"
+
+CANDIDATE_INDEXES = [
+    ([("email_normalized", ASCENDING)], dict(name="email_normalized")),
+    ([("position_normalized", ASCENDING), ("created_at", DESCENDING)], dict(name="position_created_at")),
+    ([("skills", ASCENDING), ("created_at", DESCENDING)], dict(name="skills_created_at")),
+    ([("created_at", DESCENDING)], dict(name="created_at")),
+    ([("last_active", DESCENDING)], dict(name="last_active")),
+    ([("phone_normalized", ASCENDING)], dict(name="phone_normalized", sparse=True)),
+    ([("resume_fingerprint", ASCENDING)], dict(name="resume_fingerprint", sparse=True)),
+    ([("minhash_bands", ASCENDING)], dict(name="minhash_bands", sparse=True)),
+    # Upsert key of save_candidates(key="resume_sha256") in bulk screening.
+    ([("resume_sha256", ASCENDING)], dict(name="resume_sha256", sparse=True)),
+]
+
+TRANSCRIPT_INDEXES = [
+    ([("candidate_id", ASCENDING), ("bucket", ASCENDING)], dict(name="candidate_bucket", unique=True)),
+]
+
+
+def _write_concern():
+    w = config.MONGODB_WRITE_CONCERN
+    return int(w) if w.isdigit() else w
+
+
+def get_client() -> "MongoClient":
+    """Get the process-wide MongoDB client, creating it lazily on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from pymongo import MongoClient
+                _client = MongoClient(
+                    config.MONGODB_URI,
+                    maxPoolSize=config.MONGODB_MAX_POOL_SIZE,
+                    minPoolSize=config.MONGODB_MIN_POOL_SIZE,
+                    connectTimeoutMS=config.MONGODB_CONNECT_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=config.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                    socketTimeoutMS=config.MONGODB_SOCKET_TIMEOUT_MS,
+                    w=_write_concern(),
+                )
+    return _client
+
+
+def set_client(client: Optional["MongoClient"]) -> None:
+    """
+    Replace the shared client, e.g. with ``mongomock.MongoClient()`` in tests.
+
+    Any previously created client is closed.
+    """
+    global _client, _indexes_ready, _indexes_retry_at
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
+        _indexes_ready = False
+        _indexes_retry_at = 0.0
+
+
+def close_client() -> None:
+    """Close the shared client and its connection pool."""
+    set_client(None)
+
+
+atexit.register(close_client)
+
+
+def ping() -> bool:
+    """Health check: True if the MongoDB server answers a ping."""
+    try:
+        get_client().admin.command("ping")
+        return True
+    except Exception:
+        return False
 
 
 def get_database():
     """Get MongoDB database connection."""
-    client = MongoClient(config.MONGODB_URI)
-    return client[config.DATABASE_NAME]
+    db = get_client()[config.DATABASE_NAME]
+    if not _indexes_ready and time.monotonic() >= _indexes_retry_at:
+        ensure_indexes(db)
+    return db
+
+
+def ensure_indexes(db=None) -> None:
+    """Create the candidate and transcript indexes (idempotent; run once per process)."""
+    global _indexes_ready, _indexes_retry_at
+    _indexes_ready = True
+    db = db if db is not None else get_client()[config.DATABASE_NAME]
+    try:
+        from pymongo import IndexModel
+        db[config.CANDIDATES_COLLECTION].create_indexes([IndexModel(keys, **opts) for keys, opts in CANDIDATE_INDEXES])
+        db[config.TRANSCRIPTS_COLLECTION].create_indexes([IndexModel(keys, **opts) for keys, opts in TRANSCRIPT_INDEXES])
+    except Exception as e:
+        _indexes_ready = False
+        _indexes_retry_at = time.monotonic() + INDEX_RETRY_SECONDS
+        print(f"Index bootstrap error: {e}")
+
+
+def add_search_fields(candidate_data: dict) -> dict:
+    """Derive the normalized fields that recruiter queries and de-duplication are indexed on."""
+    if candidate_data.get("email"):
+        candidate_data["email_normalized"] = candidate_data["email"].strip().lower()
+    if candidate_data.get("desired_position"):
+        candidate_data["position_normalized"] = " ".join(candidate_data["desired_position"].lower().split())
+    if candidate_data.get("tech_stack"):
+        candidate_data["skills"] = canonical_skills(candidate_data["tech_stack"])
+    if normalize_phone(candidate_data.get("phone")):
+        candidate_data["phone_normalized"] = normalize_phone(candidate_data["phone"])
+    if candidate_data.get("resume_text") and "resume_fingerprint" not in candidate_data:
+        candidate_data.update(dedup_fields(candidate_data["resume_text"]))
+    return candidate_data
+
+
+def split_layout() -> bool:
+    """True when resume blobs and transcripts are stored outside the candidate document."""
+    return config.CANDIDATE_STORAGE_LAYOUT == "split"
+
+
+def compress_text(text: str, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """Compress text for blob storage; returns (codec, payload)."""
+    from bson import Binary
+    codec = codec or config.BLOB_COMPRESSION
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        import zstandard
+        return codec, Binary(zstandard.ZstdCompressor(level=6).compress(data))
+    if codec == "zlib":
+        return codec, Binary(zlib.compress(data, 6))
+    raise ValueError(f"Unsupported blob compression: {codec}")
+
+
+def decompress_text(codec: str, payload: bytes) -> str:
+    """Inverse of ``compress_text``."""
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(payload).decode("utf-8")
+    raise ValueError(f"Unsupported blob compression: {codec}")
+
+
+def _pop_heavy(candidate_data: dict) -> Tuple[dict, dict, Optional[list]]:
+    """Split a candidate dict into (summary, blobs, transcript); the input is not modified."""
+    summary = dict(candidate_data)
+    blobs = {field: summary.pop(field) for field in BLOB_FIELDS if field in summary}
+    messages = summary.pop(TRANSCRIPT_FIELD, None)
+    return summary, blobs, messages
+
 
+def _store_blobs(db, oid, blobs: dict) -> None:
+    """Write (or overwrite) the compressed resume fields of one candidate."""
+    if not blobs:
+        return
+    fields = {}
+    for field, value in blobs.items():
+        if value is None:
+            fields[f"fields.{field}"] = None
+            continue
+        codec, payload = compress_text(value)
+        fields[f"fields.{field}"] = {"codec": codec, "data": payload, "size": len(value)}
+    fields["updated_at"] = datetime.now(timezone.utc)
+    db[config.RESUME_BLOBS_COLLECTION].update_one({"_id": oid}, {"$set": fields}, upsert=True)
 
+
+def _bucket_documents(oid, messages: list, offset: int = 0) -> list:
+    """Group messages[i] (stored at position offset + i) into per-bucket pushes."""
+    size = config.TRANSCRIPT_BUCKET_SIZE
+    buckets = {}
+    for i, message in enumerate(messages):
+        buckets.setdefault((offset + i) // size, []).append(message)
+    return [{"candidate_id": oid, "bucket": bucket, "messages": items, "count": len(items)}
+            for bucket, items in sorted(buckets.items())]
+
+
+def _replace_transcript(db, oid, messages: list) -> None:
+    """Rewrite a candidate's whole transcript (first save, full mode, migration)."""
+    collection = db[config.TRANSCRIPTS_COLLECTION]
+    collection.delete_many({"candidate_id": oid})
+    documents = _bucket_documents(oid, messages)
+    if documents:
+        collection.insert_many(documents, ordered=True)
+
+
+def _push_at(collection, query: dict, field: str, counter: str, items: list, start: int,
+             upsert: bool = False) -> None:
+    """
+    Push ``items``, which belong at positions ``start``.. of an array, exactly once.
+
+    ``counter`` holds the array length. The push only applies while the
+    counter still equals the position of the first item, so a retried or
+    replayed write finds its items already stored and skips them; a
+    partially stored write pushes only the missing tail.
+    """
+    position, guard = start, start
+    for _ in range(4):
+        if not items:
+            return
+        result = collection.update_one(
+            {**query, counter: guard},
+            {"$push": {field: {"$each": items}}, "$set": {counter: position + len(items)}},
+        )
+        if result.matched_count:
+            return
+        current = collection.find_one(query, {counter: 1})
+        if current is None:
+            if upsert:
+                collection.update_one(query, {"$push": {field: {"$each": items}}, "$set": {counter: len(items)}},
+                                      upsert=True)
+            return
+        if counter not in current:
+            guard = {"$exists": False}  # written before the counter existed
+            continue
+        stored = current[counter]
+        if stored >= position + len(items):
+            return
+        if stored > position:
+            items = items[stored - position:]
+        # stored < position means earlier messages never arrived; append after what is there.
+        position = guard = stored
+    print(f"Transcript append gave up after concurrent updates: {query}")
+
+
+def _append_transcript(db, oid, messages: list, start: int) -> None:
+    """
+    Append messages, which start at transcript position ``start``, to their buckets.
+
+    Each bucket's ``count`` guards its push, so appending the same messages
+    again (a retry or a journal replay) stores them once.
+    """
+    collection = db[config.TRANSCRIPTS_COLLECTION]
+    size = config.TRANSCRIPT_BUCKET_SIZE
+    for bucket in _bucket_documents(oid, messages, start):
+        first = max(start, bucket["bucket"] * size)
+        _push_at(collection, {"candidate_id": oid, "bucket": bucket["bucket"]}, "messages", "count",
+                 bucket["messages"], first - bucket["bucket"] * size, upsert=True)
+
+
+def _summary_fields(summary: dict, messages: Optional[list]) -> dict:
+    summary["storage"] = "split"
+    if messages is not None:
+        summary["message_count"] = len(messages)
+    return summary
+
+
+def _store_heavy(db, oid, blobs: dict, messages: Optional[list]) -> None:
+    _store_blobs(db, oid, blobs)
+    if messages is not None:
+        _replace_transcript(db, oid, messages)
+
+
+@tracing.traced("db.save_candidate")
 def save_candidate(candidate_data: dict) -> str:
     """
     Save candidate data to MongoDB.
@@ -25,28 +302,393 @@ def save_candidate(candidate_data: dict) -> str:
     
     candidate_data["created_at"] = datetime.now(timezone.utc)
     candidate_data["updated_at"] = datetime.now(timezone.utc)
+    add_search_fields(candidate_data)
     
-    result = collection.insert_one(candidate_data)
+    if not split_layout():
+        result = collection.insert_one(candidate_data)
+        return str(result.inserted_id)
+    
+    summary, blobs, messages = _pop_heavy(candidate_data)
+    result = collection.insert_one(_summary_fields(summary, messages))
+    _store_heavy(db, result.inserted_id, blobs, messages)
     return str(result.inserted_id)
 
 
-def get_candidate(candidate_id: str) -> Optional[dict]:
-    """Retrieve a candidate by ID."""
+def new_candidate_id() -> str:
+    """Allocate a candidate document ID client-side, before the first write."""
+    from bson import ObjectId
+    return str(ObjectId())
+
+
+@tracing.traced("db.upsert_candidate")
+def upsert_candidate(candidate_id: str, candidate_data: dict) -> bool:
+    """
+    Insert or replace a candidate document under a known ID.
+    
+    Idempotent, so a retried first save never creates a duplicate.
+    """
     from bson import ObjectId
     db = get_database()
     collection = db[config.CANDIDATES_COLLECTION]
-    return collection.find_one({"_id": ObjectId(candidate_id)})
+    oid = ObjectId(candidate_id)
+    
+    now = datetime.now(timezone.utc)
+    candidate_data.setdefault("created_at", now)
+    candidate_data["updated_at"] = now
+    add_search_fields(candidate_data)
+    
+    if not split_layout():
+        result = collection.replace_one({"_id": oid}, candidate_data, upsert=True)
+        return result.upserted_id is not None or result.modified_count > 0
+    
+    summary, blobs, messages = _pop_heavy(candidate_data)
+    result = collection.replace_one({"_id": oid}, _summary_fields(summary, messages), upsert=True)
+    _store_heavy(db, oid, blobs, messages)
+    return result.upserted_id is not None or result.modified_count > 0
+
 
+def _hydrate(db, documents: list, include: Iterable[str]) -> list:
+    """
+    Fill in requested heavy fields that are not on the candidate documents.
 
+    Documents still in the embedded layout already carry them and are left
+    as they are. One query per side collection covers the whole list.
+    """
+    include = set(include)
+    blob_fields = [f for f in BLOB_FIELDS if f in include]
+    want_transcript = TRANSCRIPT_FIELD in include
+    missing = [doc for doc in documents
+               if any(f not in doc for f in blob_fields) or (want_transcript and TRANSCRIPT_FIELD not in doc)]
+    if not missing:
+        return documents
+    ids = [doc["_id"] for doc in missing]
+    
+    if blob_fields:
+        blobs = {doc["_id"]: doc.get("fields", {})
+                 for doc in db[config.RESUME_BLOBS_COLLECTION].find({"_id": {"$in": ids}})}
+        for doc in missing:
+            stored = blobs.get(doc["_id"], {})
+            for field in blob_fields:
+                if field not in doc:
+                    value = stored.get(field)
+                    doc[field] = decompress_text(value["codec"], value["data"]) if value else None
+    
+    if want_transcript:
+        transcripts = {}
+        cursor = (db[config.TRANSCRIPTS_COLLECTION]
+                  .find({"candidate_id": {"$in": ids}}, {"candidate_id": 1, "messages": 1})
+                  .sort([("candidate_id", ASCENDING), ("bucket", ASCENDING)]))
+        for bucket in cursor:
+            transcripts.setdefault(bucket["candidate_id"], []).extend(bucket["messages"])
+        for doc in missing:
+            doc.setdefault(TRANSCRIPT_FIELD, transcripts.get(doc["_id"], []))
+    return documents
+
+
+@tracing.traced("db.get_candidate")
+def get_candidate(candidate_id: str, include: Iterable[str] = ()) -> Optional[dict]:
+    """
+    Retrieve a candidate by ID.
+    
+    Only the summary document is read unless heavy fields are named in
+    ``include``; ``load_resume``/``load_transcript`` fetch them later.
+    """
+    from bson import ObjectId
+    db = get_database()
+    collection = db[config.CANDIDATES_COLLECTION]
+    include = set(include)
+    projection = {field: 0 for field in HEAVY_FIELDS + SIGNATURE_FIELDS if field not in include}
+    document = collection.find_one({"_id": ObjectId(candidate_id)}, projection)
+    if document is not None and include:
+        _hydrate(db, [document], include)
+    return document
+
+
+@tracing.traced("db.load_resume")
+def load_resume(candidate_id: str) -> dict:
+    """Load a candidate's resume text and analysis: {"resume_text": ..., "resume_analysis": ...}."""
+    document = get_candidate(candidate_id, include=BLOB_FIELDS) or {}
+    return {field: document.get(field) for field in BLOB_FIELDS}
+
+
+@tracing.traced("db.load_transcript")
+def load_transcript(candidate_id: str, start: int = 0, limit: Optional[int] = None) -> list:
+    """
+    Load ``limit`` transcript messages starting at position ``start``.
+    
+    Only the buckets covering the requested range are read.
+    """
+    from bson import ObjectId
+    db = get_database()
+    oid = ObjectId(candidate_id)
+    end = None if limit is None else start + limit
+    
+    embedded = db[config.CANDIDATES_COLLECTION].find_one(
+        {"_id": oid, TRANSCRIPT_FIELD: {"$exists": True}}, {TRANSCRIPT_FIELD: 1})
+    if embedded is not None:
+        return embedded[TRANSCRIPT_FIELD][start:end]
+    
+    size = config.TRANSCRIPT_BUCKET_SIZE
+    query = {"candidate_id": oid, "bucket": {"$gte": start // size}}
+    if end is not None:
+        query["bucket"]["$lte"] = max(end - 1, start) // size
+    messages = []
+    for bucket in db[config.TRANSCRIPTS_COLLECTION].find(query, {"messages": 1}).sort("bucket", ASCENDING):
+        messages.extend(bucket["messages"])
+    offset = (start // size) * size
+    return messages[start - offset:None if end is None else end - offset]
+
+
+@tracing.traced("db.update_candidate")
 def update_candidate(candidate_id: str, update_data: dict) -> bool:
     """Update candidate data."""
     from bson import ObjectId
     db = get_database()
     collection = db[config.CANDIDATES_COLLECTION]
+    oid = ObjectId(candidate_id)
     
     update_data["updated_at"] = datetime.now(timezone.utc)
+    add_search_fields(update_data)
+    if split_layout():
+        update_data, blobs, messages = _pop_heavy(update_data)
+        if messages is not None:
+            update_data["message_count"] = len(messages)
+        _store_heavy(db, oid, blobs, messages)
     result = collection.update_one(
-        {"_id": ObjectId(candidate_id)},
+        {"_id": oid},
         {"$set": update_data}
     )
     return result.modified_count > 0
+
+
+@tracing.traced("db.append_candidate")
+def append_candidate(candidate_id: str, push_data: dict, set_data: Optional[dict] = None) -> bool:
+    """
+    Append to array fields and set changed scalar fields.
+    
+    ``set_data["message_count"]`` is the transcript length after the append;
+    the new messages are pushed at the positions before it, guarded by the
+    stored count, so the same append applied twice stores them once. In the
+    split layout, transcript messages go to their buckets and resume fields
+    to the blob collection; the candidate document only gets the scalar
+    ``$set``.
+    
+    Args:
+        candidate_id: Candidate document ID
+        push_data: Mapping of array field -> list of items to append
+        set_data: Changed fields to ``$set`` (optional)
+        
+    Returns:
+        True if the document was modified
+    """
+    from bson import ObjectId
+    db = get_database()
+    collection = db[config.CANDIDATES_COLLECTION]
+    oid = ObjectId(candidate_id)
+    
+    set_data = add_search_fields(dict(set_data or {}))
+    push = {field: list(items) for field, items in push_data.items() if items}
+    messages = push.pop(TRANSCRIPT_FIELD, None)
+    message_count = set_data.pop("message_count", None)
+    if messages and message_count is None:
+        # Callers that do not track the transcript length append after what is stored.
+        stored = collection.find_one({"_id": oid}, {"message_count": 1}) or {}
+        message_count = stored.get("message_count", 0) + len(messages)
+    
+    if split_layout():
+        set_data, blobs, transcript = _pop_heavy(set_data)
+        _store_blobs(db, oid, blobs)
+        if transcript is not None:
+            _replace_transcript(db, oid, transcript)
+            message_count = len(transcript)
+        if messages:
+            _append_transcript(db, oid, messages, message_count - len(messages))
+    elif messages:
+        _push_at(collection, {"_id": oid}, TRANSCRIPT_FIELD, "message_count", messages,
+                 message_count - len(messages))
+    
+    update = {"$set": set_data}
+    update["$set"]["updated_at"] = datetime.now(timezone.utc)
+    if message_count is not None:
+        update["$max"] = {"message_count": message_count}
+    if push:
+        update["$push"] = {field: {"$each": items} for field, items in push.items()}
+    
+    result = collection.update_one({"_id": oid}, update)
+    return result.modified_count > 0
+
+
+@tracing.traced("db.save_candidates")
+def save_candidates(candidates: list, key: Optional[str] = None) -> int:
+    """
+    Save many candidates in one bulk operation.
+    
+    Args:
+        candidates: Candidate dictionaries
+        key: If given, upsert on this field instead of inserting, so
+            re-running a batch does not create duplicates
+        
+    Returns:
+        Number of documents inserted or upserted
+    """
+    if not candidates:
+        return 0
+    db = get_database()
+    collection = db[config.CANDIDATES_COLLECTION]
+    now = datetime.now(timezone.utc)
+    for candidate_data in candidates:
+        add_search_fields(candidate_data)
+    heavy = []
+    if split_layout():
+        split = [_pop_heavy(candidate_data) for candidate_data in candidates]
+        candidates = [_summary_fields(summary, messages) for summary, _, messages in split]
+        heavy = [(blobs, messages) for _, blobs, messages in split]
+    
+    if key is None:
+        for candidate_data in candidates:
+            candidate_data["created_at"] = now
+            candidate_data["updated_at"] = now
+        ids = collection.insert_many(candidates, ordered=False).inserted_ids
+        for oid, (blobs, messages) in zip(ids, heavy):
+            _store_heavy(db, oid, blobs, messages)
+        return len(ids)
+    
+    # One lookup splits the batch into new documents (bulk insert) and
+    # re-runs of documents already stored (updated in place).
+    keys = [candidate_data[key] for candidate_data in candidates]
+    existing = {doc[key]: doc["_id"] for doc in collection.find({key: {"$in": keys}}, {key: 1})}
+    new_candidates = [c for c in candidates if c[key] not in existing]
+    for candidate_data in new_candidates:
+        candidate_data["created_at"] = now
+        candidate_data["updated_at"] = now
+    if new_candidates:
+        collection.insert_many(new_candidates, ordered=False)
+    
+    for candidate_data in candidates:
+        if candidate_data[key] in existing:
+            collection.update_one({key: candidate_data[key]}, {"$set": {**candidate_data, "updated_at": now}})
+    for candidate_data, (blobs, messages) in zip(candidates, heavy):
+        oid = existing.get(candidate_data[key], candidate_data.get("_id"))
+        _store_heavy(db, oid, blobs, messages)
+    return len(candidates)
+
+
+@tracing.traced("db.search_candidates")
+def search_candidates(
+    email: Optional[str] = None,
+    position: Optional[str] = None,
+    skills: Optional[Iterable[str]] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    active_since: Optional[datetime] = None,
+    page: int = 1,
+    page_size: int = 20,
+    include: Iterable[str] = (),
+    sort_by: str = "created_at",
+) -> dict:
+    """
+    Recruiter-side candidate search.
+    
+    Every filter maps onto an indexed field. Resume text, analysis and the
+    conversation history are excluded from results unless named in
+    ``include``.
+    
+    Args:
+        email: Exact email (case-insensitive)
+        position: Exact desired position (case/whitespace-insensitive)
+        skills: Candidates must have all of these skills (aliases allowed)
+        created_after / created_before: Range on created_at
+        active_since: Lower bound on last_active
+        page / page_size: 1-based page number and size (page_size capped at 100)
+        include: Heavy fields to load as well
+        sort_by: "created_at" or "last_active" (newest first)
+        
+    Returns:
+        {"items": [...], "page": n, "page_size": n, "has_more": bool}
+    """
+    query = {}
+    if email:
+        query["email_normalized"] = email.strip().lower()
+    if position:
+        query["position_normalized"] = " ".join(position.lower().split())
+    if skills:
+        query["skills"] = {"$all": canonical_skills(list(skills))}
+    if created_after or created_before:
+        query["created_at"] = {}
+        if created_after:
+            query["created_at"]["$gte"] = created_after
+        if created_before:
+            query["created_at"]["$lt"] = created_before
+    if active_since:
+        query["last_active"] = {"$gte": active_since}
+    
+    if sort_by not in ("created_at", "last_active"):
+        raise ValueError(f"Unsupported sort field: {sort_by}")
+    page = max(1, page)
+    page_size = max(1, min(page_size, 100))
+    projection = {field: 0 for field in HEAVY_FIELDS + SIGNATURE_FIELDS if field not in set(include)}
+    
+    db = get_database()
+    cursor = (
+        db[config.CANDIDATES_COLLECTION]
+        .find(query, projection)
+        .sort(sort_by, DESCENDING)
+        .skip((page - 1) * page_size)
+        .limit(page_size + 1)
+    )
+    items = list(cursor)
+    if include:
+        _hydrate(db, items[:page_size], include)
+    return {
+        "items": items[:page_size],
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(items) > page_size,
+    }
+
+
+def migrate_to_split_layout(batch_size: int = 100) -> int:
+    """
+    Move resume blobs and transcripts out of embedded candidate documents.
+    
+    Safe to interrupt and re-run: a document is only marked as split after
+    its side collections have been written, and unmarked documents are
+    simply converted again.
+    
+    Returns:
+        Number of documents converted
+    """
+    db = get_database()
+    collection = db[config.CANDIDATES_COLLECTION]
+    query = {"storage": {"$ne": "split"}}
+    converted = 0
+    while True:
+        batch = list(collection.find(query).limit(batch_size))
+        if not batch:
+            return converted
+        for document in batch:
+            summary, blobs, messages = _pop_heavy(document)
+            _store_heavy(db, document["_id"], blobs, messages or [])
+            collection.update_one(
+                {"_id": document["_id"]},
+                {
+                    "$set": {"storage": "split", "message_count": len(messages or [])},
+                    "$unset": {field: "" for field in HEAVY_FIELDS},
+                },
+            )
+            converted += 1
+        print(f"Migrated {converted} candidate documents")
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="TalentScout database maintenance")
+    parser.add_argument("--migrate", action="store_true",
+                        help="convert embedded candidate documents to the split storage layout")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    if args.migrate:
+        print(f"Done: {migrate_to_split_layout(args.batch_size)} documents converted")
+    else:
+        parser.print_help()
@@ -0,0 +1,162 @@
+"""
+Candidate de-duplication for re-applications.
+
+A candidate matches an earlier application by normalized email or phone, by
+the hash of their normalized resume text, or by a MinHash signature of the
+resume's word shingles (near-duplicates, e.g. a re-exported or lightly
+edited PDF). The signature's LSH bands are stored on the candidate document
+and indexed, so a lookup only compares signatures of a few candidates.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+import hashlib
+import random
+import re
+import config
+import tracing
+
+# Reasons that mean the resume itself was seen before, so its analysis can be reused.
+# A near match is only recorded: an edited resume may belong to someone else.
+RESUME_MATCHES = ("resume_hash",)
+
+_PRIME = (1 << 61) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class Match:
+    candidate_id: str
+    reason: str
+    similarity: float = 1.0
+    document: dict = field(default_factory=dict)
+
+    @property
+    def same_resume(self) -> bool:
+        return self.reason in RESUME_MATCHES
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    return email.strip().lower() if email and email.strip() else None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Digits only, last ten kept so '+1 (555) 010-2030' and '5550102030' match."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 7 else None
+
+
+def _tokens(text: str) -> list:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def resume_fingerprint(text: str) -> str:
+    """SHA-256 of the resume's words, insensitive to case, punctuation and layout."""
+    return hashlib.sha256(" ".join(_tokens(text)).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=4)
+def _permutations(count: int) -> tuple:
+    rng = random.Random(1729)
+    return tuple((rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(count))
+
+
+def _shingle_hashes(text: str, size: int) -> set:
+    tokens = _tokens(text)
+    shingles = {" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+    return {int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles}
+
+
+def minhash_signature(text: str, permutations: Optional[int] = None, shingle_size: Optional[int] = None) -> list:
+    """MinHash signature of the text's word shingles."""
+    hashes = _shingle_hashes(text, shingle_size or config.DEDUP_SHINGLE_SIZE)
+    if not hashes:
+        return []
+    return [min((a * h + b) % _PRIME for h in hashes)
+            for a, b in _permutations(permutations or config.DEDUP_MINHASH_PERMUTATIONS)]
+
+
+def lsh_bands(signature: list, bands: Optional[int] = None) -> list:
+    """Band keys for locality-sensitive lookup; similar signatures share at least one."""
+    bands = bands or config.DEDUP_MINHASH_BANDS
+    rows = max(1, len(signature) // bands)
+    keys = []
+    for band in range(0, len(signature), rows):
+        digest = hashlib.blake2b(repr(signature[band:band + rows]).encode(), digest_size=8).hexdigest()
+        keys.append(f"{band // rows}:{digest}")
+    return keys
+
+
+def similarity(a: list, b: list) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if not a or len(a) != len(b):
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def dedup_fields(resume_text: str) -> dict:
+    """Indexed resume fingerprint fields stored on the candidate document."""
+    signature = minhash_signature(resume_text)
+    return {
+        "resume_fingerprint": resume_fingerprint(resume_text),
+        "minhash": signature,
+        "minhash_bands": lsh_bands(signature),
+    }
+
+
+@tracing.traced("dedup.find_duplicate")
+def find_duplicate(
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    resume_text: Optional[str] = None,
+    exclude_id: Optional[str] = None,
+) -> Optional[Match]:
+    """
+    Find the most recent earlier application matching any of the given keys.
+
+    Resume matches are preferred over contact matches, because only they
+    allow reusing the earlier resume analysis.
+
+    Returns:
+        The match, or None
+    """
+    from database import DESCENDING, HEAVY_FIELDS, get_database
+    collection = get_database()[config.CANDIDATES_COLLECTION]
+    projection = {name: 0 for name in HEAVY_FIELDS}
+
+    def latest(query: dict) -> Optional[dict]:
+        if exclude_id:
+            from bson import ObjectId
+            query["_id"] = {"$ne": ObjectId(exclude_id)}
+        return next(iter(collection.find(query, projection).sort("created_at", DESCENDING).limit(1)), None)
+
+    if resume_text:
+        fields = dedup_fields(resume_text)
+        document = latest({"resume_fingerprint": fields["resume_fingerprint"]})
+        if document:
+            return Match(str(document["_id"]), "resume_hash", 1.0, document)
+
+        query = {"minhash_bands": {"$in": fields["minhash_bands"]}}
+        if exclude_id:
+            from bson import ObjectId
+            query["_id"] = {"$ne": ObjectId(exclude_id)}
+        best = None
+        for document in collection.find(query, projection).limit(50):
+            score = similarity(fields["minhash"], document.get("minhash") or [])
+            if score >= config.DEDUP_SIMILARITY_THRESHOLD and (best is None or score > best.similarity):
+                best = Match(str(document["_id"]), "resume_near", score, document)
+        if best:
+            return best
+
+    email = normalize_email(email)
+    if email:
+        document = latest({"email_normalized": email})
+        if document:
+            return Match(str(document["_id"]), "email", 1.0, document)
+
+    phone = normalize_phone(phone)
+    if phone:
+        document = latest({"phone_normalized": phone})
+        if document:
+            return Match(str(document["_id"]), "phone", 1.0, document)
+    return None
@@ -0,0 +1,218 @@
+"""
+Post-interview evaluation of the candidate's technical answers.
+
+When an interview ends, its question/answer pairs are stored in
+``qa_responses`` and handed to ``AnswerEvaluator``. A small background pool
+scores each candidate's answers in batches of up to ``EVAL_BATCH_SIZE`` per
+LLM call (never mixing candidates, whose answers are personal data), then
+writes the scores and a summary back to the candidate document through the
+write-behind queue. Nothing here runs on the chat path.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import atexit
+import json
+import queue
+import re
+import threading
+import time
+import config
+import tracing
+from crew_agent import ANSWERS_MARKER, get_answer_evaluation_prompt
+
+
+def extract_qa_pairs(messages: list, technical_questions=()) -> List[dict]:
+    """
+    Question/answer pairs of the technical phase.
+
+    Assistant messages that asked a technical question carry its
+    ``question_index``; the candidate's next message is the answer.
+    """
+    pairs = []
+    for position, message in enumerate(messages[:-1]):
+        index = message.get("question_index")
+        reply = messages[position + 1]
+        if message["role"] != "assistant" or index is None or reply["role"] != "user":
+            continue
+        pairs.append({
+            "question_index": index,
+            "question": message["content"],
+            "bank_question": technical_questions[index] if index < len(technical_questions) else None,
+            "answer": reply["content"],
+        })
+    return pairs
+
+
+def parse_scores(text: str) -> Dict[int, Tuple[float, str]]:
+    """Map answer id -> (score, feedback) from the evaluation response; invalid entries are dropped."""
+    text = re.sub(r"^```(?:json)?|```$", "", (text or "").strip(), flags=re.MULTILINE).strip()
+    start, end = text.find("["), text.rfind("]")
+    try:
+        items = json.loads(text[start:end + 1]) if 0 <= start < end else []
+    except ValueError:
+        items = []
+    scores = {}
+    for item in items if isinstance(items, list) else []:
+        try:
+            score = float(item["score"])
+            scores[int(item["id"])] = (min(max(score, 0.0), 10.0), str(item.get("feedback") or ""))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return scores
+
+
+def fake_scores(prompt: str) -> str:
+    """Deterministic offline evaluator for FakeLLM: longer answers score higher."""
+    start = prompt.find(ANSWERS_MARKER)
+    if start == -1:
+        return "[]"
+    answers, _ = json.JSONDecoder().raw_decode(prompt, prompt.index("[", start))
+    return json.dumps([
+        {"id": item["id"], "score": min(10, 2 + len(item["answer"].split()) // 5), "feedback": "Offline score."}
+        for item in answers
+    ])
+
+
+class AnswerEvaluator:
+    """
+    Background pool that scores interview answers in batches.
+
+    ``submit`` only enqueues the candidate. A worker scores that candidate's
+    answers with one LLM call per ``batch_size`` answers; different
+    candidates are evaluated in parallel by different workers. Answers the
+    response does not score are left without a score and counted as
+    failures.
+    """
+
+    def __init__(self, agent=None, batch_size: Optional[int] = None, workers: Optional[int] = None,
+                 write_queue=None):
+        self._agent = agent
+        self.batch_size = batch_size or config.EVAL_BATCH_SIZE
+        self.workers = workers or config.EVAL_WORKERS
+        self.write_queue = write_queue
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._outstanding = 0
+        self._cond = threading.Condition()
+        self._stats_lock = threading.Lock()
+        self.stats = {"jobs": 0, "answers": 0, "batches": 0, "scored": 0, "failures": 0, "llm_seconds": 0.0}
+
+    @property
+    def agent(self):
+        if self._agent is None:
+            from llm_client import get_llm_client
+            self._agent = get_llm_client()
+        return self._agent
+
+    def submit(self, candidate_id: str, qa_responses: List[dict]) -> bool:
+        """Queue a candidate's unscored answers; False if there is nothing to score."""
+        responses = [dict(response) for response in qa_responses]
+        if not any(r.get("answer") and r.get("score") is None for r in responses):
+            return False
+        with self._cond:
+            self._outstanding += 1
+        self._ensure_workers()
+        self._jobs.put((candidate_id, responses))
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted job has been scored and queued for writing."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Finish queued work and stop the workers."""
+        self.flush(timeout)
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _ensure_workers(self) -> None:
+        with self._cond:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f"answer-eval-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            candidate_id, responses = job
+            try:
+                self.evaluate(responses)
+                self._write(candidate_id, responses)
+            except Exception as e:
+                print(f"Answer evaluation error for {candidate_id}: {e}")
+            finally:
+                with self._cond:
+                    self._outstanding -= 1
+                    self._cond.notify_all()
+
+    def evaluate(self, responses: List[dict]) -> None:
+        """Score one candidate's unscored responses in place."""
+        unscored = [r for r in responses if r.get("answer") and r.get("score") is None]
+        with self._stats_lock:
+            self.stats["jobs"] += 1
+            self.stats["answers"] += len(unscored)
+        for start in range(0, len(unscored), self.batch_size):
+            self._evaluate_batch(unscored[start:start + self.batch_size])
+
+    @tracing.traced("evaluation.batch")
+    def _evaluate_batch(self, batch: List[dict]) -> None:
+        items = [(number, response["question"], response["answer"][:config.EVAL_MAX_ANSWER_CHARS])
+                 for number, response in enumerate(batch, 1)]
+        start = time.perf_counter()
+        try:
+            scores = parse_scores(self.agent.run(get_answer_evaluation_prompt(items)))
+        except Exception as e:
+            print(f"Answer evaluation error: {e}")
+            scores = {}
+        scored = 0
+        for number, response in enumerate(batch, 1):
+            if number in scores:
+                response["score"], response["feedback"] = scores[number]
+                scored += 1
+        with self._stats_lock:
+            self.stats["llm_seconds"] += time.perf_counter() - start
+            self.stats["batches"] += 1
+            self.stats["scored"] += scored
+            self.stats["failures"] += len(batch) - scored
+
+    def _write(self, candidate_id: str, responses: List[dict]) -> None:
+        scores = [r["score"] for r in responses if r.get("score") is not None]
+        summary = {
+            "average_score": round(sum(scores) / len(scores), 2) if scores else None,
+            "scored": len(scores),
+            "total": len(responses),
+            "evaluated_at": datetime.now(timezone.utc),
+        }
+        from persistence import get_write_queue
+        (self.write_queue or get_write_queue()).enqueue(
+            candidate_id, set_data={"qa_responses": responses, "evaluation": summary}
+        )
+
+
+_answer_evaluator: Optional[AnswerEvaluator] = None
+_answer_evaluator_lock = threading.Lock()
+
+
+def get_answer_evaluator() -> AnswerEvaluator:
+    """Return the process-wide answer evaluator."""
+    global _answer_evaluator
+    if _answer_evaluator is None:
+        with _answer_evaluator_lock:
+            if _answer_evaluator is None:
+                _answer_evaluator = AnswerEvaluator()
+                atexit.register(_answer_evaluator.close)
+    return _answer_evaluator
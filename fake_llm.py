@@ -0,0 +1,150 @@
+"""Deterministic offline stand-ins for the Gemini LLM, for benchmarks and local runs."""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from crewai.llms.base_llm import BaseLLM, llm_call_context
+
+DEFAULT_REPLY = "Thanks! Question 1 of 8: Regarding your backend work, how do you design a cache invalidation strategy?"
+
+
+def _prompt_text(messages) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(m.get("content", "")) for m in messages)
+
+
+class FakeLLM(BaseLLM):
+    """
+    Fake LLM with configurable latency that streams its reply word by word.
+
+    Attributes:
+        latency: Seconds before the first chunk (time-to-first-token)
+        chunk_delay: Seconds between subsequent chunks
+        responder: Optional callable mapping the prompt text to a reply
+    """
+
+    latency: float = 0.0
+    chunk_delay: float = 0.0
+    responder: Optional[Callable[[str], str]] = None
+    calls: int = 0
+
+    def __init__(self, **data):
+        data.setdefault("model", "fake/talentscout")
+        super().__init__(**data)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None) -> Any:
+        self.calls += 1
+        prompt = _prompt_text(messages)
+        reply = self.responder(prompt) if self.responder else DEFAULT_REPLY
+
+        time.sleep(self.latency)
+        with llm_call_context():
+            for i, word in enumerate(reply.split(" ")):
+                if i and self.chunk_delay:
+                    time.sleep(self.chunk_delay)
+                if self.stream:
+                    self._emit_stream_chunk_event(
+                        word if i == 0 else f" {word}", from_task=from_task, from_agent=from_agent
+                    )
+        return reply
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+class FakeLLMServer:
+    """
+    Local OpenAI-compatible chat completions server for exercising the real
+    HTTP client path offline.
+
+    Attributes:
+        latency: Seconds before each response
+        fail_every: Answer every n-th request with HTTP 429 (0 disables)
+        max_concurrent: Answer HTTP 429 while more requests than this are
+            in flight, like a provider's concurrency limit (0 disables)
+        responder: Optional callable mapping the prompt text to a reply
+        requests: Number of requests received
+        rejected: Number of requests answered with 429
+    """
+
+    def __init__(self, latency: float = 0.0, fail_every: int = 0, max_concurrent: int = 0,
+                 responder: Optional[Callable[[str], str]] = None):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.max_concurrent = max_concurrent
+        self.responder = responder
+        self.requests = 0
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests += 1
+                    number = server.requests
+                    server._in_flight += 1
+                    over_limit = server.max_concurrent and server._in_flight > server.max_concurrent
+                try:
+                    if over_limit or (server.fail_every and number % server.fail_every == 0):
+                        with server._lock:
+                            server.rejected += 1
+                        self._send(429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error"}})
+                        return
+                    time.sleep(server.latency)
+                    self._reply(body, number)
+                finally:
+                    with server._lock:
+                        server._in_flight -= 1
+
+            def _reply(self, body: dict, number: int) -> None:
+                prompt = _prompt_text(body.get("messages", []))
+                reply = server.responder(prompt) if server.responder else DEFAULT_REPLY
+                self._send(200, {
+                    "id": f"fake-{number}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(reply) // 4,
+                              "total_tokens": (len(prompt) + len(reply)) // 4},
+                })
+
+            def _send(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, name="fake-llm-server", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def llm(self):
+        """A crewai LLM pointed at this server, with the SDK's own retries off."""
+        from crewai import LLM
+        return LLM(model="openai/fake-talentscout", base_url=self.url, api_key="fake", max_retries=0)
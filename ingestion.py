@@ -0,0 +1,137 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import time
+import config
+from conversation_flow import FIELD_PROMPTS
+from crew_agent import get_resume_extraction_prompt
+from resume_fields import parse_resume_fields, prepass
+
+
+@dataclass
+class IngestionResult:
+    resume_text: str
+    analysis: str
+    fields: dict
+    acknowledgement: str
+    cached: bool = False
+    timings: dict = field(default_factory=dict)
+    duplicate: Optional[object] = None  # dedup.Match for an earlier application
+    reused_analysis: bool = False
+
+
+def build_acknowledgement(fields: dict) -> str:
+    """Acknowledge the upload from the extracted fields, without an LLM call."""
+    name = fields.get("full_name")
+    greeting = f"Thanks for sharing your resume, {name.split()[0]}!" if name else "Thanks for sharing your resume!"
+
+    highlights = []
+    if fields.get("years_of_experience"):
+        highlights.append(f"**{fields['years_of_experience']}** of experience")
+    if fields.get("desired_position"):
+        highlights.append(f"most recently as **{fields['desired_position']}**")
+    if fields.get("tech_stack"):
+        highlights.append(f"skills in {fields['tech_stack']}")
+    summary = f" I can see {', '.join(highlights)}." if highlights else ""
+
+    # The position is always confirmed explicitly, even when the resume lists one.
+    return f"{greeting}{summary}\n\nTo get started, {FIELD_PROMPTS['desired_position'][0].lower()}{FIELD_PROMPTS['desired_position'][1:]}"
+
+
+def _acknowledgement_prompt(analysis: str) -> str:
+    return f"""The candidate has shared their resume. Here's the analysis:
+
+{analysis}
+
+Acknowledge the resume upload, briefly summarize the key information you extracted (name, experience, skills), thank them for sharing it, and then proceed with the interview. Ask about any critical missing information OR if everything is extracted, move to the first technical question based on their tech stack."""
+
+
+class ResumeIngestion:
+    """
+    Upload-to-first-message pipeline for a resume.
+
+    The cache lookup (a database round-trip) overlaps with PDF text
+    extraction; on a miss the extraction feeds a single analysis call. The
+    acknowledgement is built from the parsed fields unless ``ack_mode`` is
+    "llm". Per-stage wall-clock timings are reported in seconds.
+
+    With ``find_duplicate`` (see ``dedup.find_duplicate``), the resume is
+    matched against earlier applications; if the same or a near-identical
+    resume was analyzed before, that analysis is reused instead of calling
+    the LLM.
+    """
+
+    def __init__(self, agent, extract_text: Callable[[bytes], str], cache=None,
+                 ack_mode: Optional[str] = None, find_duplicate: Optional[Callable] = None):
+        self.agent = agent
+        self.extract_text = extract_text
+        self.cache = cache
+        self.ack_mode = ack_mode or config.RESUME_ACK_MODE
+        self.find_duplicate = find_duplicate
+
+    def _lookup_duplicate(self, resume_text: str):
+        contact = prepass(resume_text)
+        try:
+            return self.find_duplicate(email=contact["email"], phone=contact["phone"], resume_text=resume_text)
+        except Exception as e:
+            print(f"Duplicate lookup error: {e}")
+            return None
+
+    @staticmethod
+    def _prior_analysis(match) -> Optional[str]:
+        if match is None or not match.same_resume:
+            return None
+        try:
+            from database import load_resume
+            return load_resume(match.candidate_id).get("resume_analysis")
+        except Exception as e:
+            print(f"Prior analysis load error: {e}")
+            return None
+
+    def ingest(self, pdf_bytes: bytes) -> IngestionResult:
+        timings = {}
+        start = time.perf_counter()
+
+        def timed(stage, fn, *args):
+            stage_start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timings[stage] = time.perf_counter() - stage_start
+
+        pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            extraction = pool.submit(timed, "extract", self.extract_text, pdf_bytes)
+            lookup = pool.submit(timed, "cache_lookup", self.cache.get, pdf_bytes) if self.cache else None
+            cached = lookup.result() if lookup else None
+            if not cached:
+                resume_text = extraction.result()
+        finally:
+            # On a cache hit the extraction result is not needed; don't wait for it.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if cached:
+            resume_text = cached["resume_text"]
+        duplicate = timed("dedup_lookup", self._lookup_duplicate, resume_text) if self.find_duplicate else None
+
+        reused = False
+        if cached:
+            analysis, fields = cached["analysis"], cached["fields"]
+        else:
+            analysis = self._prior_analysis(duplicate)
+            reused = analysis is not None
+            if not reused:
+                analysis = timed("analyze", self.agent.run, get_resume_extraction_prompt(resume_text))
+            # Contact details always come from this resume's text.
+            fields = parse_resume_fields(analysis, resume_text).to_candidate_data()
+            if self.cache:
+                self.cache.put(pdf_bytes, {"resume_text": resume_text, "analysis": analysis, "fields": fields})
+
+        if self.ack_mode == "llm":
+            acknowledgement = timed("acknowledge", self.agent.run, _acknowledgement_prompt(analysis))
+        else:
+            acknowledgement = timed("acknowledge", build_acknowledgement, fields)
+
+        timings["total"] = time.perf_counter() - start
+        return IngestionResult(resume_text, analysis, fields, acknowledgement, bool(cached), timings,
+                               duplicate, reused)
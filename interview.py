@@ -0,0 +1,396 @@
+"""
+Interview session logic, independent of the Streamlit UI.
+
+app.py keeps one InterviewSession per browser session; the benchmarks
+drive the same class directly to simulate candidates.
+"""
+from typing import Iterator, Optional
+import re
+import time
+import uuid
+import config
+import dedup
+import tracing
+from conversation_context import ConversationContext
+from conversation_flow import ConversationFlow
+from database import new_candidate_id
+from evaluation import extract_qa_pairs, get_answer_evaluator
+from ingestion import IngestionResult, ResumeIngestion
+from llm_cache import STORE_RETRY_SECONDS
+from pdf_extract import extract_text
+from persistence import DirtyDict, build_delta_update, build_full_document, get_write_queue
+from question_bank import get_question_bank
+from resume_cache import get_resume_cache
+from transcript import Transcript, as_documents
+
+
+# After a failed duplicate lookup the chat skips lookups for STORE_RETRY_SECONDS,
+# so a MongoDB outage does not add a server-selection timeout to every session.
+_dedup_retry_at = 0.0
+
+
+def new_candidate_data() -> DirtyDict:
+    return DirtyDict({
+        "full_name": None,
+        "email": None,
+        "phone": None,
+        "years_of_experience": None,
+        "desired_position": None,
+        "location": None,
+        "tech_stack": None,
+        "resume_text": None,
+        "resume_analysis": None,
+        "technical_questions": [],
+        "qa_responses": [],
+    })
+
+
+def check_exit_keywords(message: str) -> bool:
+    """Check if message contains exit keywords as whole words."""
+    message_lower = message.lower().strip()
+    for keyword in config.EXIT_KEYWORDS:
+        pattern = r'\b' + re.escape(keyword) + r'\b'
+        if re.search(pattern, message_lower):
+            return True
+    return False
+
+
+def _error_reply(error: Exception) -> str:
+    return f"I apologize, but I encountered an issue. Please try again. (Error: {str(error)})"
+
+
+class InterviewSession:
+    """State and turn handling for one candidate's interview."""
+
+    def __init__(self, agent, write_queue=None, resume_cache=None, question_bank=None, find_duplicate=None,
+                 evaluator=None):
+        self.agent = agent
+        self.write_queue = write_queue
+        self.evaluator = evaluator
+        self.resume_cache = resume_cache
+        self.question_bank = question_bank
+        self.find_duplicate = find_duplicate or (dedup.find_duplicate if config.DEDUP_ENABLED else None)
+        self.previous_application: Optional[dedup.Match] = None
+        self._dedup_checked = set()
+        self.messages = Transcript()
+        self.candidate_data = new_candidate_data()
+        self.context = ConversationContext()
+        self.flow = ConversationFlow()
+        self.session_id: Optional[str] = None
+        # Key in the session store (and the resume link); also tags this session's traces.
+        self.session_key = uuid.uuid4().hex
+        self.trace_id = self.session_key
+        self.store_version = 0
+        # Messages and state digest of the stored version (see SessionManager.save).
+        self.store_message_count = 0
+        self.store_digest: Optional[bytes] = None
+        self.saved_message_count = 0
+        self.resume_uploaded = False
+        self.conversation_ended = False
+        self.ingestion_timings = {}
+
+    @property
+    def conversation_stage(self) -> str:
+        return self.flow.stage
+
+    def snapshot(self, message_start: int = 0) -> dict:
+        """
+        Compact, serializable state for the session store.
+
+        The agent, caches and rendered context are not included; they are
+        rebuilt on restore. Resume text is only included while it has not
+        been saved to the candidate document yet. ``messages`` holds the
+        transcript from ``message_start`` on.
+        """
+        cd = self.candidate_data
+        skip = {"resume_text"} if self.session_id and "resume_text" not in cd.dirty else set()
+        flow = self.flow
+        previous = self.previous_application
+        return {
+            "session_key": self.session_key,
+            "session_id": self.session_id,
+            "messages": as_documents(self.messages[message_start:]),
+            "candidate_data": {name: value for name, value in cd.items() if name not in skip},
+            "dirty": sorted(cd.dirty),
+            "flow": {
+                "stage": flow.stage,
+                "pending_field": flow.pending_field,
+                "position_confirmed": flow.position_confirmed,
+                "question_index": flow.question_index,
+                "total_questions": flow.total_questions,
+                "stats": flow.stats,
+            },
+            "saved_message_count": self.saved_message_count,
+            "resume_uploaded": self.resume_uploaded,
+            "conversation_ended": self.conversation_ended,
+            "previous_application": None if previous is None else {
+                "candidate_id": previous.candidate_id, "reason": previous.reason, "similarity": previous.similarity,
+            },
+            "dedup_checked": sorted(self._dedup_checked),
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict, agent, **kwargs) -> "InterviewSession":
+        """Rebuild a session from ``snapshot()`` output."""
+        session = cls(agent, **kwargs)
+        session.session_key = session.trace_id = snapshot["session_key"]
+        session.session_id = snapshot["session_id"]
+        session.messages = Transcript(snapshot["messages"])
+        session.candidate_data = DirtyDict(snapshot["candidate_data"])
+        session.candidate_data.clear_dirty()
+        for name in snapshot["dirty"]:
+            session.candidate_data.mark_dirty(name)
+        for name, value in snapshot["flow"].items():
+            setattr(session.flow, name, value)
+        session.saved_message_count = snapshot["saved_message_count"]
+        session.resume_uploaded = snapshot["resume_uploaded"]
+        session.conversation_ended = snapshot["conversation_ended"]
+        if snapshot["previous_application"]:
+            session.previous_application = dedup.Match(**snapshot["previous_application"])
+        session._dedup_checked = {tuple(pair) for pair in snapshot["dedup_checked"]}
+        return session
+
+    def ingest_resume(self, pdf_bytes: bytes) -> IngestionResult:
+        """Analyze an uploaded resume and open the conversation with an acknowledgement."""
+        ingestion = ResumeIngestion(
+            self.agent,
+            extract_text=extract_text,
+            cache=self.resume_cache or get_resume_cache(),
+            find_duplicate=self.find_duplicate,
+        )
+        result = ingestion.ingest(pdf_bytes)
+        self.ingestion_timings = result.timings
+
+        self.candidate_data["resume_text"] = result.resume_text
+        self.candidate_data["resume_analysis"] = result.analysis
+        self.resume_uploaded = True
+
+        for field, value in result.fields.items():
+            if value:
+                self.candidate_data[field] = value
+        if result.duplicate is not None:
+            self.link_previous_application(result.duplicate)
+
+        if config.RESUME_ACK_MODE != "llm":
+            # The template acknowledgement ends by asking for the position.
+            self.flow.next_question(self.candidate_data)
+
+        if not self.messages:
+            self.messages.add("assistant", result.acknowledgement)
+
+        self.auto_save()
+        return result
+
+    def build_prompt(self, user_message: str) -> str:
+        """Build the per-turn prompt from the conversation context and candidate data."""
+        self.context.sync(self.messages)
+        context = self.context.render()
+
+        candidate_context = ""
+        cd = self.candidate_data
+        if cd["full_name"]:
+            candidate_context += f"\nCandidate Name: {cd['full_name']}"
+        if cd["tech_stack"]:
+            candidate_context += f"\nTech Stack: {cd['tech_stack']}"
+        if cd["desired_position"]:
+            candidate_context += f"\nDesired Position: {cd['desired_position']}"
+        if cd["resume_analysis"]:
+            candidate_context += f"\nResume Analysis: {cd['resume_analysis']}"
+
+        prompt = f"""Previous conversation:
+{context}
+
+Collected candidate information:{candidate_context}
+
+Current user message: {user_message}
+
+Respond appropriately as the hiring assistant. If you haven't collected all required information yet, 
+ask for the next piece of information. If all info is collected and you haven't asked technical questions yet,
+generate and ask technical questions based on their tech stack."""
+
+        hint = self.flow.stage_hint(cd["technical_questions"])
+        if hint:
+            prompt += f"\n\n{hint}"
+        return prompt
+
+    def ensure_technical_questions(self) -> None:
+        """Load bank questions for the candidate's stack once the technical phase starts."""
+        cd = self.candidate_data
+        if self.flow.stage != "technical" or cd["technical_questions"]:
+            return
+        try:
+            bank = self.question_bank or get_question_bank()
+            cd["technical_questions"] = bank.get_questions(
+                cd["tech_stack"], cd["desired_position"], self.agent, cd["years_of_experience"]
+            )
+        except Exception as e:
+            print(f"Question bank error: {e}")
+
+    def add_user_message(self, content: str) -> None:
+        self.messages.add("user", content)
+
+    def local_reply(self, user_message: str) -> Optional[str]:
+        """Reply from the stage engine, or None if the LLM must answer."""
+        reply = self.flow.respond(user_message, self.candidate_data)
+        if reply is not None:
+            self.check_reapplication()
+        tracing.count("turn.local" if reply is not None else "turn.llm")
+        return reply
+
+    def check_reapplication(self) -> bool:
+        """Look up an earlier application once the email or phone number is known; True if one matched."""
+        global _dedup_retry_at
+        if self.find_duplicate is None or self.previous_application is not None:
+            return False
+        cd = self.candidate_data
+        keys = {(name, cd.get(name)) for name in ("email", "phone") if cd.get(name)} - self._dedup_checked
+        if not keys or time.monotonic() < _dedup_retry_at:
+            return False
+        self._dedup_checked |= keys
+        try:
+            match = self.find_duplicate(email=cd.get("email"), phone=cd.get("phone"), exclude_id=self.session_id)
+        except Exception as e:
+            print(f"Duplicate lookup error: {e}")
+            # Retried on a later turn, once the backoff has expired.
+            self._dedup_checked -= keys
+            _dedup_retry_at = time.monotonic() + STORE_RETRY_SECONDS
+            return False
+        if match is None:
+            return False
+        self.link_previous_application(match)
+        return True
+
+    def link_previous_application(self, match: dedup.Match) -> None:
+        """
+        Record that this application matches an earlier one.
+
+        A matching email, phone number or resume does not prove it is the
+        same person (typos, shared numbers), so nothing is copied from the
+        earlier document and this session keeps its own record; reviewers
+        see the link through ``previous_application_id``.
+        """
+        self.previous_application = dedup.Match(match.candidate_id, match.reason, match.similarity)
+        tracing.count("dedup.match")
+        self.candidate_data["previous_application_id"] = match.candidate_id
+
+    def get_agent_response(self, user_message: str) -> str:
+        """Get response from the agent."""
+        self.ensure_technical_questions()
+        try:
+            # Turns depend on the whole conversation, so they never hit the response cache.
+            return self.agent.run(self.build_prompt(user_message), cache=False)
+        except Exception as e:
+            return _error_reply(e)
+
+    def stream_agent_response(self, user_message: str) -> Iterator[str]:
+        """Yield the agent's response in chunks as it is generated."""
+        self.ensure_technical_questions()
+        try:
+            yield from self.agent.stream(self.build_prompt(user_message))
+        except Exception as e:
+            yield _error_reply(e)
+
+    def add_assistant_message(self, content: str, from_llm: bool) -> None:
+        question_index = None
+        if from_llm:
+            flow = self.flow
+            if flow.stage == "technical" and flow.question_index < flow.total_questions:
+                # Marks the question for post-interview evaluation.
+                question_index = flow.question_index
+            flow.record_llm_reply()
+        self.messages.add("assistant", content, question_index)
+        self.auto_save()
+
+    def handle_turn(self, user_message: str) -> str:
+        """Non-streaming turn: the same steps the chat UI performs."""
+        self.add_user_message(user_message)
+        if check_exit_keywords(user_message):
+            return self.end()
+        reply = self.local_reply(user_message)
+        from_llm = reply is None
+        if from_llm:
+            reply = self.get_agent_response(user_message)
+        self.add_assistant_message(reply, from_llm)
+        return reply
+
+    def end(self) -> str:
+        """End the interview: persist, queue answer evaluation, log stats and return the farewell message."""
+        self.conversation_ended = True
+        new_responses = self.collect_qa_responses()
+        self.end_persistence()
+        if new_responses and self.session_id and config.EVAL_ENABLED:
+            try:
+                (self.evaluator or get_answer_evaluator()).submit(self.session_id, self.candidate_data["qa_responses"])
+            except Exception as e:
+                print(f"Answer evaluation error: {e}")
+        flow = self.flow
+        print(f"Turns served locally: {flow.stats['local']}/{flow.stats['local'] + flow.stats['llm']} "
+              f"({flow.local_fraction:.0%})")
+
+        cd = self.candidate_data
+        farewell = f"""Thank you so much for taking the time to speak with me today! 🙏
+
+**Here's a summary of what we collected:**
+- Name: {cd.get('full_name', 'Not provided')}
+- Position: {cd.get('desired_position', 'Not specified')}
+- Tech Stack: {cd.get('tech_stack', 'Not specified')}
+
+**Next Steps:**
+Our HR team will review your application and get back to you within **3-5 business days**.
+
+Best of luck with your application! 🌟
+
+*Session ID: {self.session_id if self.session_id else 'Local session'}*"""
+
+        self.messages.add("assistant", farewell)
+        return farewell
+
+    def collect_qa_responses(self) -> int:
+        """Store this interview's technical question/answer pairs; returns how many were added."""
+        messages = self.messages
+        if messages and messages[-1]["role"] == "user":
+            messages = messages[:-1]  # the message that ended the interview
+        cd = self.candidate_data
+        pairs = extract_qa_pairs(messages, cd["technical_questions"] or ())
+        if pairs:
+            cd["qa_responses"] = pairs
+        return len(pairs)
+
+    @tracing.traced("session.autosave")
+    def auto_save(self) -> None:
+        """Queue the session's changes for a background write to MongoDB."""
+        try:
+            candidate_data = self.candidate_data
+            messages = self.messages
+            queue = self.write_queue or get_write_queue()
+
+            if self.session_id and config.AUTO_SAVE_MODE == "delta":
+                set_data, push_data = build_delta_update(candidate_data, messages, self.saved_message_count)
+                queue.enqueue(self.session_id, set_data=set_data, push_data=push_data)
+            elif self.session_id:
+                queue.enqueue(self.session_id, set_data=build_full_document(candidate_data, messages))
+                candidate_data.clear_dirty()
+            else:
+                document = build_full_document(candidate_data, messages)
+                document["session_start"] = document["last_active"]
+                self.session_id = new_candidate_id()
+                queue.enqueue(self.session_id, document=document)
+                candidate_data.clear_dirty()
+
+            self.saved_message_count = len(messages)
+            self.release_resume_text()
+
+        except Exception as e:
+            print(f"Auto-save error: {e}")
+
+    def release_resume_text(self) -> None:
+        """Drop the resume text from memory once it is queued for saving (``database.load_resume`` reads it back)."""
+        cd = self.candidate_data
+        if self.session_id and cd.get("resume_text") and "resume_text" not in cd.dirty:
+            del cd["resume_text"]
+
+    def end_persistence(self, timeout: float = 5.0) -> None:
+        """Save the final state and wait for this session's queued writes."""
+        self.auto_save()
+        if self.session_id:
+            (self.write_queue or get_write_queue()).flush(self.session_id, timeout=timeout)
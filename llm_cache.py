@@ -0,0 +1,168 @@
+"""
+Response cache for repeatable LLM prompts.
+
+Resume analysis, acknowledgements and question generation produce the same
+output for the same prompt, so their responses are cached by a hash of the
+normalized prompt, the model and the agent instructions. Conversational
+turns depend on the live transcript and opt out per call (``cache=False``).
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import hashlib
+import re
+import threading
+import time
+import config
+import tracing
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# After a MongoDB error, skip the persistent tier for this long instead of
+# paying a server-selection timeout on every LLM call.
+STORE_RETRY_SECONDS = 60
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry."""
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+
+def instructions_digest() -> str:
+    """Digest of the agent's fixed instructions; a change invalidates every entry."""
+    from crew_agent import SYSTEM_INSTRUCTIONS, TASK_DESCRIPTION
+    return hashlib.sha256(f"{SYSTEM_INSTRUCTIONS}\n{TASK_DESCRIPTION}".encode("utf-8")).hexdigest()[:16]
+
+
+class LLMResponseCache:
+    """
+    Cache of complete LLM responses for repeatable prompts.
+
+    Keys hash the normalized prompt, the model and the agent instructions.
+    Entries live in an in-memory LRU tier backed by a MongoDB collection
+    whose TTL index evicts stale entries. Each entry remembers how long the
+    original call took, so hits report the latency they saved.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None,
+                 collection=None, persistent: Optional[bool] = None):
+        self.max_entries = max_entries or config.LLM_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or config.LLM_CACHE_TTL_SECONDS
+        self.persistent = config.LLM_CACHE_PERSISTENT if persistent is None else persistent
+        self._collection = collection
+        self._indexed = False
+        self._store_retry_at = 0.0
+        self._instructions = None
+        self._memory = OrderedDict()  # key -> (response, latency_seconds, expires_at)
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "store_hits": 0, "misses": 0, "store_errors": 0,
+                      "latency_saved_seconds": 0.0}
+
+    def key(self, prompt: str, model: str) -> str:
+        if self._instructions is None:
+            self._instructions = instructions_digest()
+        material = f"{model}\n{self._instructions}\n{normalize_prompt(prompt)}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _get_collection(self):
+        if not self.persistent or time.monotonic() < self._store_retry_at:
+            return None
+        if self._collection is None:
+            from database import get_database
+            self._collection = get_database()[config.LLM_CACHE_COLLECTION]
+        if not self._indexed:
+            self._collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+        return self._collection
+
+    def _store_failed(self) -> None:
+        self.stats["store_errors"] += 1
+        self._store_retry_at = time.monotonic() + STORE_RETRY_SECONDS
+
+    def _hit(self, tier: str, latency: float) -> None:
+        self.stats[f"{tier}_hits"] += 1
+        self.stats["latency_saved_seconds"] += latency
+        tracing.count("llm_cache.hit")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[2] > time.time():
+                self._memory.move_to_end(key)
+                self._hit("memory", entry[1])
+                return entry[0]
+
+        document = None
+        try:
+            collection = self._get_collection()
+            if collection is not None:
+                document = collection.find_one({"_id": key})
+        except Exception:
+            self._store_failed()
+
+        expires_at = document and document["expires_at"].replace(tzinfo=timezone.utc).timestamp()
+        if document is None or expires_at <= time.time():
+            self.stats["misses"] += 1
+            tracing.count("llm_cache.miss")
+            return None
+        self._remember(key, document["response"], document["latency_seconds"], expires_at)
+        self._hit("store", document["latency_seconds"])
+        return document["response"]
+
+    def put(self, key: str, response: str, latency_seconds: float = 0.0) -> None:
+        """Store a response and the time the LLM call took."""
+        if not response:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, response, latency_seconds, expires_at)
+        try:
+            collection = self._get_collection()
+            if collection is not None:
+                collection.replace_one(
+                    {"_id": key},
+                    {
+                        "response": response,
+                        "latency_seconds": latency_seconds,
+                        "created_at": datetime.now(timezone.utc),
+                        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds),
+                    },
+                    upsert=True,
+                )
+        except Exception:
+            self._store_failed()
+
+    def _remember(self, key: str, response: str, latency_seconds: float, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (response, latency_seconds, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @property
+    def hits(self) -> int:
+        return self.stats["memory_hits"] + self.stats["store_hits"]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.stats["misses"]
+        return self.hits / lookups if lookups else 0.0
+
+    def metrics(self) -> dict:
+        return {**self.stats, "hits": self.hits, "hit_rate": self.hit_rate, "entries": len(self._memory)}
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide response cache, or None when LLM_CACHE_ENABLED is off."""
+    global _llm_cache
+    if not config.LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache()
+    return _llm_cache
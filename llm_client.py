@@ -0,0 +1,339 @@
+"""
+Async execution layer for LLM calls.
+
+``LLMClient`` runs agent prompts on a private asyncio event loop with a
+shared token-bucket rate limit, bounded concurrency over a pool of
+``TalentScoutCrew`` runtimes, per-call timeouts, retries with exponential
+backoff and full jitter, and coalescing of identical in-flight prompts (e.g.
+two sessions analyzing the same resume at once make one call). Responses to
+repeatable prompts are served from the LLM response cache (``llm_cache``)
+before a call is scheduled; conversational turns pass ``cache=False``.
+
+``run``/``stream`` are a synchronous facade with the same interface as
+``TalentScoutCrew``, so the app and ``InterviewSession`` use the client
+unchanged; ``arun`` serves callers that have their own event loop.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+import asyncio
+import atexit
+import contextvars
+import hashlib
+import queue
+import random
+import re
+import threading
+import time
+import config
+import tracing
+from llm_cache import get_llm_cache
+
+_STREAM_END = object()
+_RATE_LIMIT_RE = re.compile(r"\b429\b|rate.?limit|resource.?exhausted|too many requests", re.IGNORECASE)
+_TRANSIENT_RE = re.compile(r"\b50[234]\b|unavailable|overloaded|timed? ?out|connection", re.IGNORECASE)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return bool(_RATE_LIMIT_RE.search(str(error)))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection failures, rate limits and 5xx-style provider errors."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    return is_rate_limited(error) or bool(_TRANSIENT_RE.search(str(error)))
+
+
+class RateLimiter:
+    """Token bucket allowing `rate_per_minute` acquisitions per minute."""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(self.rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> None:
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds`, e.g. after the provider answered 429."""
+        with self._lock:
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class LLMClient:
+    """
+    Shared, rate-limited LLM executor.
+
+    Blocking agent runs execute on worker threads; the event loop only
+    schedules, times out and retries them. A timed-out run cannot be
+    interrupted, so its thread finishes in the background and the result is
+    discarded. Up to ``max_abandoned`` such runs give their concurrency slot
+    back at once; further ones keep it until they return, so hung calls
+    cannot pile up threads and runtimes. Streaming takes the same rate-limit
+    token, slot and timeout but is not retried, since part of the reply may
+    already have been shown.
+    """
+
+    def __init__(
+        self,
+        runtime_factory: Optional[Callable] = None,
+        concurrency: Optional[int] = None,
+        rate_per_minute: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        model: Optional[str] = None,
+        response_cache=None,
+        max_abandoned: Optional[int] = None,
+    ):
+        if runtime_factory is None:
+            from crew_agent import TalentScoutCrew
+            runtime_factory = lambda: TalentScoutCrew(max_retry_limit=0, response_cache=False)  # noqa: E731
+        self.runtime_factory = runtime_factory
+        self.concurrency = concurrency or config.LLM_CONCURRENCY
+        self.limiter = RateLimiter(rate_per_minute or config.LLM_REQUESTS_PER_MINUTE, burst=self.concurrency)
+        self.timeout = timeout or config.LLM_TIMEOUT_SECONDS
+        self.max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_seconds = config.LLM_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+        self.model = model or config.LLM_MODEL
+        self.response_cache = response_cache if response_cache is not None else get_llm_cache()
+        self.max_abandoned = config.LLM_MAX_ABANDONED_CALLS if max_abandoned is None else max_abandoned
+
+        self._runtimes = queue.LifoQueue()
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        # Abandoned runs keep their thread and runtime, so both pools have that much headroom.
+        self._capacity = self.concurrency + self.max_abandoned
+        self._executor = ThreadPoolExecutor(max_workers=self._capacity, thread_name_prefix="llm-call")
+        self._abandoned = 0  # only touched on the client loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight = {}  # prompt key -> Task; only touched on the client loop
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()  # caller threads and the loop thread both count
+        self.stats = {"calls": 0, "cache_hits": 0, "coalesced": 0, "retries": 0, "timeouts": 0, "rate_limited": 0, "failures": 0, "abandoned": 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    @property
+    def last_response(self) -> Optional[str]:
+        """Full text of the last ``stream`` on this thread."""
+        return getattr(self._local, "last_response", None)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+                    self._semaphore = asyncio.Semaphore(self.concurrency)
+                    self._loop = loop
+        return self._loop
+
+    def close(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+        self._executor.shutdown(wait=False)
+
+    def _checkout(self):
+        with self._pool_lock:
+            if self._runtimes.empty() and self._created < self._capacity:
+                self._created += 1
+                return self.runtime_factory()
+        return self._runtimes.get()
+
+    def _run_blocking(self, prompt: str, cache_key: Optional[str]) -> str:
+        runtime = self._checkout()
+        try:
+            start = time.perf_counter()
+            result = runtime.run(prompt)
+        finally:
+            self._runtimes.put(runtime)
+        if cache_key:
+            # Stored from the worker thread, so even a run that outlived its timeout is kept.
+            self.response_cache.put(cache_key, result, time.perf_counter() - start)
+        return result
+
+    async def _call_with_retries(self, prompt: str, timeout: float, cache_key: Optional[str],
+                                 context: contextvars.Context) -> str:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            await self._acquire_slot()
+            self._count("calls")
+            call = loop.run_in_executor(self._executor, context.copy().run, self._run_blocking, prompt, cache_key)
+            try:
+                # Shielded: a timeout must not cancel the future that tracks the running thread.
+                return await asyncio.wait_for(asyncio.shield(call), timeout)
+            except Exception as e:
+                error = e
+            finally:
+                self._release_slot(call)
+
+            if isinstance(error, asyncio.TimeoutError):
+                self._count("timeouts")
+                tracing.count("llm.timeout")
+            if attempt == self.max_retries or not is_retryable(error):
+                self._count("failures")
+                raise error
+            delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+            if is_rate_limited(error):
+                self._count("rate_limited")
+                self.limiter.penalize(delay)
+            self._count("retries")
+            tracing.count("llm.retry")
+            await asyncio.sleep(delay)
+
+    async def _acquire_slot(self) -> None:
+        await self.limiter.acquire_async()
+        await self._semaphore.acquire()
+
+    def _release_slot(self, call: asyncio.Future) -> None:
+        """Give the concurrency slot back, or hand it to a run that is still going."""
+        if call.done():
+            self._semaphore.release()
+            return
+        if self._abandoned < self.max_abandoned:
+            self._abandoned += 1
+            self._count("abandoned")
+            call.add_done_callback(self._abandoned_done)
+            self._semaphore.release()
+        else:
+            call.add_done_callback(lambda _: self._semaphore.release())
+
+    def _abandoned_done(self, call: asyncio.Future) -> None:
+        if not call.cancelled():
+            call.exception()  # retrieved, so asyncio does not log it as never retrieved
+        self._abandoned -= 1
+
+    def _release_stream_slot(self, done: Future) -> None:
+        if done.done():
+            self._semaphore.release()
+        else:
+            self._release_slot(asyncio.wrap_future(done))
+
+    async def _call(self, prompt: str, timeout: float, coalesce: bool, cache_key: Optional[str],
+                    context: contextvars.Context) -> str:
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest() if coalesce else None
+        task = self._inflight.get(key) if key else None
+        if task is not None:
+            self._count("coalesced")
+            tracing.count("llm.coalesced")
+        else:
+            task = asyncio.ensure_future(self._call_with_retries(prompt, timeout, cache_key, context))
+            if key:
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller giving up does not cancel the call for the others.
+        return await asyncio.shield(task)
+
+    def submit(self, prompt: str, timeout: Optional[float] = None, coalesce: bool = True,
+               cache: bool = True) -> Future:
+        """
+        Schedule a call on the client loop; returns a concurrent.futures.Future.
+
+        A cached response completes the future immediately, without taking a
+        rate-limit token. The cache lookup runs on the calling thread.
+        """
+        cache_key = self.response_cache.key(prompt, self.model) if cache and self.response_cache else None
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self._count("cache_hits")
+                future = Future()
+                future.set_result(cached)
+                return future
+        coroutine = self._call(prompt, timeout or self.timeout, coalesce, cache_key, contextvars.copy_context())
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def arun(self, prompt: str, timeout: Optional[float] = None, coalesce: bool = True,
+                   cache: bool = True) -> str:
+        """Await a call from another event loop."""
+        return await asyncio.wrap_future(self.submit(prompt, timeout, coalesce, cache))
+
+    def run(self, prompt: str, timeout: Optional[float] = None, coalesce: bool = True,
+            cache: bool = True) -> str:
+        """Blocking call with caching, rate limiting, timeout, retries and coalescing."""
+        return self.submit(prompt, timeout, coalesce, cache).result()
+
+    def stream(self, prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Streaming run on a pooled runtime, under the shared rate limit and concurrency.
+
+        ``timeout`` bounds the wait for each chunk; the run itself continues
+        in the background if it is exceeded, like a timed-out ``run``.
+        """
+        timeout = timeout or self.timeout
+        self._local.last_response = None
+        asyncio.run_coroutine_threadsafe(self._acquire_slot(), self.loop).result()
+        self._count("calls")
+        chunks = queue.Queue()
+        done = self._executor.submit(contextvars.copy_context().run, self._stream_blocking, prompt, chunks)
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=timeout)
+                except queue.Empty:
+                    self._count("timeouts")
+                    tracing.count("llm.timeout")
+                    raise TimeoutError(f"LLM stream produced nothing for {timeout}s") from None
+                if chunk is _STREAM_END:
+                    break
+                yield chunk
+            self._local.last_response = done.result()
+        finally:
+            self.loop.call_soon_threadsafe(self._release_stream_slot, done)
+
+    def _stream_blocking(self, prompt: str, chunks: queue.Queue) -> Optional[str]:
+        runtime = self._checkout()
+        try:
+            for chunk in runtime.stream(prompt):
+                chunks.put(chunk)
+            return runtime.last_response
+        finally:
+            self._runtimes.put(runtime)
+            chunks.put(_STREAM_END)
+
+
+_llm_client: Optional[LLMClient] = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLM client shared by all sessions."""
+    global _llm_client
+    if _llm_client is None:
+        with _llm_client_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient()
+                atexit.register(_llm_client.close)
+    return _llm_client
@@ -0,0 +1,112 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import IO, TYPE_CHECKING, Iterator, Optional, Union
+import mmap
+import os
+import config
+import tracing
+
+if TYPE_CHECKING:
+    from PyPDF2 import PdfReader
+
+PdfSource = Union[bytes, bytearray, memoryview, str, os.PathLike, IO[bytes]]
+
+
+class PdfExtractionError(Exception):
+    """Raised when a PDF cannot be opened or parsed."""
+
+
+def _open_reader(source: PdfSource) -> "PdfReader":
+    from PyPDF2 import PdfReader
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return PdfReader(BytesIO(source))
+    if isinstance(source, (str, os.PathLike)):
+        # Large files are memory-mapped instead of copied into a buffer.
+        if os.path.getsize(source) >= config.PDF_MMAP_THRESHOLD_BYTES:
+            with open(source, "rb") as f:
+                return PdfReader(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        with open(source, "rb") as f:
+            return PdfReader(BytesIO(f.read()))
+    return PdfReader(source)
+
+
+def iter_page_texts(reader: "PdfReader", start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Lazily yield the text of each page; unreadable or empty pages yield ''."""
+    pages = reader.pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    for index in range(start, stop):
+        try:
+            yield pages[index].extract_text() or ""
+        except Exception:
+            yield ""
+
+
+def _extract_range(data: bytes, start: int, stop: int) -> list:
+    return list(iter_page_texts(_open_reader(data), start, stop))
+
+
+def _join_capped(texts, max_chars: int) -> str:
+    """Join page texts with newlines, stopping (and pulling no more pages) at max_chars."""
+    parts = []
+    size = 0
+    for text in texts:
+        remaining = max_chars - size
+        if remaining <= 0:
+            break
+        if len(text) > remaining:
+            parts.append(text[:remaining])
+            break
+        parts.append(text)
+        size += len(text) + 1
+    return "\n".join(parts).strip()
+
+
+def extract_text(
+    source: PdfSource,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> str:
+    """
+    Extract text from a PDF given as bytes, a path or a binary file object.
+    
+    Args:
+        source: PDF bytes, file path, or readable binary stream
+        max_pages: Pages to read at most (defaults to config.PDF_MAX_PAGES)
+        max_chars: Characters to return at most (defaults to config.PDF_MAX_CHARS)
+        workers: Processes for parallel extraction of long documents
+            (defaults to config.PDF_WORKERS; 1 disables it)
+        
+    Returns:
+        Page texts joined by newlines
+    """
+    with tracing.span("pdf.extract") as span:
+        text = _extract_text(source, max_pages, max_chars, workers)
+        span.set(chars=len(text))
+        return text
+
+
+def _extract_text(source: PdfSource, max_pages: Optional[int], max_chars: Optional[int],
+                  workers: Optional[int]) -> str:
+    max_pages = max_pages or config.PDF_MAX_PAGES
+    max_chars = max_chars or config.PDF_MAX_CHARS
+    workers = workers or config.PDF_WORKERS
+
+    try:
+        reader = _open_reader(source)
+        page_count = min(len(reader.pages), max_pages)
+    except Exception as e:
+        raise PdfExtractionError(f"Could not open PDF: {e}") from e
+
+    if workers > 1 and page_count >= config.PDF_PARALLEL_MIN_PAGES:
+        data = source if isinstance(source, (bytes, bytearray)) else None
+        if data is not None:
+            step = -(-page_count // workers)
+            ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunks = pool.map(_extract_range, [bytes(data)] * len(ranges),
+                                  [r[0] for r in ranges], [r[1] for r in ranges])
+                texts = (text for chunk in chunks for text in chunk)
+                return _join_capped(texts, max_chars)
+
+    return _join_capped(iter_page_texts(reader, 0, page_count), max_chars)
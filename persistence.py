@@ -0,0 +1,338 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+import atexit
+import os
+import random
+import threading
+import time
+import config
+from transcript import as_documents
+
+
+class DirtyDict(dict):
+    """dict that records which keys were assigned since the last save."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dirty = set(self.keys())
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._dirty.add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._dirty.discard(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def mark_dirty(self, key) -> None:
+        """Flag a key whose value was mutated in place (e.g. list.append)."""
+        self._dirty.add(key)
+
+    @property
+    def dirty(self) -> set:
+        return set(self._dirty)
+
+    def pop_dirty(self) -> dict:
+        """Return the changed fields and reset the dirty set."""
+        changes = {key: self[key] for key in self._dirty if key in self}
+        self._dirty.clear()
+        return changes
+
+    def clear_dirty(self) -> None:
+        self._dirty.clear()
+
+
+def build_delta_update(
+    candidate_data: DirtyDict,
+    messages: list,
+    saved_message_count: int,
+    now: Optional[datetime] = None,
+) -> Tuple[dict, dict]:
+    """
+    Build the ``$set`` and ``$push`` payloads for one auto-save.
+
+    Returns:
+        (set_data, push_data) where push_data holds only the messages added
+        since the last save. ``set_data["message_count"]`` is the transcript
+        length after the push, which makes the append idempotent (see
+        ``database.append_candidate``).
+    """
+    set_data = candidate_data.pop_dirty()
+    set_data["last_active"] = now or datetime.now(timezone.utc)
+    set_data["message_count"] = len(messages)
+    push_data = {"conversation_history": as_documents(messages[saved_message_count:])}
+    return set_data, push_data
+
+
+def build_full_document(candidate_data: dict, messages: list, now: Optional[datetime] = None) -> dict:
+    """Snapshot of the whole session, used for the first insert and in full mode."""
+    document = dict(candidate_data)
+    document["conversation_history"] = as_documents(messages)
+    document["message_count"] = len(messages)
+    document["last_active"] = now or datetime.now(timezone.utc)
+    return document
+
+
+class _PendingWrite:
+    """Coalesced writes for one candidate document."""
+
+    __slots__ = ("document", "set_data", "push_data")
+
+    def __init__(self):
+        self.document = None
+        self.set_data = {}
+        self.push_data = {}
+
+    def merge(self, document=None, set_data=None, push_data=None) -> None:
+        if document is not None:
+            self.document = dict(document)
+        if set_data:
+            self.set_data.update(set_data)
+        for field, items in (push_data or {}).items():
+            self.push_data.setdefault(field, []).extend(items)
+        if self.document is not None:
+            # Not inserted yet: fold the deltas into the document itself.
+            self.document.update(self.set_data)
+            for field, items in self.push_data.items():
+                self.document[field] = list(self.document.get(field) or []) + items
+            self.set_data, self.push_data = {}, {}
+
+    def replayable(self) -> bool:
+        """
+        True if sending this write twice stores it once.
+
+        Full documents and ``$set`` are idempotent; a transcript push is only
+        when it carries the resulting ``message_count``. Other pushes are not.
+        """
+        return all(field == "conversation_history" and "message_count" in self.set_data
+                   for field in self.push_data)
+
+    @classmethod
+    def from_record(cls, record: dict) -> "_PendingWrite":
+        pending = cls()
+        pending.document = record["document"]
+        pending.set_data = record["set_data"] or {}
+        pending.push_data = record["push_data"] or {}
+        return pending
+
+    def to_record(self, candidate_id: str) -> dict:
+        return {
+            "candidate_id": candidate_id,
+            "document": self.document,
+            "set_data": self.set_data,
+            "push_data": self.push_data,
+        }
+
+
+def write_to_mongo(candidate_id: str, document: Optional[dict], set_data: dict, push_data: dict) -> None:
+    """Default writer: apply one coalesced write through ``database``."""
+    import database
+    if document is not None:
+        database.upsert_candidate(candidate_id, document)
+    else:
+        database.append_candidate(candidate_id, push_data, set_data)
+
+
+class WriteBehindQueue:
+    """
+    Background write-behind queue for session auto-save.
+
+    The chat path only calls ``enqueue``; a single worker thread coalesces
+    pending writes per candidate, retries with backoff, and falls back to an
+    on-disk JSONL journal when MongoDB stays unavailable. Journaled writes
+    are replayed in order once the database is reachable again. Only
+    replayable writes are retried or journaled; a failed write that is not
+    safe to repeat is dropped.
+    """
+
+    def __init__(
+        self,
+        writer: Callable = write_to_mongo,
+        journal_path: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        replay_interval: Optional[float] = None,
+    ):
+        self.writer = writer
+        self.journal_path = journal_path or config.WRITE_QUEUE_JOURNAL_PATH
+        self.max_retries = config.WRITE_QUEUE_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_seconds = config.WRITE_QUEUE_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+        self.replay_interval = config.WRITE_QUEUE_REPLAY_INTERVAL_SECONDS if replay_interval is None else replay_interval
+
+        self._pending = OrderedDict()
+        self._inflight = None
+        self._journaled = set()
+        self._cond = threading.Condition()
+        self._journal_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._last_replay = 0.0
+        self.stats = {"enqueued": 0, "written": 0, "coalesced": 0, "retries": 0, "journaled": 0, "dropped": 0}
+
+    def enqueue(self, candidate_id: str, set_data: Optional[dict] = None,
+                push_data: Optional[dict] = None, document: Optional[dict] = None) -> None:
+        """Queue a write; merges into any pending write for the same candidate."""
+        with self._cond:
+            pending = self._pending.get(candidate_id)
+            if pending is None:
+                pending = self._pending[candidate_id] = _PendingWrite()
+            else:
+                self.stats["coalesced"] += 1
+            pending.merge(document, set_data, push_data)
+            self.stats["enqueued"] += 1
+            self._ensure_worker()
+            self._cond.notify_all()
+
+    def flush(self, candidate_id: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Block until pending writes (for one candidate, or all) are handled."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def done():
+            if candidate_id is None:
+                return not self._pending and self._inflight is None
+            return candidate_id not in self._pending and self._inflight != candidate_id
+
+        with self._cond:
+            while not done():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush everything and stop the worker."""
+        self.flush(timeout=timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="talentscout-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait(self.replay_interval or None)
+                    if not self._pending:
+                        break
+                if self._stopping and not self._pending:
+                    return
+                if not self._pending:
+                    candidate_id = pending = None
+                else:
+                    candidate_id, pending = self._pending.popitem(last=False)
+                    self._inflight = candidate_id
+
+            if pending is not None:
+                self._process(candidate_id, pending)
+                with self._cond:
+                    self._inflight = None
+                    self._cond.notify_all()
+
+            if time.monotonic() - self._last_replay >= self.replay_interval:
+                try:
+                    self.replay_journal()
+                except Exception as e:
+                    print(f"Journal replay error: {e}")
+
+    def _process(self, candidate_id: str, pending: _PendingWrite) -> None:
+        # Once a candidate has journaled writes, later writes follow them into
+        # the journal so ordering is kept until the journal is replayed.
+        if candidate_id in self._journaled:
+            self._journal(pending.to_record(candidate_id))
+            return
+        if self._write_with_retry(candidate_id, pending):
+            self.stats["written"] += 1
+        elif pending.replayable():
+            self._journal(pending.to_record(candidate_id))
+        else:
+            self.stats["dropped"] += 1
+
+    def _write_with_retry(self, candidate_id: str, pending: _PendingWrite) -> bool:
+        max_retries = self.max_retries if pending.replayable() else 0
+        for attempt in range(max_retries + 1):
+            try:
+                self.writer(candidate_id, pending.document, pending.set_data, pending.push_data)
+                return True
+            except Exception as e:
+                if attempt == max_retries:
+                    print(f"Write-behind error for {candidate_id}: {e}")
+                    return False
+                self.stats["retries"] += 1
+                delay = self.backoff_seconds * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay))
+        return False
+
+    def _journal(self, record: dict) -> None:
+        from bson import json_util
+        with self._journal_lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json_util.dumps(record) + "\n")
+            self._journaled.add(record["candidate_id"])
+        self.stats["journaled"] += 1
+
+    def replay_journal(self) -> int:
+        """Replay journaled writes in order; stops at the first failure of a replayable write."""
+        self._last_replay = time.monotonic()
+        with self._journal_lock:
+            if not os.path.exists(self.journal_path):
+                return 0
+            from bson import json_util
+            with open(self.journal_path, encoding="utf-8") as f:
+                records = [json_util.loads(line) for line in f if line.strip()]
+
+            replayed = dropped = 0
+            for record in records:
+                try:
+                    self.writer(record["candidate_id"], record["document"],
+                                record["set_data"], record["push_data"])
+                except Exception as e:
+                    if _PendingWrite.from_record(record).replayable():
+                        break
+                    # Journaled only to keep ordering; not safe to send again.
+                    print(f"Journal replay dropped a write for {record['candidate_id']}: {e}")
+                    dropped += 1
+                replayed += 1
+
+            remaining = records[replayed:]
+            if remaining:
+                with open(self.journal_path, "w", encoding="utf-8") as f:
+                    f.writelines(json_util.dumps(r) + "\n" for r in remaining)
+            else:
+                os.remove(self.journal_path)
+            self._journaled = {r["candidate_id"] for r in remaining}
+            self.stats["written"] += replayed - dropped
+            self.stats["dropped"] += dropped
+            return replayed - dropped
+
+
+_write_queue: Optional[WriteBehindQueue] = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteBehindQueue:
+    """Return the process-wide write-behind queue."""
+    global _write_queue
+    if _write_queue is None:
+        with _write_queue_lock:
+            if _write_queue is None:
+                _write_queue = WriteBehindQueue()
+                atexit.register(_write_queue.close)
+    return _write_queue
@@ -0,0 +1,245 @@
+"""
+Precomputed technical question bank.
+
+Questions are generated once per (canonical skill set, position, seniority),
+stored with a version in MongoDB and served from an in-process LRU cache.
+After a MongoDB failure the bank is memory-only for STORE_RETRY_SECONDS.
+
+    python question_bank.py --warm            # pre-generate common stacks
+    python question_bank.py --warm --fake-llm --in-memory-db
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+import argparse
+import re
+import threading
+import time
+import config
+import tracing
+from crew_agent import get_tech_questions_prompt
+from llm_cache import STORE_RETRY_SECONDS
+from skills import canonical_skills
+
+QUESTION_BANK_VERSION = 1
+MAX_SKILLS_PER_KEY = 5
+
+SENIORITY_WORDS = {
+    "intern": "junior", "junior": "junior", "jr": "junior", "graduate": "junior", "entry": "junior",
+    "senior": "senior", "sr": "senior", "lead": "senior", "staff": "senior", "principal": "senior",
+}
+
+COMMON_STACKS = [
+    ("Python, Django, PostgreSQL", "Backend Engineer"),
+    ("Python, FastAPI, MongoDB", "Backend Engineer"),
+    ("Java, Spring Boot, MySQL", "Backend Engineer"),
+    ("Node.js, Express, MongoDB", "Backend Engineer"),
+    ("React, Node.js", "Full Stack Developer"),
+    ("React, TypeScript", "Frontend Developer"),
+    ("Python, PyTorch, scikit-learn", "Machine Learning Engineer"),
+    ("AWS, Kubernetes, Terraform", "DevOps Engineer"),
+]
+
+
+def normalize_skills(tech_stack) -> Tuple[str, ...]:
+    """Canonical skill key, e.g. 'React.js, node, Postgres' -> ('nodejs', 'postgresql', 'react')."""
+    return tuple(sorted(canonical_skills(tech_stack)[:MAX_SKILLS_PER_KEY]))
+
+
+def _years(years_of_experience) -> Optional[float]:
+    match = re.search(r"\d+(?:\.\d+)?", str(years_of_experience or ""))
+    return float(match.group(0)) if match else None
+
+
+def normalize_position(position: str, years_of_experience=None) -> Tuple[str, str]:
+    """Split a position into (canonical role, seniority)."""
+    words = re.findall(r"[a-z0-9+#]+", (position or "").lower())
+    seniority = next((SENIORITY_WORDS[w] for w in words if w in SENIORITY_WORDS), None)
+    role = " ".join(w for w in words if w not in SENIORITY_WORDS) or "software engineer"
+    if seniority is None:
+        years = _years(years_of_experience)
+        if years is None:
+            seniority = "mid"
+        else:
+            seniority = "junior" if years < 2 else "mid" if years < 5 else "senior"
+    return role, seniority
+
+
+def parse_questions(text: str) -> List[str]:
+    """Pull numbered (or bulleted) questions out of a generated response."""
+    questions = []
+    for line in (text or "").splitlines():
+        match = re.match(r"^\s*(?:\*\*)?(?:\d+[.)]|[-*•])\s*(?:\*\*)?\s*(.+)", line)
+        if match:
+            question = re.sub(r"[*_`]+", "", match.group(1)).strip()
+            if len(question) > 10:
+                questions.append(question)
+    return questions
+
+
+class QuestionBank:
+    """Versioned question store with an in-process LRU in front of MongoDB."""
+
+    def __init__(self, collection=None, max_entries: Optional[int] = None,
+                 version: int = QUESTION_BANK_VERSION):
+        self._collection = collection
+        self.max_entries = max_entries or config.QUESTION_BANK_CACHE_SIZE
+        self.version = version
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._store_retry_at = 0.0
+        self.stats = {"memory_hits": 0, "store_hits": 0, "generated": 0, "store_errors": 0}
+
+    def _get_collection(self):
+        if time.monotonic() < self._store_retry_at:
+            return None
+        if self._collection is None:
+            from database import get_database
+            self._collection = get_database()[config.QUESTION_BANK_COLLECTION]
+        return self._collection
+
+    def key(self, tech_stack, position: str, years_of_experience=None) -> str:
+        role, seniority = normalize_position(position, years_of_experience)
+        return f"v{self.version}|{role}|{seniority}|{'+'.join(normalize_skills(tech_stack))}"
+
+    def get_questions(self, tech_stack, position: str, agent, years_of_experience=None) -> List[str]:
+        """Return questions for this stack/position, generating them once on a miss."""
+        key = self.key(tech_stack, position, years_of_experience)
+        questions = self._from_memory(key)
+        if questions is not None:
+            return questions
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                # Another thread may have generated the same key while we waited.
+                questions = self._from_memory(key)
+                if questions is not None:
+                    return questions
+                document = None
+                try:
+                    collection = self._get_collection()
+                    if collection is not None:
+                        document = collection.find_one({"_id": key})
+                except Exception:
+                    self._store_failed()
+                if document:
+                    self.stats["store_hits"] += 1
+                    tracing.count("question_bank.hit")
+                    questions = document["questions"]
+                else:
+                    questions = self._generate(key, tech_stack, position, years_of_experience, agent)
+                if questions:
+                    # An unparseable response is not cached, so the next interview asks again.
+                    self._remember(key, questions)
+                return questions
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+    def _generate(self, key, tech_stack, position, years_of_experience, agent) -> List[str]:
+        role, seniority = normalize_position(position, years_of_experience)
+        skills = normalize_skills(tech_stack)
+        response = agent.run(get_tech_questions_prompt(", ".join(skills), role, seniority))
+        questions = parse_questions(response)
+        self.stats["generated"] += 1
+        tracing.count("question_bank.miss")
+        if questions:
+            try:
+                collection = self._get_collection()
+                if collection is not None:
+                    collection.replace_one({"_id": key}, {
+                        "skills": list(skills),
+                        "position": role,
+                        "seniority": seniority,
+                        "version": self.version,
+                        "questions": questions,
+                        "created_at": datetime.now(timezone.utc),
+                    }, upsert=True)
+            except Exception:
+                self._store_failed()
+        return questions
+
+    def _store_failed(self) -> None:
+        self.stats["store_errors"] += 1
+        self._store_retry_at = time.monotonic() + STORE_RETRY_SECONDS
+
+    def _from_memory(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            questions = self._memory.get(key)
+            if questions is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                tracing.count("question_bank.hit")
+            return questions
+
+    def _remember(self, key: str, questions: List[str]) -> None:
+        with self._lock:
+            self._memory[key] = questions
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def warm(self, agent, stacks=COMMON_STACKS, seniorities=("junior", "mid", "senior")) -> int:
+        """Pre-generate questions for common stacks; returns the number of keys ready."""
+        years_for = {"junior": 1, "mid": 3, "senior": 6}
+        ready = 0
+        for tech_stack, position in stacks:
+            for seniority in seniorities:
+                if self.get_questions(tech_stack, position, agent, years_for[seniority]):
+                    ready += 1
+        return ready
+
+
+_question_bank: Optional[QuestionBank] = None
+_question_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """Return the process-wide question bank."""
+    global _question_bank
+    if _question_bank is None:
+        with _question_bank_lock:
+            if _question_bank is None:
+                _question_bank = QuestionBank()
+    return _question_bank
+
+
+def _fake_questions(prompt: str) -> str:
+    stack = re.search(r"tech stack includes: (.+)", prompt)
+    skills = stack.group(1).strip() if stack else "your stack"
+    return "\n".join(f"{i}. How would you approach problem {i} using {skills}?" for i in range(1, 6))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the technical question bank.")
+    parser.add_argument("--warm", action="store_true", help="pre-generate questions for common stacks")
+    parser.add_argument("--fake-llm", action="store_true", help="use a deterministic offline LLM")
+    parser.add_argument("--in-memory-db", action="store_true", help="use mongomock instead of MONGODB_URI")
+    args = parser.parse_args(argv)
+
+    if args.in_memory_db:
+        import mongomock
+        import database
+        database.set_client(mongomock.MongoClient())
+
+    from crew_agent import TalentScoutCrew
+    if args.fake_llm:
+        from fake_llm import FakeLLM
+        agent = TalentScoutCrew(llm=FakeLLM(responder=_fake_questions))
+    else:
+        agent = TalentScoutCrew()
+
+    bank = get_question_bank()
+    if args.warm:
+        ready = bank.warm(agent)
+        print(f"question bank warm: {ready} keys ready, {bank.stats['generated']} generated, "
+              f"{bank.stats['store_hits']} already stored")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
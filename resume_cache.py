@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+import hashlib
+import threading
+import time
+import config
+import tracing
+from crew_agent import RESUME_EXTRACTION_PROMPT
+from llm_cache import STORE_RETRY_SECONDS
+
+
+def analysis_version(prompt: str = RESUME_EXTRACTION_PROMPT, model: Optional[str] = None) -> str:
+    """Version tag so cached analyses are invalidated when the prompt or model changes."""
+    digest = hashlib.sha256(f"{model or config.LLM_MODEL}\n{prompt}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ResumeAnalysisCache:
+    """
+    Content-addressed cache of resume extraction and analysis results.
+
+    Keys are the SHA-256 of the PDF bytes plus the analysis version. Entries
+    live in an in-memory LRU tier backed by a MongoDB collection whose TTL
+    index evicts stale entries; memory entries expire on the same schedule.
+    After a MongoDB failure the cache is memory-only for STORE_RETRY_SECONDS.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None,
+                 version: Optional[str] = None, collection=None):
+        self.max_entries = max_entries or config.RESUME_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or config.RESUME_CACHE_TTL_SECONDS
+        self.version = version or analysis_version()
+        self._collection = collection
+        self._indexed = False
+        self._store_retry_at = 0.0
+        self._memory = OrderedDict()  # key -> (record, expires_at)
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "store_hits": 0, "misses": 0, "store_errors": 0}
+
+    def key(self, pdf_bytes: bytes) -> str:
+        return f"{hashlib.sha256(pdf_bytes).hexdigest()}:{self.version}"
+
+    def _get_collection(self):
+        if time.monotonic() < self._store_retry_at:
+            return None
+        if self._collection is None:
+            from database import get_database
+            self._collection = get_database()[config.RESUME_CACHE_COLLECTION]
+        if not self._indexed:
+            self._collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+            self._indexed = True
+        return self._collection
+
+    def get(self, pdf_bytes: bytes) -> Optional[dict]:
+        """Return the cached record for these PDF bytes, or None on a miss."""
+        key = self.key(pdf_bytes)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                tracing.count("resume_cache.hit")
+                return entry[0]
+
+        document = None
+        try:
+            collection = self._get_collection()
+            if collection is not None:
+                document = collection.find_one({"_id": key})
+        except Exception:
+            self._store_failed()
+
+        # The TTL monitor only runs once a minute, so check the age here too.
+        expires_at = document and document["created_at"].replace(tzinfo=timezone.utc).timestamp() + self.ttl_seconds
+        if document is None or expires_at <= time.time():
+            self.stats["misses"] += 1
+            tracing.count("resume_cache.miss")
+            return None
+
+        record = {
+            "resume_text": document["resume_text"],
+            "analysis": document["analysis"],
+            "fields": document["fields"],
+        }
+        self._remember(key, record, expires_at)
+        self.stats["store_hits"] += 1
+        tracing.count("resume_cache.hit")
+        return record
+
+    def put(self, pdf_bytes: bytes, record: dict) -> None:
+        """Store resume_text, analysis and fields for these PDF bytes."""
+        key = self.key(pdf_bytes)
+        self._remember(key, record, time.time() + self.ttl_seconds)
+        try:
+            collection = self._get_collection()
+            if collection is not None:
+                collection.replace_one(
+                    {"_id": key},
+                    {**record, "version": self.version, "created_at": datetime.now(timezone.utc)},
+                    upsert=True,
+                )
+        except Exception:
+            self._store_failed()
+
+    def _store_failed(self) -> None:
+        self.stats["store_errors"] += 1
+        self._store_retry_at = time.monotonic() + STORE_RETRY_SECONDS
+
+    def _remember(self, key: str, record: dict, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (record, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return self.stats["memory_hits"] + self.stats["store_hits"]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.llm_calls_saved + self.stats["misses"]
+        return self.llm_calls_saved / lookups if lookups else 0.0
+
+
+_resume_cache: Optional[ResumeAnalysisCache] = None
+_resume_cache_lock = threading.Lock()
+
+
+def get_resume_cache() -> ResumeAnalysisCache:
+    """Return the process-wide resume analysis cache."""
+    global _resume_cache
+    if _resume_cache is None:
+        with _resume_cache_lock:
+            if _resume_cache is None:
+                _resume_cache = ResumeAnalysisCache()
+    return _resume_cache
@@ -0,0 +1,139 @@
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+import json
+import re
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\(?\d[\d\s().-]{7,}\d(?![\w/])")
+YEAR_RANGE_RE = re.compile(r"^(19|20)\d{2}\s*[-–]\s*(19|20)\d{2}$")
+EMPTY_VALUES = {"", "-", "n/a", "na", "none", "null", "not found", "not available", "unknown"}
+
+# Candidate fields filled from the structured record (email/phone come from the pre-pass).
+CANDIDATE_FIELDS = ("full_name", "email", "phone", "years_of_experience", "desired_position", "location", "tech_stack")
+
+# Labels accepted by the markdown fallback parser.
+_FALLBACK_LABELS = {
+    "full_name": ("Full Name", "Name"),
+    "years_of_experience": ("Years of Experience", "Experience"),
+    "desired_position": ("Current/Recent Position", "Current Position", "Position"),
+    "location": ("Location",),
+    "tech_stack": ("Tech Stack/Skills", "Tech Stack", "Skills"),
+}
+
+
+@dataclass
+class CandidateFields:
+    """Typed record of the fields extracted from a resume."""
+
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    years_of_experience: Optional[str] = None
+    desired_position: Optional[str] = None
+    location: Optional[str] = None
+    tech_stack: List[str] = field(default_factory=list)
+    summary: Optional[str] = None
+    suggested_questions: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CandidateFields":
+        """Validate and coerce a loosely-typed dict (e.g. parsed LLM JSON)."""
+        return cls(
+            full_name=_clean(data.get("full_name")),
+            email=_clean(data.get("email")),
+            phone=_clean(data.get("phone")),
+            years_of_experience=_clean(data.get("years_of_experience")),
+            desired_position=_clean(data.get("desired_position")),
+            location=_clean(data.get("location")),
+            tech_stack=_clean_list(data.get("tech_stack")),
+            summary=_clean(data.get("summary")),
+            suggested_questions=_clean_list(data.get("suggested_questions"), split=False),
+        )
+
+    def to_candidate_data(self) -> dict:
+        """Fields in the shape of session candidate_data (tech_stack as a string)."""
+        data = asdict(self)
+        data["tech_stack"] = ", ".join(self.tech_stack) or None
+        return {name: data[name] for name in CANDIDATE_FIELDS}
+
+
+def _clean(value) -> Optional[str]:
+    if value is None or isinstance(value, (list, dict)):
+        return None
+    text = re.sub(r"[*_`]+", "", str(value)).strip().strip('"').strip()
+    return None if text.lower() in EMPTY_VALUES else text
+
+
+def _clean_list(value, split: bool = True) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        items = re.split(r"[,;|\n]", value) if split else [value]
+    elif isinstance(value, (list, tuple)):
+        items = value
+    else:
+        items = [value]
+    return [item for item in (_clean(i) for i in items) if item]
+
+
+def find_email(text: str) -> Optional[str]:
+    match = EMAIL_RE.search(text or "")
+    return match.group(0) if match else None
+
+
+def find_phone(text: str) -> Optional[str]:
+    for match in PHONE_RE.finditer(text or ""):
+        candidate = match.group(0).strip()
+        digits = re.sub(r"\D", "", candidate)
+        if 10 <= len(digits) <= 15 and not YEAR_RANGE_RE.match(candidate):
+            return candidate
+    return None
+
+
+def prepass(resume_text: str) -> dict:
+    """Deterministic extraction of contact details; no LLM involved."""
+    return {"email": find_email(resume_text), "phone": find_phone(resume_text)}
+
+
+def _load_json_object(text: str) -> Optional[dict]:
+    text = re.sub(r"^```(?:json)?|```$", "", (text or "").strip(), flags=re.MULTILINE).strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _parse_markdown(text: str) -> dict:
+    """Fallback for free-text responses: 'Label: value' lines, tolerant of bold markers."""
+    plain = re.sub(r"[*_`]+", "", text or "")
+    data = {}
+    for name, labels in _FALLBACK_LABELS.items():
+        for label in labels:
+            match = re.search(rf"^\W*{re.escape(label)}\s*:\s*(.+?)\s*$", plain, re.IGNORECASE | re.MULTILINE)
+            if match:
+                data[name] = match.group(1)
+                break
+    return data
+
+
+def parse_resume_fields(analysis: str, resume_text: str = "") -> CandidateFields:
+    """
+    Build the candidate record from the extraction response and the resume.
+    
+    The response is parsed as JSON, falling back to 'Label: value' lines.
+    Email and phone always come from the deterministic pre-pass over the
+    resume text, falling back to the response only if the pre-pass misses.
+    """
+    data = _load_json_object(analysis)
+    if data is None:
+        data = _parse_markdown(analysis)
+    record = CandidateFields.from_dict(data)
+
+    contact = prepass(resume_text)
+    record.email = contact["email"] or record.email
+    record.phone = contact["phone"] or record.phone
+    return record
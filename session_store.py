@@ -0,0 +1,393 @@
+"""
+Externalized interview session state.
+
+Sessions are saved as compressed snapshots (``InterviewSession.snapshot``)
+keyed by the session key, with a version number for optimistic concurrency:
+a write only succeeds if the stored version is the one the writer loaded, so
+two app replicas cannot silently overwrite each other's turns. The transcript
+is stored as appended chunks, so a save writes the session state and only
+the messages added since the previous save.
+
+Backends: ``MemorySessionStore`` (single process), ``MongoSessionStore`` and
+``RedisSessionStore`` (any Redis-compatible server; ``fakeredis`` works for
+local runs). ``SessionManager`` keeps a bounded set of live sessions per
+process on top of a store.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+import hashlib
+import threading
+import time
+import zlib
+import config
+
+
+class SessionConflict(Exception):
+    """The stored session changed since it was loaded (another replica wrote it)."""
+
+
+def encode_snapshot(snapshot: dict) -> bytes:
+    from bson import json_util
+    return zlib.compress(json_util.dumps(snapshot).encode("utf-8"), 6)
+
+
+def decode_snapshot(data: bytes) -> dict:
+    from bson import json_util
+    return json_util.loads(zlib.decompress(data).decode("utf-8"))
+
+
+def _assemble(state_data: bytes, chunks: List[bytes]) -> dict:
+    """Snapshot from the stored state and message chunks."""
+    snapshot = decode_snapshot(state_data)
+    if "messages" not in snapshot:  # snapshots saved whole still carry their messages
+        snapshot["messages"] = [message for chunk in chunks for message in decode_snapshot(chunk)]
+    return snapshot
+
+
+class SessionStore(ABC):
+    """
+    Versioned snapshot storage.
+
+    Versions start at 1 for the first save; 0 means "not stored". ``shared``
+    stores can be written by other processes, so live copies must be checked
+    against them.
+    """
+
+    shared = True
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[Tuple[int, dict]]:
+        """Return (version, snapshot), or None if unknown or expired."""
+
+    @abstractmethod
+    def version(self, key: str) -> int:
+        """Current stored version (cheaper than ``load``)."""
+
+    def save(self, key: str, snapshot: dict, expected_version: int, message_start: int = 0) -> int:
+        """
+        Store a snapshot if the stored version is still ``expected_version``; returns the new version.
+
+        With ``message_start`` > 0, ``snapshot["messages"]`` holds only the
+        messages from that position on and is appended to the stored ones.
+        """
+        state = dict(snapshot)
+        messages = state.pop("messages", [])
+        return self.save_encoded(key, encode_snapshot(state), encode_snapshot(messages) if messages else None,
+                                 expected_version, append=message_start > 0)
+
+    @abstractmethod
+    def save_encoded(self, key: str, state_data: bytes, messages_data: Optional[bytes], expected_version: int,
+                     append: bool = False) -> int:
+        """``save`` with the state and new messages already encoded."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the session."""
+
+
+class MemorySessionStore(SessionStore):
+    """In-process store; bounded by count and idle time like the live-session cache."""
+
+    shared = False
+
+    def __init__(self, max_sessions: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.max_sessions = max_sessions or config.SESSION_MAX_LIVE * 10
+        self.ttl_seconds = ttl_seconds or config.SESSION_TTL_SECONDS
+        self._sessions = OrderedDict()  # key -> (version, state, message chunks, saved_at)
+        self._lock = threading.Lock()
+
+    def _get(self, key: str):
+        entry = self._sessions.get(key)
+        if entry is not None and time.monotonic() - entry[3] > self.ttl_seconds:
+            del self._sessions[key]
+            return None
+        return entry
+
+    def load(self, key: str) -> Optional[Tuple[int, dict]]:
+        with self._lock:
+            entry = self._get(key)
+        return None if entry is None else (entry[0], _assemble(entry[1], entry[2]))
+
+    def version(self, key: str) -> int:
+        with self._lock:
+            entry = self._get(key)
+        return entry[0] if entry else 0
+
+    def save_encoded(self, key: str, state_data: bytes, messages_data: Optional[bytes], expected_version: int,
+                     append: bool = False) -> int:
+        with self._lock:
+            entry = self._get(key)
+            if (entry[0] if entry else 0) != expected_version:
+                raise SessionConflict(key)
+            chunks = list(entry[2]) if entry and append else []
+            if messages_data:
+                chunks.append(messages_data)
+            self._sessions[key] = (expected_version + 1, state_data, chunks, time.monotonic())
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return expected_version + 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._sessions.pop(key, None)
+
+
+class MongoSessionStore(SessionStore):
+    """
+    Sessions in a MongoDB collection; a TTL index expires abandoned ones.
+
+    Each document holds the state in ``data`` and the transcript as a list
+    of compressed chunks in ``messages``.
+    """
+
+    def __init__(self, collection=None, ttl_seconds: Optional[int] = None):
+        self._collection = collection
+        self.ttl_seconds = ttl_seconds or config.SESSION_TTL_SECONDS
+        self._indexed = False
+
+    def _get_collection(self):
+        if self._collection is None:
+            from database import get_database
+            self._collection = get_database()[config.SESSION_COLLECTION]
+        if not self._indexed:
+            self._collection.create_index("updated_at", expireAfterSeconds=self.ttl_seconds)
+            self._indexed = True
+        return self._collection
+
+    def load(self, key: str) -> Optional[Tuple[int, dict]]:
+        document = self._get_collection().find_one({"_id": key})
+        if document is None:
+            return None
+        return document["version"], _assemble(document["data"], document.get("messages", []))
+
+    def version(self, key: str) -> int:
+        document = self._get_collection().find_one({"_id": key}, {"version": 1})
+        return document["version"] if document else 0
+
+    def save_encoded(self, key: str, state_data: bytes, messages_data: Optional[bytes], expected_version: int,
+                     append: bool = False) -> int:
+        from bson import Binary
+        from pymongo.errors import DuplicateKeyError
+        fields = {"data": Binary(state_data), "updated_at": datetime.now(timezone.utc)}
+        chunks = [Binary(messages_data)] if messages_data else []
+        collection = self._get_collection()
+        if expected_version == 0:
+            try:
+                collection.insert_one({"_id": key, "version": 1, "messages": chunks, **fields})
+            except DuplicateKeyError:
+                raise SessionConflict(key)
+            return 1
+        update = {"$set": fields, "$inc": {"version": 1}}
+        if not append:
+            fields["messages"] = chunks
+        elif chunks:
+            update["$push"] = {"messages": chunks[0]}
+        result = collection.update_one({"_id": key, "version": expected_version}, update)
+        if result.matched_count == 0:
+            raise SessionConflict(key)
+        return expected_version + 1
+
+    def delete(self, key: str) -> None:
+        self._get_collection().delete_one({"_id": key})
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions in a Redis hash per key (fields ``version`` and ``data``), with
+    the transcript chunks in a list next to it.
+
+    The version check and write run in a WATCH/MULTI transaction, so they
+    work on any Redis-compatible server without server-side scripts.
+    """
+
+    def __init__(self, client=None, ttl_seconds: Optional[int] = None, prefix: str = "talentscout:session:"):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(config.REDIS_URL)
+        self.client = client
+        self.ttl_seconds = ttl_seconds or config.SESSION_TTL_SECONDS
+        self.prefix = prefix
+
+    def load(self, key: str) -> Optional[Tuple[int, dict]]:
+        name = self.prefix + key
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.hmget(name, "version", "data")
+            pipe.lrange(name + ":messages", 0, -1)
+            (version, data), chunks = pipe.execute()
+        return None if data is None else (int(version), _assemble(data, chunks))
+
+    def version(self, key: str) -> int:
+        return int(self.client.hget(self.prefix + key, "version") or 0)
+
+    def save_encoded(self, key: str, state_data: bytes, messages_data: Optional[bytes], expected_version: int,
+                     append: bool = False) -> int:
+        from redis.exceptions import WatchError
+        name = self.prefix + key
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(name)
+                if int(pipe.hget(name, "version") or 0) != expected_version:
+                    raise SessionConflict(key)
+                pipe.multi()
+                pipe.hset(name, mapping={"version": expected_version + 1, "data": state_data})
+                if not append:
+                    pipe.delete(name + ":messages")
+                if messages_data:
+                    pipe.rpush(name + ":messages", messages_data)
+                pipe.expire(name, self.ttl_seconds)
+                pipe.expire(name + ":messages", self.ttl_seconds)
+                pipe.execute()
+            except WatchError:
+                raise SessionConflict(key)
+        return expected_version + 1
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key, self.prefix + key + ":messages")
+
+
+def create_session_store(backend: Optional[str] = None) -> SessionStore:
+    backend = backend or config.SESSION_STORE
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "mongo":
+        return MongoSessionStore()
+    if backend == "redis":
+        return RedisSessionStore()
+    raise ValueError(f"Unknown session store: {backend}")
+
+
+class SessionManager:
+    """
+    Live ``InterviewSession`` objects for this process, backed by a store.
+
+    At most ``max_live`` sessions stay loaded, and sessions idle for
+    ``idle_seconds`` are unloaded; both can be restored from the store by key
+    (e.g. from a resume link). With a shared store, ``get`` reloads a session
+    when another replica has saved a newer version; the stored version is
+    checked at most every ``revalidate_seconds``. ``save`` skips the write
+    when nothing changed and otherwise appends only the new messages.
+    """
+
+    def __init__(self, store: SessionStore, agent_factory: Callable, max_live: Optional[int] = None,
+                 idle_seconds: Optional[int] = None, session_kwargs: Optional[dict] = None,
+                 revalidate_seconds: Optional[float] = None):
+        self.store = store
+        self.agent_factory = agent_factory
+        self.max_live = max_live or config.SESSION_MAX_LIVE
+        self.idle_seconds = idle_seconds or config.SESSION_IDLE_SECONDS
+        self.revalidate_seconds = (config.SESSION_REVALIDATE_SECONDS if revalidate_seconds is None
+                                   else revalidate_seconds)
+        self.session_kwargs = session_kwargs or {}
+        self._live = OrderedDict()  # key -> (session, last_used, last_checked)
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "restored": 0, "reloaded": 0, "evicted": 0, "conflicts": 0,
+                      "saves": 0, "unchanged": 0}
+
+    def _remember(self, session, checked: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live.get(session.session_key)
+            last_checked = now if checked or entry is None or entry[0] is not session else entry[2]
+            self._live[session.session_key] = (session, now, last_checked)
+            self._live.move_to_end(session.session_key)
+        self.evict_idle()
+
+    def create(self):
+        from interview import InterviewSession
+        session = InterviewSession(self.agent_factory(), **self.session_kwargs)
+        self.stats["created"] += 1
+        self._remember(session)
+        return session
+
+    def get(self, key: str):
+        """The live session for ``key``, restoring it from the store if needed; None if unknown."""
+        from interview import InterviewSession
+        with self._lock:
+            entry = self._live.get(key)
+        if entry is not None and (not self.store.shared
+                                  or time.monotonic() - entry[2] < self.revalidate_seconds):
+            self._remember(entry[0])
+            return entry[0]
+        if entry is not None and entry[0].store_version >= self.store.version(key):
+            self._remember(entry[0], checked=True)
+            return entry[0]
+
+        loaded = self.store.load(key)
+        if loaded is None:
+            return entry[0] if entry is not None else None
+        version, snapshot = loaded
+        session = InterviewSession.from_snapshot(snapshot, self.agent_factory(), **self.session_kwargs)
+        session.store_version = version
+        session.store_message_count = len(session.messages)
+        self.stats["reloaded" if entry is not None else "restored"] += 1
+        self._remember(session, checked=True)
+        return session
+
+    def save(self, session) -> bool:
+        """
+        Write the session's changes; returns False if there were none.
+
+        Raises:
+            SessionConflict: another replica saved first; the local copy is
+                dropped so the next ``get`` loads the newer state
+        """
+        start = session.store_message_count if session.store_version else 0
+        snapshot = session.snapshot(message_start=start)
+        messages = snapshot.pop("messages")
+        state_data = encode_snapshot(snapshot)
+        digest = hashlib.blake2b(state_data, digest_size=16).digest()
+        if session.store_version and not messages and digest == session.store_digest:
+            self.stats["unchanged"] += 1
+            self._remember(session)
+            return False
+        try:
+            session.store_version = self.store.save_encoded(
+                session.session_key, state_data, encode_snapshot(messages) if messages else None,
+                session.store_version, append=start > 0,
+            )
+        except SessionConflict:
+            self.stats["conflicts"] += 1
+            with self._lock:
+                self._live.pop(session.session_key, None)
+            raise
+        session.store_message_count = start + len(messages)
+        session.store_digest = digest
+        self.stats["saves"] += 1
+        self._remember(session, checked=True)
+        return True
+
+    def evict_idle(self) -> int:
+        """Unload idle sessions and trim to ``max_live``; returns the number unloaded."""
+        cutoff = time.monotonic() - self.idle_seconds
+        evicted = 0
+        with self._lock:
+            for key in [key for key, (_, used, _) in self._live.items() if used < cutoff]:
+                del self._live[key]
+                evicted += 1
+            while len(self._live) > self.max_live:
+                self._live.popitem(last=False)
+                evicted += 1
+        self.stats["evicted"] += evicted
+        return evicted
+
+    @property
+    def live_count(self) -> int:
+        return len(self._live)
+
+
+_session_manager: Optional[SessionManager] = None
+_session_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Return the process-wide session manager for the configured store."""
+    global _session_manager
+    if _session_manager is None:
+        with _session_manager_lock:
+            if _session_manager is None:
+                from llm_client import get_llm_client
+                _session_manager = SessionManager(create_session_store(), get_llm_client)
+    return _session_manager
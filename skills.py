@@ -0,0 +1,37 @@
+import re
+
+SKILL_ALIASES = {
+    "js": "javascript", "ecmascript": "javascript", "es6": "javascript",
+    "ts": "typescript",
+    "py": "python", "python3": "python",
+    "golang": "go",
+    "reactjs": "react", "react.js": "react",
+    "node": "nodejs", "node.js": "nodejs",
+    "express.js": "express", "expressjs": "express",
+    "vue.js": "vue", "vuejs": "vue",
+    "next.js": "nextjs", "angularjs": "angular",
+    "postgres": "postgresql", "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "gcp": "google cloud", "google cloud platform": "google cloud",
+    "c#": "csharp", "c++": "cpp", ".net": "dotnet",
+    "sklearn": "scikit-learn", "tf": "tensorflow",
+}
+
+
+def canonical_skill(skill: str) -> str:
+    # Only trailing punctuation goes: the leading dot of ".net" is part of the name.
+    skill = re.sub(r"\s+", " ", str(skill).strip().lower().rstrip(" .,;:!?"))
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def canonical_skills(tech_stack) -> list:
+    """Canonical, de-duplicated skills in the order given ('React.js, node' -> ['react', 'nodejs'])."""
+    items = tech_stack if isinstance(tech_stack, (list, tuple)) else re.split(r",|;|/|\||\band\b|\n", tech_stack or "")
+    skills = []
+    for item in items:
+        skill = canonical_skill(item)
+        if skill and skill not in skills:
+            skills.append(skill)
+    return skills
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import mongomock
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def mongo():
+    """Point the shared database client at a fresh mongomock instance."""
+    client = mongomock.MongoClient()
+    database.set_client(client)
+    yield client
+    database.set_client(None)
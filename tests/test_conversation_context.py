@@ -0,0 +1,32 @@
+from conversation_context import ConversationContext, estimate_tokens
+from interview import InterviewSession
+
+
+def transcript(count):
+    return [{"role": "user" if i % 2 else "assistant", "content": f"Turn {i}: " + "details about the system " * 8}
+            for i in range(count)]
+
+
+def test_prompt_size_stays_bounded_as_the_session_grows():
+    sizes = {}
+    for length in (10, 100, 400):
+        session = InterviewSession(agent=None, find_duplicate=lambda **_: None)
+        session.candidate_data["resume_text"] = "raw resume " * 2000
+        for message in transcript(length):
+            session.messages.append(message)
+        prompt = session.build_prompt("What next?")
+        assert "raw resume" not in prompt
+        sizes[length] = estimate_tokens(prompt)
+    assert sizes[400] <= sizes[100] * 1.1
+    assert sizes[400] < 2 * ConversationContext().token_budget
+
+
+def test_incremental_render_matches_a_fresh_render():
+    messages = transcript(40)
+    incremental = ConversationContext(token_budget=600, window_messages=6)
+    for end in range(1, len(messages) + 1):
+        incremental.sync(messages[:end])
+        fresh = ConversationContext(token_budget=600, window_messages=6)
+        fresh.sync(messages[:end])
+        assert incremental.render() == fresh.render()
+    assert incremental.tokens <= 600
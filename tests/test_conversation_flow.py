@@ -0,0 +1,78 @@
+import pytest
+
+from conversation_flow import (FIELD_PROMPTS, ConversationFlow, parse_location, parse_name, parse_position,
+                               parse_tech_stack, parse_years)
+
+
+@pytest.mark.parametrize("text", ["ok", "Okay.", "yes", "no idea", "not sure", "I don't know",
+                                  "what do you mean?", "Why?", "none", ""])
+def test_non_answers_are_rejected(text):
+    assert parse_name(text) is None
+    assert parse_position(text) is None
+    assert parse_location(text) is None
+    assert parse_tech_stack(text) is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("my name is jane doe", "Jane Doe"),
+    ("I'm Ana María López", "Ana María López"),
+    ("Noah", "Noah"),
+])
+def test_parse_name(text, expected):
+    assert parse_name(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("5", "5 years"),
+    ("about 3 years", "3 years"),
+    ("one year", "1 year"),
+    ("3 months", "0.25 years"),
+    ("18 months", "1.5 years"),
+    ("2 years and 6 months", "2.5 years"),
+    ("4+ yrs", "4 years"),
+    ("no experience yet", "0 years"),
+    ("fresher", "0 years"),
+    ("not sure", None),
+    ("how many do you need?", None),
+    ("100", None),
+    ("quite a lot", None),
+])
+def test_parse_years(text, expected):
+    assert parse_years(text) == expected
+
+
+def test_parse_position_and_location():
+    assert parse_position("I'm applying for the Backend Engineer position") == "Backend Engineer"
+    assert parse_location("I'm based in Berlin, Germany") == "Berlin, Germany"
+    assert parse_tech_stack("Python, Django and PostgreSQL") == "Python, Django, PostgreSQL"
+    assert parse_tech_stack(".NET, C# and SQL Server.") == ".NET, C#, SQL Server"
+
+
+def test_filler_reply_goes_to_llm():
+    flow = ConversationFlow()
+    data = {}
+    flow.next_question(data)
+    assert flow.respond("ok", data) is None
+    assert "desired_position" not in data
+    assert flow.respond("Data Engineer", data).startswith("Got it")
+    assert data["desired_position"] == "Data Engineer"
+
+
+@pytest.mark.parametrize("text", ["I am a software engineer", "I'm looking for a backend role", "I work in fintech"])
+def test_sentences_are_not_names(text):
+    assert parse_name(text) is None
+
+
+@pytest.mark.parametrize("text", ["I mostly use Python", "we use Go and Kafka", "Python, and I like Rust"])
+def test_sentences_are_not_tech_stacks(text):
+    assert parse_tech_stack(text) is None
+
+
+def test_llm_is_told_to_re_ask_pending_field():
+    flow = ConversationFlow()
+    data = {"desired_position": "Data Engineer"}
+    flow.next_question(data)
+    flow.respond("Data Engineer", data)
+    assert flow.pending_field == "full_name"
+    assert flow.respond("I am a software engineer", data) is None
+    assert FIELD_PROMPTS["full_name"] in flow.stage_hint()
@@ -0,0 +1,80 @@
+import dedup
+import interview
+from interview import InterviewSession
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.writes = []
+
+    def enqueue(self, candidate_id, set_data=None, push_data=None, document=None):
+        self.writes.append((candidate_id, set_data, push_data, document))
+
+    def flush(self, candidate_id=None, timeout=None):
+        return True
+
+
+def other_candidate_match():
+    document = {"full_name": "Someone Else", "email": "shared@example.com", "tech_stack": "Go",
+                "technical_questions": ["Q"], "qa_responses": [{"answer": "private"}]}
+    return dedup.Match("64b000000000000000000001", "email", 1.0, document)
+
+
+def test_contact_match_is_only_recorded():
+    session = InterviewSession(agent=None, write_queue=RecordingQueue(),
+                               find_duplicate=lambda **_: other_candidate_match())
+    session.flow.next_question(session.candidate_data)
+    session.flow.pending_field = "email"
+    reply = session.local_reply("shared@example.com")
+
+    assert reply is not None
+    assert session.previous_application.candidate_id == "64b000000000000000000001"
+    cd = session.candidate_data
+    assert cd["previous_application_id"] == "64b000000000000000000001"
+    assert cd["full_name"] is None and cd["tech_stack"] is None
+    assert cd["technical_questions"] == [] and cd["qa_responses"] == []
+    assert session.session_id is None
+
+
+def test_linked_session_saves_into_its_own_document():
+    queue = RecordingQueue()
+    session = InterviewSession(agent=None, write_queue=queue, find_duplicate=lambda **_: None)
+    session.link_previous_application(other_candidate_match())
+    session.auto_save()
+
+    candidate_id, _, _, document = queue.writes[0]
+    assert candidate_id != "64b000000000000000000001"
+    assert document["previous_application_id"] == "64b000000000000000000001"
+
+
+def test_near_resume_match_does_not_reuse_analysis():
+    assert dedup.Match("x", "resume_hash").same_resume
+    assert not dedup.Match("x", "resume_near").same_resume
+
+
+def test_collecting_prompt_names_pending_field():
+    session = InterviewSession(agent=None, write_queue=RecordingQueue(), find_duplicate=lambda **_: None)
+    session.flow.next_question(session.candidate_data)
+    assert session.local_reply("I'd use Redis for caching") is None
+    assert session.candidate_data["desired_position"] is None
+    assert "Which position are you applying for?" in session.build_prompt("I'd use Redis for caching")
+
+
+def test_failed_duplicate_lookup_backs_off(monkeypatch):
+    monkeypatch.setattr(interview, "_dedup_retry_at", 0.0)
+    lookups = []
+
+    def failing_lookup(**kwargs):
+        lookups.append(kwargs)
+        raise ConnectionError("store down")
+
+    sessions = [InterviewSession(agent=None, write_queue=RecordingQueue(), find_duplicate=failing_lookup)
+                for _ in range(2)]
+    for session in sessions:
+        session.candidate_data["email"] = "jane@example.com"
+        assert not session.check_reapplication()
+    assert len(lookups) == 1
+
+    monkeypatch.setattr(interview, "_dedup_retry_at", 0.0)
+    sessions[0].find_duplicate = lambda **_: other_candidate_match()
+    assert sessions[0].check_reapplication()
@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+from llm_client import LLMClient, RateLimiter
+
+
+class DisabledCache:
+    def key(self, prompt, model):
+        return None
+
+
+class ScriptedRuntime:
+    """Runtime stand-in: ``behaviour(prompt)`` returns the reply or raises."""
+
+    def __init__(self, behaviour, calls):
+        self.behaviour = behaviour
+        self.calls = calls
+        self.last_response = None
+
+    def run(self, prompt):
+        self.calls.append(prompt)
+        return self.behaviour(prompt)
+
+    def stream(self, prompt):
+        self.calls.append(prompt)
+        reply = self.behaviour(prompt)
+        for word in reply.split():
+            yield word + " "
+        self.last_response = reply
+
+
+def make_client(behaviour, **kwargs):
+    calls = []
+    options = dict(concurrency=2, rate_per_minute=60_000, timeout=5, max_retries=2, backoff_seconds=0.01,
+                   response_cache=DisabledCache())
+    options.update(kwargs)
+    client = LLMClient(runtime_factory=lambda: ScriptedRuntime(behaviour, calls), **options)
+    return client, calls
+
+
+def test_rate_limiter_allows_a_burst_then_waits():
+    limiter = RateLimiter(60, burst=2)  # one token per second
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == 0.0
+    assert 0.9 < limiter._reserve() <= 1.0
+    limiter.penalize(5)
+    assert limiter._reserve() > 5
+
+
+def test_identical_inflight_prompts_are_coalesced():
+    release = threading.Event()
+    client, calls = make_client(lambda prompt: release.wait(5) and "answer")
+    futures = [client.submit("same prompt", cache=False) for _ in range(3)]
+    time.sleep(0.1)
+    release.set()
+    assert [f.result(5) for f in futures] == ["answer"] * 3
+    assert len(calls) == 1
+    assert client.stats["coalesced"] == 2
+    client.close()
+
+
+def test_transient_errors_are_retried():
+    def flaky(prompt):
+        if len(calls) < 3:
+            raise ConnectionError("503 unavailable")
+        return "ok"
+
+    client, calls = make_client(flaky)
+    assert client.run("prompt", cache=False) == "ok"
+    assert client.stats["retries"] == 2
+    client.close()
+
+
+def test_other_errors_are_not_retried():
+    def broken(prompt):
+        raise ValueError("bad prompt")
+
+    client, calls = make_client(broken)
+    with pytest.raises(ValueError):
+        client.run("prompt", cache=False)
+    assert len(calls) == 1 and client.stats["failures"] == 1
+    client.close()
+
+
+def test_hung_runs_beyond_the_abandon_limit_keep_their_slot():
+    release = threading.Event()
+    client, calls = make_client(lambda prompt: "late" if release.wait(5) else "never",
+                                concurrency=1, max_abandoned=1, max_retries=0, timeout=0.05)
+    for prompt in ("a", "b"):
+        with pytest.raises(TimeoutError):
+            client.run(prompt, cache=False)
+    assert client.stats["timeouts"] == 2 and client.stats["abandoned"] == 1
+
+    # Both threads are still running; the second one holds the only slot.
+    waiting = client.submit("c", cache=False, timeout=5)
+    time.sleep(0.2)
+    assert not waiting.done() and len(calls) == 2
+    release.set()
+    assert waiting.result(5) == "late"
+    client.close()
+
+
+def test_stream_uses_the_shared_slots_and_timeout():
+    release = threading.Event()
+    client, calls = make_client(lambda prompt: "hello there" if prompt == "chat" or release.wait(5) else "",
+                                concurrency=1, max_abandoned=0, timeout=0.05, max_retries=0)
+    assert "".join(client.stream("chat")) == "hello there "
+    assert client.last_response == "hello there"
+
+    with pytest.raises(TimeoutError):
+        list(client.stream("slow"))
+    # The slow stream still holds the only slot, so a new call has to wait for it.
+    waiting = client.submit("next", cache=False, timeout=5)
+    time.sleep(0.2)
+    assert not waiting.done()
+    release.set()
+    assert waiting.result(5) == "hello there"
+    assert client.stats["calls"] == 3
+    client.close()
+
+
+def test_cache_hits_from_many_threads_are_all_counted():
+    class HitCache:
+        def key(self, prompt, model):
+            return prompt
+
+        def get(self, key):
+            return "cached"
+
+    client, calls = make_client(lambda prompt: "fresh", response_cache=HitCache())
+
+    def hammer():
+        for _ in range(2000):
+            client.submit("prompt")
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.stats["cache_hits"] == 16000 and not calls
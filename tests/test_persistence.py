@@ -0,0 +1,133 @@
+import pytest
+
+import config
+import database
+from persistence import DirtyDict, WriteBehindQueue, build_delta_update, build_full_document, write_to_mongo
+
+
+def message(i):
+    return {"role": "user" if i % 2 else "assistant", "content": f"message {i}"}
+
+
+@pytest.fixture(params=["split", "embedded"])
+def layout(request, mongo, monkeypatch):
+    monkeypatch.setattr(config, "CANDIDATE_STORAGE_LAYOUT", request.param)
+    monkeypatch.setattr(config, "TRANSCRIPT_BUCKET_SIZE", 3)
+    return request.param
+
+
+def start_session(messages):
+    candidate_id = database.new_candidate_id()
+    write_to_mongo(candidate_id, build_full_document(DirtyDict(full_name="Jane"), messages), {}, {})
+    return candidate_id
+
+
+def delta(messages, saved):
+    return build_delta_update(DirtyDict(), messages, saved)
+
+
+def test_delta_append_applied_twice_is_stored_once(layout):
+    messages = [message(i) for i in range(2)]
+    candidate_id = start_session(messages)
+    messages += [message(i) for i in range(2, 7)]
+    set_data, push_data = delta(messages, 2)
+
+    database.append_candidate(candidate_id, push_data, set_data)
+    database.append_candidate(candidate_id, push_data, set_data)
+
+    assert database.load_transcript(candidate_id) == messages
+    assert database.get_candidate(candidate_id)["message_count"] == 7
+
+
+def test_overlapping_append_stores_only_the_missing_tail(layout):
+    messages = [message(i) for i in range(2)]
+    candidate_id = start_session(messages)
+    messages += [message(i) for i in range(2, 4)]
+    first = delta(messages, 2)
+    database.append_candidate(candidate_id, first[1], first[0])
+
+    # A coalesced write covering both deltas, replayed after the first landed.
+    messages += [message(i) for i in range(4, 8)]
+    set_data, push_data = delta(messages, 2)
+    database.append_candidate(candidate_id, push_data, set_data)
+
+    assert database.load_transcript(candidate_id) == messages
+
+
+def test_retried_write_does_not_duplicate_messages(layout):
+    messages = [message(i) for i in range(3)]
+    candidate_id = start_session(messages)
+    calls = []
+
+    def flaky_writer(*args):
+        calls.append(args)
+        write_to_mongo(*args)
+        if len(calls) == 1:
+            raise ConnectionError("reply lost after the write was applied")
+
+    queue = WriteBehindQueue(writer=flaky_writer, journal_path="unused", max_retries=2, backoff_seconds=0)
+    messages += [message(3), message(4)]
+    set_data, push_data = delta(messages, 3)
+    queue.enqueue(candidate_id, set_data=set_data, push_data=push_data)
+    assert queue.flush(timeout=5)
+    queue.close()
+
+    assert len(calls) == 2
+    assert database.load_transcript(candidate_id) == messages
+
+
+def test_journal_replay_is_idempotent(layout, tmp_path):
+    messages = [message(i) for i in range(2)]
+    candidate_id = start_session(messages)
+    messages += [message(2), message(3)]
+    set_data, push_data = delta(messages, 2)
+    database.append_candidate(candidate_id, push_data, set_data)
+
+    queue = WriteBehindQueue(writer=write_to_mongo, journal_path=str(tmp_path / "journal.jsonl"))
+    # The same write was also journaled (e.g. it timed out before the reply).
+    queue._journal({"candidate_id": candidate_id, "document": None, "set_data": set_data, "push_data": push_data})
+    assert queue.replay_journal() == 1
+
+    assert database.load_transcript(candidate_id) == messages
+
+
+def test_non_replayable_push_is_not_retried(tmp_path):
+    calls = []
+
+    def failing_writer(*args):
+        calls.append(args)
+        raise ConnectionError("down")
+
+    queue = WriteBehindQueue(writer=failing_writer, journal_path=str(tmp_path / "journal.jsonl"),
+                             max_retries=3, backoff_seconds=0)
+    queue.enqueue("c1", push_data={"notes": ["called back"]})
+    assert queue.flush(timeout=5)
+    queue.close()
+
+    assert len(calls) == 1
+    assert queue.stats["dropped"] == 1
+    assert not (tmp_path / "journal.jsonl").exists()
+
+
+def test_bulk_upsert_key_is_indexed(mongo):
+    database.save_candidates([{"full_name": "Jane", "resume_sha256": "abc"}], key="resume_sha256")
+    indexes = mongo[config.DATABASE_NAME][config.CANDIDATES_COLLECTION].index_information()
+    assert list(indexes["resume_sha256"]["key"]) == [("resume_sha256", 1)]
+    assert indexes["resume_sha256"]["sparse"]
+
+
+def test_index_bootstrap_backs_off_after_a_failure(mongo, monkeypatch):
+    calls = []
+
+    def failing_create_indexes(self, models):
+        calls.append(models)
+        raise ConnectionError("no primary")
+
+    monkeypatch.setattr(type(mongo.db.candidates), "create_indexes", failing_create_indexes)
+    for _ in range(3):
+        database.get_database()
+    assert len(calls) == 1
+
+    monkeypatch.setattr(database, "_indexes_retry_at", 0.0)
+    database.get_database()
+    assert len(calls) == 2
@@ -0,0 +1,61 @@
+import mongomock
+
+from question_bank import QuestionBank
+from skills import canonical_skill, canonical_skills
+
+
+class ScriptedAgent:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def run(self, prompt):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def test_canonical_skill_keeps_leading_dots():
+    assert canonical_skill(".NET") == "dotnet"
+    assert canonical_skill(" Node.js. ") == "nodejs"
+    assert canonical_skills("C#, .net, React.js and k8s") == ["csharp", "dotnet", "react", "kubernetes"]
+
+
+def test_unparseable_questions_are_not_cached():
+    bank = QuestionBank(collection=mongomock.MongoClient().db.question_bank)
+    agent = ScriptedAgent("Sorry, I cannot help with that.",
+                          "1. How do you profile a slow Django view?\n2. How do you size a Postgres connection pool?")
+
+    assert bank.get_questions("Python, Django", "Backend Engineer", agent) == []
+    questions = bank.get_questions("Python, Django", "Backend Engineer", agent)
+    assert len(questions) == 2 and agent.calls == 2
+
+    assert bank.get_questions("Python, Django", "Backend Engineer", agent) == questions
+    assert agent.calls == 2
+
+
+class FailingCollection:
+    def __init__(self):
+        self.calls = 0
+
+    def find_one(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("store down")
+
+    def replace_one(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("store down")
+
+
+def test_store_errors_fall_back_to_memory():
+    collection = FailingCollection()
+    bank = QuestionBank(collection=collection)
+    agent = ScriptedAgent("1. How do you profile a slow Django view?")
+
+    questions = bank.get_questions("Python, Django", "Backend Engineer", agent)
+    assert questions == ["How do you profile a slow Django view?"]
+    assert bank.get_questions("Python, Django", "Backend Engineer", agent) == questions
+    assert bank.get_questions("Go", "Backend Engineer", ScriptedAgent("1. How do goroutines get scheduled?"))
+    # One failed lookup, then the store is skipped until the backoff expires.
+    assert collection.calls == 1 and agent.calls == 1
+    assert bank.stats["store_errors"] == 1
+    assert not bank._key_locks
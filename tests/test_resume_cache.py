@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+
+from resume_cache import ResumeAnalysisCache
+
+RECORD = {"resume_text": "text", "analysis": "analysis", "fields": {}}
+
+
+class FailingCollection:
+    def __init__(self):
+        self.calls = 0
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def find_one(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("no primary")
+
+    replace_one = find_one
+
+
+def test_memory_entries_expire_with_the_ttl():
+    collection = mongomock.MongoClient().db.cache
+    cache = ResumeAnalysisCache(ttl_seconds=60, version="v", collection=collection)
+    cache.put(b"pdf", RECORD)
+    collection.delete_many({})
+    assert cache.get(b"pdf") == RECORD
+
+    key = cache.key(b"pdf")
+    cache._memory[key] = (RECORD, cache._memory[key][1] - 61)
+    assert cache.get(b"pdf") is None
+
+
+def test_stored_entries_past_the_ttl_are_misses():
+    collection = mongomock.MongoClient().db.cache
+    cache = ResumeAnalysisCache(ttl_seconds=60, version="v", collection=collection)
+    cache.put(b"pdf", RECORD)
+    cache._memory.clear()
+    assert cache.get(b"pdf") == RECORD
+
+    cache._memory.clear()
+    collection.update_many({}, {"$set": {"created_at": datetime.now(timezone.utc) - timedelta(seconds=61)}})
+    assert cache.get(b"pdf") is None
+    assert cache.stats["misses"] == 1
+
+
+def test_store_failure_backs_off():
+    collection = FailingCollection()
+    cache = ResumeAnalysisCache(version="v", collection=collection)
+    cache.put(b"pdf", RECORD)
+    assert cache.get(b"pdf") == RECORD  # served from memory
+    assert cache.get(b"other") is None
+    assert cache.get(b"another") is None
+    assert collection.calls == 1 and cache.stats["store_errors"] == 1
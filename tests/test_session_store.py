@@ -0,0 +1,93 @@
+import fakeredis
+import mongomock
+import pytest
+
+from session_store import (MemorySessionStore, MongoSessionStore, RedisSessionStore, SessionConflict, SessionManager,
+                           encode_snapshot)
+
+
+@pytest.fixture(params=["memory", "mongo", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemorySessionStore()
+    if request.param == "mongo":
+        return MongoSessionStore(collection=mongomock.MongoClient().db.sessions)
+    return RedisSessionStore(client=fakeredis.FakeRedis())
+
+
+def manager(store, **kwargs):
+    return SessionManager(store, agent_factory=lambda: None, session_kwargs={"find_duplicate": lambda **_: None},
+                          **kwargs)
+
+
+def chat(session, *contents):
+    for content in contents:
+        session.messages.add("user", content)
+
+
+def test_saves_append_only_new_messages(store):
+    sessions = manager(store)
+    session = sessions.create()
+    chat(session, "one", "two")
+    assert sessions.save(session)
+    chat(session, "three")
+    session.candidate_data["full_name"] = "Jane Doe"
+    assert sessions.save(session)
+
+    version, snapshot = store.load(session.session_key)
+    assert version == 2
+    assert [m["content"] for m in snapshot["messages"]] == ["one", "two", "three"]
+    assert snapshot["candidate_data"]["full_name"] == "Jane Doe"
+
+
+def test_unchanged_session_is_not_written(store):
+    sessions = manager(store)
+    session = sessions.create()
+    chat(session, "hello")
+    assert sessions.save(session)
+    assert not sessions.save(session)
+    assert store.version(session.session_key) == 1
+    assert sessions.stats["unchanged"] == 1
+
+
+def test_stale_replica_gets_a_conflict_and_reloads(store):
+    replica_a, replica_b = manager(store, revalidate_seconds=0), manager(store, revalidate_seconds=0)
+    session = replica_a.create()
+    chat(session, "hello")
+    replica_a.save(session)
+
+    copy = replica_b.get(session.session_key)
+    chat(session, "from a")
+    replica_a.save(session)
+    chat(copy, "from b")
+    with pytest.raises(SessionConflict):
+        replica_b.save(copy)
+
+    reloaded = replica_b.get(session.session_key)
+    assert reloaded is not copy
+    assert [m["content"] for m in reloaded.messages] == ["hello", "from a"]
+    chat(reloaded, "from b again")
+    replica_b.save(reloaded)
+    assert [m["content"] for m in store.load(session.session_key)[1]["messages"]] == [
+        "hello", "from a", "from b again"]
+
+
+def test_version_is_checked_at_most_once_per_interval(store):
+    calls = []
+    version = store.version
+    store.version = lambda key: calls.append(key) or version(key)
+    sessions = manager(store, revalidate_seconds=3600)
+    session = sessions.create()
+    sessions.save(session)
+    for _ in range(5):
+        assert sessions.get(session.session_key) is session
+    assert calls == []
+
+
+def test_snapshots_saved_whole_still_load(store):
+    session = manager(store).create()
+    chat(session, "kept")
+    store.save_encoded(session.session_key, encode_snapshot(session.snapshot()), None, 0)
+
+    restored = manager(store).get(session.session_key)
+    assert [m["content"] for m in restored.messages] == ["kept"]
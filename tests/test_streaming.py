@@ -0,0 +1,22 @@
+import time
+
+import config
+from crew_agent import TalentScoutCrew
+from fake_llm import FakeLLM
+
+
+def test_stream_yields_the_first_chunk_before_the_reply_is_complete(monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+    crew = TalentScoutCrew(llm=FakeLLM(latency=0.05, chunk_delay=0.02), verbose=False, response_cache=False)
+    start = time.perf_counter()
+    first = None
+    chunks = []
+    for chunk in crew.stream("Hello"):
+        if first is None:
+            first = time.perf_counter() - start
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+
+    assert len(chunks) > 5
+    assert first < total / 2
+    assert "".join(chunks) == crew.last_response
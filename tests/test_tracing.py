@@ -0,0 +1,66 @@
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+import config
+import tracing
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(record.getMessage())
+
+
+@pytest.fixture
+def traced():
+    tracing.enable(True)
+    tracing.get_recorder().reset()
+    yield
+    tracing.enable(config.TRACING_ENABLED)
+    tracing.set_session(None)
+
+
+def test_span_emits_a_log_line(traced):
+    handler = ListHandler()
+    tracing.logger.addHandler(handler)
+    try:
+        tracing.set_session("s1")
+        with tracing.span("llm.run", prompt_tokens=12) as s:
+            s.set(completion_tokens=3)
+    finally:
+        tracing.logger.removeHandler(handler)
+
+    assert tracing.logger.isEnabledFor(logging.INFO)
+    assert tracing.logger.handlers
+    line = json.loads(handler.lines[-1])
+    assert line["name"] == "llm.run" and line["session_id"] == "s1" and line["completion_tokens"] == 3
+
+
+def test_prometheus_export_is_written_once_per_interval(traced, monkeypatch, tmp_path):
+    writes = []
+    monkeypatch.setattr(config, "TRACING_JSON_LOG", False)
+    monkeypatch.setattr(config, "TRACING_PROM_FILE", str(tmp_path / "metrics.prom"))
+    monkeypatch.setattr(config, "TRACING_EXPORT_INTERVAL_SECONDS", 3600)
+    monkeypatch.setattr(tracing, "write_prometheus", writes.append)
+    monkeypatch.setattr(tracing.get_recorder(), "_last_export", time.monotonic() - 7200)
+
+    def record():
+        for _ in range(50):
+            with tracing.span("db.save_candidate"):
+                pass
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(writes) == 1
+    assert tracing.get_recorder().histograms["db.save_candidate"]["count"] == 400
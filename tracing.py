@@ -0,0 +1,220 @@
+"""
+Lightweight per-turn tracing.
+
+    with tracing.span("llm.run", prompt_tokens=120) as s:
+        ...
+        s.set(completion_tokens=42)
+
+    @tracing.traced("db.save_candidate")
+    def save_candidate(...): ...
+
+Spans record durations and attributes, aggregated per name and kept per
+session. They are exported as JSON log lines and Prometheus text. When
+tracing is disabled, ``span`` returns a shared no-op object and ``traced``
+adds a single flag check per call.
+"""
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+import json
+import logging
+import os
+import threading
+import time
+import config
+
+logger = logging.getLogger("talentscout.trace")
+if not logger.handlers:
+    # Span lines are INFO; without a handler of its own the logger would fall
+    # back to the root's WARNING threshold and drop them.
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MAX_SESSIONS = 256
+SPANS_PER_SESSION = 200
+
+_enabled = config.TRACING_ENABLED
+_session: ContextVar[Optional[str]] = ContextVar("talentscout_trace_session", default=None)
+
+
+def enable(enabled: bool = True) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_session(session_id: Optional[str]) -> None:
+    """Attribute spans recorded in this context to a session."""
+    _session.set(session_id)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("name", "attrs", "session_id", "start", "duration")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.session_id = _session.get()
+        self.duration = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _recorder.record(self)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+def span(name: str, **attrs):
+    """Context manager timing a block; use ``.set(...)`` to attach attributes."""
+    if not _enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name: str):
+    """Decorator form of ``span``."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increment a counter (e.g. cache hits)."""
+    if _enabled:
+        _recorder.count(name, value, _session.get())
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.sessions = OrderedDict()
+        self._last_export = 0.0
+
+    def record(self, s: Span) -> None:
+        entry = {"name": s.name, "duration_ms": round(s.duration * 1000, 3), **s.attrs}
+        with self._lock:
+            histogram = self.histograms.get(s.name)
+            if histogram is None:
+                histogram = self.histograms[s.name] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+            histogram["count"] += 1
+            histogram["sum"] += s.duration
+            for i, bound in enumerate(BUCKETS):
+                if s.duration <= bound:
+                    histogram["buckets"][i] += 1
+            for key in ("prompt_tokens", "completion_tokens"):
+                if key in s.attrs:
+                    self.counters[f"{s.name}.{key}"] = self.counters.get(f"{s.name}.{key}", 0) + s.attrs[key]
+            if s.session_id:
+                self._session_log(s.session_id).append(entry)
+        if config.TRACING_JSON_LOG:
+            logger.info(json.dumps({"session_id": s.session_id, **entry}, default=str))
+        self._maybe_export()
+
+    def count(self, name: str, value: int, session_id: Optional[str]) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            if session_id:
+                self._session_log(session_id).append({"name": name, "count": value})
+
+    def _session_log(self, session_id: str) -> deque:
+        spans = self.sessions.get(session_id)
+        if spans is None:
+            spans = self.sessions[session_id] = deque(maxlen=SPANS_PER_SESSION)
+            while len(self.sessions) > MAX_SESSIONS:
+                self.sessions.popitem(last=False)
+        else:
+            self.sessions.move_to_end(session_id)
+        return spans
+
+    def session_spans(self, session_id: str) -> list:
+        with self._lock:
+            return list(self.sessions.get(session_id, ()))
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append("# TYPE talentscout_span_seconds histogram")
+            for name, h in sorted(self.histograms.items()):
+                label = f'span="{name}"'
+                for bound, bucket_count in zip(BUCKETS, h["buckets"]):
+                    lines.append(f'talentscout_span_seconds_bucket{{{label},le="{bound}"}} {bucket_count}')
+                lines.append(f'talentscout_span_seconds_bucket{{{label},le="+Inf"}} {h["count"]}')
+                lines.append(f"talentscout_span_seconds_sum{{{label}}} {h['sum']:.6f}")
+                lines.append(f"talentscout_span_seconds_count{{{label}}} {h['count']}")
+            lines.append("# TYPE talentscout_events_total counter")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'talentscout_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def _maybe_export(self) -> None:
+        path = config.TRACING_PROM_FILE
+        if not path:
+            return
+        now = time.monotonic()
+        # Claim the export under the lock so one thread writes per interval.
+        with self._lock:
+            if now - self._last_export < config.TRACING_EXPORT_INTERVAL_SECONDS:
+                return
+            self._last_export = now
+        write_prometheus(path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.sessions.clear()
+
+
+_recorder = Recorder()
+
+
+def get_recorder() -> Recorder:
+    return _recorder
+
+
+def write_prometheus(path: str) -> None:
+    """Write metrics atomically in Prometheus text format (textfile collector)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(_recorder.render_prometheus())
+    os.replace(tmp_path, path)
@@ -0,0 +1,91 @@
+"""
+Compact in-memory interview transcript.
+
+Messages are ``__slots__`` records with interned roles instead of dicts, so
+a long interview costs little more than its text. They keep dict-style read
+access (``message["role"]``) for code that works with stored transcripts,
+and are converted to plain dicts only when saved.
+"""
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+import sys
+
+
+class Message:
+    __slots__ = ("role", "content", "question_index")
+
+    def __init__(self, role: str, content: str, question_index: Optional[int] = None):
+        self.role = sys.intern(role)
+        self.content = content
+        # Set on assistant messages that asked a technical question (see evaluation).
+        self.question_index = question_index
+
+    @classmethod
+    def from_dict(cls, data) -> "Message":
+        if isinstance(data, Message):
+            return data
+        return cls(data["role"], data["content"], data.get("question_index"))
+
+    def __getitem__(self, key: str):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict:
+        data = {"role": self.role, "content": self.content}
+        if self.question_index is not None:
+            data["question_index"] = self.question_index
+        return data
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Message, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, Message) else other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Message({self.role!r}, {self.content[:40]!r})"
+
+
+def as_documents(messages: Iterable) -> List[dict]:
+    """Plain dicts for storage or serialization."""
+    return [message.to_dict() if isinstance(message, Message) else dict(message) for message in messages]
+
+
+class Transcript:
+    """Append-only sequence of Messages with a rendering window."""
+
+    __slots__ = ("_messages",)
+
+    def __init__(self, messages: Iterable = ()):
+        self._messages = [Message.from_dict(message) for message in messages]
+
+    def append(self, message: Union[Message, dict]) -> None:
+        self._messages.append(Message.from_dict(message))
+
+    def add(self, role: str, content: str, question_index: Optional[int] = None) -> Message:
+        message = Message(role, content, question_index)
+        self._messages.append(message)
+        return message
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
+
+    def window(self, size: int) -> Tuple[int, List[Message]]:
+        """The last ``size`` messages, and how many earlier ones they leave out."""
+        hidden = max(0, len(self._messages) - size)
+        return hidden, self._messages[hidden:]
+
+    def to_dicts(self) -> List[dict]:
+        return as_documents(self._messages)